@@ -5,24 +5,106 @@ services/analysis_service.py - خدمات التحليل والمعالجة (م
 """
 
 import sqlite3
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
 import logging
 
+from config.connection_settings import apply_connection_profile
+from services.connection_service import ConnectionPool, pooled
+from utils.query_stats import QueryStats
+from models.load_and_force import ForceRecord, FORCE_RECORD_COLUMNS
+from database.derived_tables import ENVELOPE_TABLE
+
 logger = logging.getLogger(__name__)
 
 class AnalysisService:
     """خدمات التحليل والمعالجة للقاعدة الجديدة"""
     
-    def __init__(self, db_connection: sqlite3.Connection):
+    def __init__(self, db_connection: sqlite3.Connection = None, profile: str = None,
+                 pool: ConnectionPool = None, query_stats: QueryStats = None):
         """
         تهيئة خدمة التحليل
         
         المعاملات:
             db_connection: الاتصال بقاعدة البيانات
+            profile: ملف الاتصال (مثل "read_heavy") - None بدون تعديل
+            pool: مجمّع اتصالات بدلاً من db_connection (للاستخدام من عدة خيوط)
+            query_stats: QueryStats لقياس زمن الاستعلامات (مع pool يُستخدم query_stats المجمّع)
         """
+        if (db_connection is None) == (pool is None):
+            raise ValueError("يجب تمرير db_connection أو pool (أحدهما فقط)")
+        
+        self.pool = pool
         self.db = db_connection
-        self.cursor = db_connection.cursor()
+        self.query_stats = query_stats if pool is None else pool.query_stats
+        self._cursor = None
+        self._envelopes_available = None
+        if db_connection is not None:
+            apply_connection_profile(db_connection, profile)
+            self._cursor = self._new_cursor(db_connection)
+    
+    @property
+    def cursor(self) -> Optional[sqlite3.Cursor]:
+        """مؤشر الاتصال المباشر، أو مؤشر اتصال الخيط الحالي من المجمّع"""
+        if self.pool is None:
+            return self._cursor
+        return self.pool.current_cursor()
+    
+    def _new_cursor(self, connection: sqlite3.Connection = None):
+        """مؤشر مستقل (مُقاس إذا وُجد query_stats)"""
+        cursor = (connection or self.cursor.connection).cursor()
+        if self.query_stats is not None:
+            cursor = self.query_stats.wrap_cursor(cursor)
+        return cursor
+    
+    def _has_envelopes(self) -> bool:
+        """
+        التحقق من وجود جدول Column_Force_Envelopes
+
+        الوجود يُحفظ (إعادة البناء تعيد إنشاء الجدول)، أما الغياب فيُعاد فحصه
+        في كل استدعاء حتى يُستخدم الجدول فور بنائه.
+        """
+        if not self._envelopes_available:
+            self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (ENVELOPE_TABLE,)
+            )
+            self._envelopes_available = self.cursor.fetchone() is not None
+        return self._envelopes_available
+    
+    @pooled
+    def get_column_envelope(self, column_name: str, story: str) -> Optional[Dict[str, Any]]:
+        """
+        الحصول على غلاف قوى العمود من جدول Column_Force_Envelopes
+        
+        المعاملات:
+            column_name: اسم العمود
+            story: اسم الطابق
+            
+        المخرجات:
+            قاموس بأقصى وأدنى كل قوة مع التركيبة والمحطة الحاكمة، أو None
+        """
+        try:
+            if not self._has_envelopes():
+                logger.warning("جدول Column_Force_Envelopes غير موجود (شغّل build_derived_tables)")
+                return None
+            
+            self.cursor.execute(f"""
+            SELECT *
+            FROM {ENVELOPE_TABLE}
+            WHERE Column = ? AND Story = ?
+            """, (column_name, story))
+            result = self.cursor.fetchone()
+            
+            if result:
+                columns = [desc[0] for desc in self.cursor.description]
+                return dict(zip(columns, result))
+            return None
+            
+        except Exception as e:
+            logger.error(f"خطأ في الحصول على غلاف القوى: {e}")
+            return None
     
+    @pooled
     def get_column_reinforcement(self, column_name: str, story: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على تفاصيل التسليح للعمود من جدول Frame_Section_Property_Definitions_Concrete_Column_Reinforcing
@@ -67,6 +149,7 @@ class AnalysisService:
             logger.error(f"خطأ في الحصول على تسليح العمود: {e}")
             return None
     
+    @pooled
     def get_max_forces_for_column(self, column_name: str, story: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على أقصى القوى للعمود من جدول Element_Forces_Columns
@@ -79,6 +162,33 @@ class AnalysisService:
             قاموس بأقصى القوى (P, V2, V3, M2, M3, T) أو None
         """
         try:
+            # الصف الحاكم من الغلاف المحسوب مسبقاً (بحث واحد بالمفتاح)
+            if self._has_envelopes():
+                self.cursor.execute(f"""
+                SELECT 
+                    f.ID,
+                    f.Story,
+                    f.Column,
+                    f.Output_Case,
+                    f.Case_Type,
+                    f.Station,
+                    f.P,
+                    f.V2,
+                    f.V3,
+                    f.T,
+                    f.M2,
+                    f.M3
+                FROM {ENVELOPE_TABLE} env
+                JOIN Element_Forces_Columns f
+                    ON f.ID = CASE WHEN ABS(env.P_Max) >= ABS(env.P_Min)
+                                   THEN env.P_Max_ID ELSE env.P_Min_ID END
+                WHERE env.Column = ? AND env.Story = ?
+                """, (column_name, story))
+                result = self.cursor.fetchone()
+                if result:
+                    columns = [desc[0] for desc in self.cursor.description]
+                    return dict(zip(columns, result))
+            
             query = """
             SELECT 
                 ID,
@@ -113,6 +223,7 @@ class AnalysisService:
             logger.error(f"خطأ في الحصول على أقصى القوى: {e}")
             return None
     
+    @pooled
     def get_all_forces_for_column(self, column_name: str, story: str) -> List[Dict[str, Any]]:
         """
         الحصول على جميع القوى للعمود من جدول Element_Forces_Columns
@@ -158,6 +269,39 @@ class AnalysisService:
             logger.error(f"خطأ في الحصول على جميع القوى: {e}")
             return []
     
+    @pooled
+    def iter_forces_for_column(self, column_name: str, story: str,
+                               chunk_size: int = 5000) -> Iterator[ForceRecord]:
+        """
+        قراءة قوى العمود بشكل متدفق (fetchmany) بدلاً من قائمة كاملة
+        
+        المعاملات:
+            column_name: اسم العمود
+            story: اسم الطابق
+            chunk_size: عدد الصفوف في كل دفعة
+            
+        المخرجات:
+            مولّد ForceRecord مرتبة حسب Station
+        """
+        cursor = self._new_cursor()
+        try:
+            cursor.execute(f"""
+            SELECT {', '.join(FORCE_RECORD_COLUMNS)}
+            FROM Element_Forces_Columns
+            WHERE Column = ? AND Story = ?
+            ORDER BY Station
+            """, (column_name, story))
+            
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield ForceRecord._make(row)
+        finally:
+            cursor.close()
+    
+    @pooled
     def calculate_max_moment(self, column_name: str, story: str) -> Optional[Dict[str, float]]:
         """
         حساب أقصى عزم انحناء للعمود
@@ -170,13 +314,33 @@ class AnalysisService:
             قاموس بأقصى M2, M3 أو None
         """
         try:
-            forces = self.get_all_forces_for_column(column_name, story)
+            found = False
+            max_m2 = 0.0
+            max_m3 = 0.0
             
-            if not forces:
-                return None
+            if self._has_envelopes():
+                # الغلاف المحسوب مسبقاً بدلاً من المرور على جميع الصفوف
+                self.cursor.execute(f"""
+                SELECT M2_Max, M2_Min, M3_Max, M3_Min
+                FROM {ENVELOPE_TABLE}
+                WHERE Column = ? AND Story = ?
+                """, (column_name, story))
+                result = self.cursor.fetchone()
+                if result:
+                    found = True
+                    max_m2 = max([abs(v) for v in result[:2] if v is not None], default=0.0)
+                    max_m3 = max([abs(v) for v in result[2:] if v is not None], default=0.0)
+            else:
+                for force in self.iter_forces_for_column(column_name, story):
+                    found = True
+                    if force.m2 is not None:
+                        max_m2 = max(max_m2, abs(force.m2))
+                    if force.m3 is not None:
+                        max_m3 = max(max_m3, abs(force.m3))
             
-            max_m2 = max([abs(f['M2']) for f in forces if f['M2'] is not None], default=0.0)
-            max_m3 = max([abs(f['M3']) for f in forces if f['M3'] is not None], default=0.0)
+            if not found:
+                logger.info(f"لا توجد قوى للعمود: {column_name}")
+                return None
             
             return {
                 'max_M2': max_m2,
@@ -188,6 +352,7 @@ class AnalysisService:
             logger.error(f"خطأ في حساب أقصى عزم: {e}")
             return None
     
+    @pooled
     def get_story_columns(self, story_name: str) -> List[Dict[str, Any]]:
         """
         الحصول على جميع الأعمدة في طابق معين
@@ -226,6 +391,7 @@ class AnalysisService:
             logger.error(f"خطأ في الحصول على أعمدة الطابق: {e}")
             return []
     
+    @pooled
     def get_material_properties(self, material_type: str, material_name: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على خصائص المواد (خرسانة أو فولاذ)
@@ -269,7 +435,7 @@ class AnalysisService:
             return None
     
     def close(self):
-        """إغلاق الاتصال بالقاعدة"""
-        if self.cursor:
-            self.cursor.close()
+        """إغلاق الاتصال بالقاعدة (المجمّع يُغلق من مالكه)"""
+        if self._cursor:
+            self._cursor.close()
         logger.debug("تم إغلاق اتصال AnalysisService")
@@ -0,0 +1,200 @@
+"""
+===============================================================================
+services/async_service.py - واجهة asyncio لطبقة قاعدة البيانات والخدمات
+===============================================================================
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any
+import logging
+
+from database.connection import DatabaseConnection
+from services.analysis_service import AnalysisService
+from services.query_service import QueryService
+from services.connection_service import ConnectionPool
+from models.column import Column
+from models.load_and_force import LoadCaseGroup
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    """مهمة واحدة على خيط العمل (لدعم الإلغاء أثناء التنفيذ)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cancelled = False
+        self.connection = None
+
+    def start(self, connection) -> bool:
+        """تسجيل اتصال المهمة، أو False إذا أُلغيت قبل البدء"""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.connection = connection
+            return True
+
+    def finish(self):
+        with self._lock:
+            self.connection = None
+
+    def cancel(self):
+        """إلغاء المهمة: إيقاف الاستعلام الجاري عبر interrupt()"""
+        with self._lock:
+            self.cancelled = True
+            if self.connection is not None:
+                self.connection.interrupt()
+
+
+class AsyncDatabaseService:
+    """
+    واجهة غير متزامنة (awaitable) لـ DatabaseConnection والخدمات
+
+    - الاستدعاءات تُنفذ على مجمّع خيوط خاص، ولكل خيط اتصاله وكائناته
+    - عدد الاستدعاءات المتزامنة محدود بـ max_concurrency
+    - إلغاء المهمة (task.cancel) يوقف الاستعلام الجاري على SQLite
+
+    مثال:
+        async with AsyncDatabaseService(db_path) as service:
+            results = await asyncio.gather(*[
+                service.search_columns(story) for story in stories
+            ])
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 4, max_concurrency: int = None,
+                 profile: str = "read_heavy", query_stats=None):
+        """
+        تهيئة الخدمة
+
+        المعاملات:
+            db_path: مسار قاعدة البيانات
+            max_workers: عدد خيوط العمل (= عدد الاتصالات)
+            max_concurrency: الحد الأقصى للاستدعاءات المتزامنة (الافتراضي max_workers)
+            profile: ملف الاتصال لاتصالات الخيوط
+            query_stats: QueryStats لقياس الاستعلامات (اختياري)
+        """
+        self.db_path = str(db_path)
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+
+        self._pool = ConnectionPool(self.db_path, max_size=max_workers,
+                                    profile=profile, query_stats=query_stats)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="async-db")
+        self._local = threading.local()
+        self._contexts = []
+        self._contexts_lock = threading.Lock()
+        self._semaphore = None
+        self._semaphore_loop = None
+        self._closed = False
+
+    # ════════════════════════════════════════════════════════════════
+    # خيوط العمل
+    # ════════════════════════════════════════════════════════════════
+
+    def _thread_context(self) -> Dict[str, Any]:
+        """كائنات خيط العمل الحالي (تُنشأ عند أول مهمة على الخيط)"""
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            db = DatabaseConnection(pool=self._pool)
+            if not db.connect():
+                raise RuntimeError(f"فشل الاتصال بقاعدة البيانات: {self.db_path}")
+            context = {
+                'db': db,
+                'analysis': AnalysisService(pool=self._pool),
+                'query': QueryService(pool=self._pool),
+            }
+            self._local.context = context
+            with self._contexts_lock:
+                self._contexts.append(context)
+        return context
+
+    def _execute(self, job: _Job, target: str, method: str, args: tuple):
+        """تنفيذ دالة على خيط العمل"""
+        context = self._thread_context()
+        if not job.start(context['db'].connection):
+            return None
+        try:
+            return getattr(context[target], method)(*args)
+        finally:
+            job.finish()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore مرتبط بحلقة الأحداث الحالية"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, target: str, method: str, *args):
+        """تشغيل دالة على مجمّع الخيوط مع حد التزامن ودعم الإلغاء"""
+        if self._closed:
+            raise RuntimeError("الخدمة مغلقة")
+
+        async with self._get_semaphore():
+            job = _Job()
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._execute,
+                                          job, target, method, args)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                job.cancel()
+                raise
+
+    # ════════════════════════════════════════════════════════════════
+    # الدوال غير المتزامنة
+    # ════════════════════════════════════════════════════════════════
+
+    async def get_column(self, column_id: int, story_name: str = None) -> Optional[Column]:
+        """DatabaseConnection.get_column"""
+        return await self._run('db', 'get_column', column_id, story_name)
+
+    async def get_columns_bulk(self, story: str = None,
+                               unique_names: List[int] = None) -> List[Column]:
+        """DatabaseConnection.get_columns_bulk (بدون الوضع المؤجل)"""
+        return await self._run('db', 'get_columns_bulk', story, unique_names)
+
+    async def get_load_combinations(self) -> LoadCaseGroup:
+        """DatabaseConnection.get_load_combinations"""
+        return await self._run('db', 'get_load_combinations')
+
+    async def get_max_forces_for_column(self, column_name: str, story: str) -> Optional[Dict[str, Any]]:
+        """AnalysisService.get_max_forces_for_column"""
+        return await self._run('analysis', 'get_max_forces_for_column', column_name, story)
+
+    async def search_columns(self, story_name: str, search_term: str = None) -> List[Dict[str, Any]]:
+        """QueryService.search_columns"""
+        return await self._run('query', 'search_columns', story_name, search_term)
+
+    # ════════════════════════════════════════════════════════════════
+    # الإغلاق
+    # ════════════════════════════════════════════════════════════════
+
+    def close(self):
+        """إيقاف خيوط العمل وإغلاق اتصالاتها"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+
+        # اتصالات المجمّع تسمح بالإغلاق من خيط آخر (check_same_thread=False)
+        with self._contexts_lock:
+            for context in self._contexts:
+                context['db'].connection.close()
+            self._contexts.clear()
+        self._pool.close_all()
+        logger.debug("تم إغلاق AsyncDatabaseService")
+
+    async def aclose(self):
+        """إغلاق دون حجز حلقة الأحداث"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -0,0 +1,104 @@
+# database/batch_insert.py - إدراج دفعات مع عزل الصفوف الخاطئة
+# المهمة الوحيدة: executemany على دفعات داخل معاملة واحدة مع الإبلاغ عن كل صف مرفوض
+# (وقراءة المصدر على دفعات fetchmany حتى لا يُحمّل الجدول كاملاً في الذاكرة)
+#
+# الصف الخاطئ يُحدد بموضعه في المولّد الذي يغذي executemany (آخر صف أُرسل)،
+# ويُلغي SQLite تلك الجملة فقط؛ فيُستأنف الإدراج من الصف التالي بدون إعادة ما سبقه.
+# (أسرع من تقسيم الدفعة الفاشلة إلى نصفين: لا يُعاد إدراج أي صف صحيح)
+
+import sqlite3
+from typing import Callable, Iterator, Optional, Sequence, Tuple
+
+from config.settings import IMPORT_CHUNK_SIZE
+
+
+def fetch_chunks(cursor: sqlite3.Cursor, fetch_size: Optional[int]) -> Iterator[list]:
+    """
+    صفوف استعلام منفذ على دفعات
+
+    Args:
+        cursor: مؤشر بعد execute
+        fetch_size: عدد الصفوف في كل دفعة (None = الكل في دفعة واحدة عبر fetchall)
+
+    Yields:
+        قائمة صفوف (لا تُعاد دفعة فارغة)
+    """
+    if not fetch_size:
+        rows = cursor.fetchall()
+        if rows:
+            yield rows
+        return
+
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _insert_chunk(conn: sqlite3.Connection, insert_query: str, rows: Sequence,
+                  offset: int, on_error: Optional[Callable]) -> Tuple[int, int]:
+    """
+    إدراج دفعة بـ executemany؛ عند فشل صف يُبلغ عنه ويُستأنف من الصف التالي
+
+    Returns:
+        (عدد المُدرج، عدد الأخطاء)
+    """
+    inserted = errors = 0
+    start = 0
+    position = [-1]
+
+    def feed(first):
+        for index in range(first, len(rows)):
+            position[0] = index
+            yield rows[index]
+
+    while start < len(rows):
+        position[0] = start - 1
+        try:
+            conn.executemany(insert_query, feed(start))
+            inserted += len(rows) - start
+            break
+        except sqlite3.Error as e:
+            failed = position[0]
+            # خطأ في الجملة نفسها أو خطأ ألغى المعاملة كاملة: ليس خطأ صف
+            if failed < start or not conn.in_transaction:
+                raise
+            inserted += failed - start
+            errors += 1
+            if on_error:
+                on_error(offset + failed, rows[failed], e)
+            start = failed + 1
+
+    return inserted, errors
+
+
+def insert_rows(conn: sqlite3.Connection, insert_query: str, rows: Sequence,
+                chunk_size: int = IMPORT_CHUNK_SIZE,
+                on_error: Optional[Callable] = None) -> Tuple[int, int]:
+    """
+    إدراج صفوف بـ executemany على دفعات مع الإبلاغ عن كل صف خاطئ
+
+    تبدأ معاملة صريحة إذا لم تكن مفتوحة؛ الاستدعاء مسؤول عن commit.
+
+    Args:
+        conn: اتصال القاعدة الهدف
+        insert_query: جملة INSERT بعلامات ?
+        rows: الصفوف (قائمة tuples)
+        chunk_size: حجم الدفعة
+        on_error: دالة (رقم الصف، الصف، الخطأ) تُستدعى لكل صف مرفوض
+
+    Returns:
+        (عدد المُدرج، عدد الأخطاء)
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+
+    inserted = errors = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk_inserted, chunk_errors = _insert_chunk(
+            conn, insert_query, rows[start:start + chunk_size], start, on_error
+        )
+        inserted += chunk_inserted
+        errors += chunk_errors
+    return inserted, errors
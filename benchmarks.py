@@ -0,0 +1,362 @@
+# tools/benchmarks.py - قياس أداء قاعدة البيانات
+# المهمة الوحيدة: مقارنة الأداء على بيانات صناعية كبيرة
+# الاستخدام: python -m tools.benchmarks [عدد_الصفوف]
+
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.connection_settings import CONNECTION_PROFILES, apply_connection_profile
+from database.connection import DatabaseConnection, CONNECTION_MODES
+from database.schema import compile_sqlite_ddl, split_sql_statements
+from database.batch_insert import insert_rows
+
+
+# ============================================================
+# إعدادات القياس
+# ============================================================
+
+DEFAULT_ROWS = 1_000_000
+STORIES = 20
+COLUMNS_PER_STORY = 100
+OUTPUT_CASES = 25
+REPEATS = 3
+
+
+# ============================================================
+# بناء بيانات صناعية
+# ============================================================
+
+def build_forces_table(db_path: str, rows: int = DEFAULT_ROWS, seed: int = 1) -> int:
+    """
+    إنشاء جدول Element_Forces_Columns صناعي
+
+    Args:
+        db_path: مسار قاعدة البيانات
+        rows: عدد الصفوف
+        seed: بذرة الأرقام العشوائية
+
+    Returns:
+        عدد الصفوف المدرجة
+    """
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP TABLE IF EXISTS Element_Forces_Columns")
+    conn.execute("""
+        CREATE TABLE Element_Forces_Columns (
+            ID INTEGER PRIMARY KEY,
+            Story TEXT, Column TEXT, Unique_Name INTEGER,
+            Output_Case TEXT, Case_Type TEXT, Station REAL,
+            P REAL, V2 REAL, V3 REAL, T REAL, M2 REAL, M3 REAL,
+            Element INTEGER, Elem_Station REAL, Location REAL,
+            ElementID INTEGER, Load_case_id INTEGER
+        )
+    """)
+
+    def generate():
+        for i in range(rows):
+            story = i % STORIES
+            column = (i // STORIES) % COLUMNS_PER_STORY
+            case = (i // (STORIES * COLUMNS_PER_STORY)) % OUTPUT_CASES
+            unique_name = story * COLUMNS_PER_STORY + column + 1
+            yield (
+                f"Story{story + 1}", f"C{column + 1}", unique_name,
+                f"COMB{case + 1}", "Combination", rnd.choice((0.0, 1500.0, 3000.0)),
+                rnd.uniform(-5e6, 0), rnd.uniform(-2e5, 2e5), rnd.uniform(-2e5, 2e5),
+                rnd.uniform(-1e6, 1e6), rnd.uniform(-3e8, 3e8), rnd.uniform(-3e8, 3e8),
+                unique_name, 0.0, 0.0, unique_name, case + 1
+            )
+
+    conn.executemany("""
+        INSERT INTO Element_Forces_Columns
+        (Story, Column, Unique_Name, Output_Case, Case_Type, Station,
+         P, V2, V3, T, M2, M3, Element, Elem_Station, Location, ElementID, Load_case_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, generate())
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def _timed(func, repeats: int = REPEATS) -> float:
+    """أفضل زمن (ثانية) من عدة تكرارات"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# ============================================================
+# قياس ملفات الاتصال
+# ============================================================
+
+READ_QUERIES = {
+    "max_moment_per_column": """
+        SELECT Unique_Name, MAX(ABS(M3)), MAX(ABS(M2))
+        FROM Element_Forces_Columns
+        GROUP BY Unique_Name
+    """,
+    "story_filter": """
+        SELECT * FROM Element_Forces_Columns WHERE Story = 'Story7'
+    """,
+    "sorted_by_axial": """
+        SELECT Unique_Name, Output_Case, P
+        FROM Element_Forces_Columns
+        ORDER BY P LIMIT 1000
+    """,
+}
+
+
+def bench_connection_profiles(db_path: str, rows: int) -> dict:
+    """
+    قياس زمن الاستعلامات والإدراج لكل ملف اتصال
+
+    Args:
+        db_path: مسار قاعدة بيانات تحتوي Element_Forces_Columns
+        rows: عدد صفوف الإدراج في قياس الكتابة
+
+    Returns:
+        {profile: {query_name: seconds}}
+    """
+    results = {}
+    write_rows = max(rows // 10, 1000)
+
+    for profile in [None] + list(CONNECTION_PROFILES):
+        conn = sqlite3.connect(db_path)
+        apply_connection_profile(conn, profile)
+        timings = {}
+
+        for name, query in READ_QUERIES.items():
+            timings[name] = _timed(lambda: conn.execute(query).fetchall())
+
+        def write():
+            conn.execute("DROP TABLE IF EXISTS main._bench_write")
+            conn.execute("CREATE TABLE main._bench_write AS "
+                         "SELECT * FROM Element_Forces_Columns WHERE 0")
+            for offset in range(0, write_rows, 1000):
+                conn.execute(
+                    "INSERT INTO main._bench_write SELECT * FROM Element_Forces_Columns "
+                    "LIMIT 1000 OFFSET ?", (offset,)
+                )
+                conn.commit()
+
+        timings["insert_commit_per_1000"] = _timed(write, repeats=1)
+        conn.execute("DROP TABLE IF EXISTS main._bench_write")
+        conn.commit()
+
+        # إعادة الملف للوضع الافتراضي حتى لا يؤثر على الملف التالي
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+        results[profile or "sqlite_default"] = timings
+
+    return results
+
+
+# ============================================================
+# قياس أوضاع الاتصال (disk / readonly / memory)
+# ============================================================
+
+def bench_connection_modes(db_path: str) -> dict:
+    """
+    قياس زمن الاستعلامات لكل وضع من أوضاع DatabaseConnection
+
+    Args:
+        db_path: مسار قاعدة بيانات تحتوي Element_Forces_Columns
+
+    Returns:
+        {mode: {query_name: seconds}} مع زمن الفتح (نسخ الذاكرة) في open
+    """
+    results = {}
+    for mode in CONNECTION_MODES:
+        start = time.perf_counter()
+        db = DatabaseConnection(db_path, mode=mode)
+        db.connect()
+        timings = {"open": time.perf_counter() - start}
+
+        for name, query in READ_QUERIES.items():
+            timings[name] = _timed(lambda: db.execute_query(query))
+
+        db.disconnect(persist=False)
+        results[mode] = timings
+
+    return results
+
+
+# ============================================================
+# قياس الترميز والصيغة STRICT مقابل الصيغة العادية
+# ============================================================
+
+def build_schema_copy(source_path: str, db_path: str, strict: bool, encode: bool = False) -> float:
+    """
+    نسخ Element_Forces_Columns إلى قاعدة جديدة بهيكل schema.py
+
+    Args:
+        source_path: قاعدة تحتوي Element_Forces_Columns
+        db_path: القاعدة الجديدة
+        strict: جداول STRICT
+        encode: ترميز النصوص المتكررة (رموز القاموس)
+
+    Returns:
+        زمن الإدراج (ثانية)
+    """
+    conn = sqlite3.connect(db_path)
+    create_sql, _ = compile_sqlite_ddl(strict=strict, encode=encode)
+    for statement in split_sql_statements(create_sql):
+        conn.execute(statement)
+    conn.execute("ATTACH DATABASE ? AS source", (source_path,))
+
+    start = time.perf_counter()
+    conn.execute("INSERT INTO main.Element_Forces_Columns SELECT * FROM source.Element_Forces_Columns")
+    conn.commit()
+    elapsed = time.perf_counter() - start
+
+    conn.execute("DETACH DATABASE source")
+    conn.execute("VACUUM")
+    conn.close()
+    return elapsed
+
+
+def bench_strict_layout(source_path: str, work_dir: str) -> tuple:
+    """
+    مقارنة حجم الملف وزمن المسح بين الصيغة العادية والمرمزة و STRICT المرمزة
+
+    Args:
+        source_path: قاعدة تحتوي Element_Forces_Columns
+        work_dir: مجلد القواعد المؤقتة
+
+    Returns:
+        ({layout: {name: seconds}}, {layout: حجم الملف بالبايت})
+    """
+    results = {}
+    sizes = {}
+    layouts = (("plain", False, False), ("encoded", False, True), ("strict_encoded", True, True))
+    for layout, strict, encode in layouts:
+        db_path = str(Path(work_dir) / f"{layout}.db")
+        timings = {"import": build_schema_copy(source_path, db_path, strict, encode)}
+        sizes[layout] = Path(db_path).stat().st_size
+
+        conn = sqlite3.connect(db_path)
+        for name, query in READ_QUERIES.items():
+            timings[name] = _timed(lambda: conn.execute(query).fetchall())
+        conn.close()
+        results[layout] = timings
+
+    return results, sizes
+
+
+# ============================================================
+# قياس الإدراج: صفاً صفاً مقابل دفعات executemany
+# ============================================================
+
+def bench_batch_insert(source_path: str, bad_every: int = 1000) -> dict:
+    """
+    مقارنة execute() لكل صف (الطريقة السابقة) مع insert_rows (دفعات executemany)
+
+    Args:
+        source_path: قاعدة تحتوي Element_Forces_Columns
+        bad_every: صف خاطئ (Story = NULL على عمود NOT NULL) كل N صف
+
+    Returns:
+        {method: {"rows_per_second", "inserted", "errors"}}
+    """
+    conn = sqlite3.connect(source_path)
+    rows = conn.execute(
+        "SELECT Story, Column, Unique_Name, Output_Case, Station, P, V2, V3, T, M2, M3 "
+        "FROM Element_Forces_Columns"
+    ).fetchall()
+    rows = [(None,) + row[1:] if i % bad_every == 0 else row for i, row in enumerate(rows, 1)]
+    insert_query = "INSERT INTO _bench_import VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def reset():
+        conn.execute("DROP TABLE IF EXISTS _bench_import")
+        conn.execute("""
+            CREATE TABLE _bench_import (
+                ID INTEGER PRIMARY KEY, Story TEXT NOT NULL, Column TEXT, Unique_Name INTEGER,
+                Output_Case TEXT, Station REAL, P REAL, V2 REAL, V3 REAL, T REAL, M2 REAL, M3 REAL
+            )
+        """)
+        conn.commit()
+
+    def per_row():
+        inserted = errors = 0
+        for row in rows:
+            try:
+                conn.execute(insert_query, row)
+                inserted += 1
+            except sqlite3.Error:
+                errors += 1
+        conn.commit()
+        return inserted, errors
+
+    def batched():
+        result = insert_rows(conn, insert_query, rows)
+        conn.commit()
+        return result
+
+    results = {}
+    for method, func in (("execute_per_row", per_row), ("executemany_batched", batched)):
+        reset()
+        start = time.perf_counter()
+        inserted, errors = func()
+        elapsed = time.perf_counter() - start
+        results[method] = {"rows_per_second": inserted / elapsed, "inserted": inserted, "errors": errors}
+
+    conn.execute("DROP TABLE IF EXISTS _bench_import")
+    conn.commit()
+    conn.close()
+    return results
+
+
+def print_results(title: str, results: dict):
+    """طباعة جدول النتائج"""
+    names = list(next(iter(results.values())).keys())
+    print(f"\n{title}")
+    print("=" * 80)
+    print(f"{'profile':<18}" + "".join(f"{name[:22]:>24}" for name in names))
+    print("-" * 80)
+    for profile, timings in results.items():
+        print(f"{profile:<18}" + "".join(f"{timings[name] * 1000:>21.1f} ms" for name in names))
+
+
+# ============================================================
+# البرنامج الرئيسي
+# ============================================================
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        print(f"📦 بناء Element_Forces_Columns بـ {rows:,} صف...")
+        build_forces_table(db_path, rows)
+
+        results = bench_connection_profiles(db_path, rows)
+        print_results("ملفات الاتصال (Connection Profiles)", results)
+
+        results = bench_connection_modes(db_path)
+        print_results("أوضاع الاتصال (disk / readonly / memory)", results)
+
+        results, sizes = bench_strict_layout(db_path, tmp)
+        print_results("الترميز والصيغة STRICT مقابل العادية", results)
+        for layout, size in sizes.items():
+            print(f"{layout:<18}{size / 1024 / 1024:>21.1f} MB")
+
+        results = bench_batch_insert(db_path)
+        print("\nالإدراج: صفاً صفاً مقابل دفعات executemany")
+        print("=" * 80)
+        for method, stats in results.items():
+            print(f"{method:<22}{stats['rows_per_second']:>14,.0f} صف/ث"
+                  f"{stats['inserted']:>12} مُدرج{stats['errors']:>8} خطأ")
+
+
+if __name__ == "__main__":
+    main()
@@ -365,3 +365,74 @@ class Column:
     
     def __repr__(self) -> str:
         return f"Column(ID={self.etabs_id}, Story={self.story_name}, Section={self.section_name})"
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# عمود بتحميل مؤجل (Lazy Column)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _lazy_field(field: str):
+    """
+    إنشاء خاصية (property) تستدعي المحمّل عند أول قراءة للحقل
+    
+    Args:
+        field: اسم الحقل ('forces' أو 'joints' أو 'reinforcement')
+    """
+    storage = f"_lazy_{field}"
+    
+    def getter(self):
+        if field not in self._loaded_fields and self._loader is not None:
+            self._loaded_fields.add(field)
+            self._loader(field)
+        return self.__dict__[storage]
+    
+    def setter(self, value):
+        self.__dict__[storage] = value
+    
+    return property(getter, setter)
+
+
+class LazyColumn(Column):
+    """
+    عمود تُحمَّل قواه ونقاطه وتسليحه عند أول وصول فقط
+    
+    يُنشأ ببيانات الاتصال والمقطع فقط، والحقول forces و joints و
+    reinforcement تُملأ عند أول قراءة عبر المحمّل (loader) المرتبط به.
+    المحمّل عادةً مشترك بين مجموعة أعمدة، فيُحمِّل الحقل لجميعها دفعة واحدة.
+    """
+    
+    LAZY_FIELDS = ('forces', 'joints', 'reinforcement')
+    
+    forces = _lazy_field('forces')
+    joints = _lazy_field('joints')
+    reinforcement = _lazy_field('reinforcement')
+    
+    def __init__(self, etabs_id: str, story_name: str, section_name: str):
+        """
+        إنشاء عمود بتحميل مؤجل
+        
+        Args:
+            etabs_id: معرف ETABS (مثل "C1")
+            story_name: اسم الطابق
+            section_name: اسم المقطع
+        """
+        self._loader = None
+        self._loaded_fields = set()
+        super().__init__(etabs_id, story_name, section_name)
+    
+    def set_loader(self, loader):
+        """
+        ربط المحمّل بالعمود
+        
+        Args:
+            loader: دالة تستقبل اسم الحقل وتملؤه (loader(field))
+        """
+        self._loader = loader
+    
+    def mark_loaded(self, field: str):
+        """تعليم الحقل كمحمّل حتى لا يُستدعى المحمّل له مرة أخرى"""
+        self._loaded_fields.add(field)
+    
+    def is_loaded(self, field: str) -> bool:
+        """هل تم تحميل الحقل؟"""
+        return field in self._loaded_fields or self._loader is None
@@ -0,0 +1,317 @@
+"""
+===============================================================================
+services/connection_service.py - مجمّع اتصالات آمن للخيوط (Connection Pool)
+===============================================================================
+"""
+
+import sqlite3
+import threading
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Optional
+import logging
+
+from config.connection_settings import apply_connection_profile
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    مجمّع اتصالات SQLite محدود الحجم
+
+    - كل خيط يستعير اتصالاً واحداً، والاستعارة المتداخلة في نفس الخيط
+      تعيد نفس الاتصال (لا تستهلك اتصالاً إضافياً)
+    - يُفحص الاتصال الخامل (SELECT 1) قبل إعارته ويُستبدل إن كان تالفاً
+    - عند امتلاء المجمّع ينتظر الخيط حتى يُعاد اتصال أو تنتهي المهلة
+    """
+
+    def __init__(self, db_path: str, max_size: int = 4, timeout: float = 30.0,
+                 profile: str = None, query_stats=None):
+        """
+        تهيئة المجمّع
+
+        المعاملات:
+            db_path: مسار قاعدة البيانات
+            max_size: الحد الأقصى لعدد الاتصالات المفتوحة
+            timeout: مهلة انتظار اتصال متاح (ثانية)
+            profile: ملف الاتصال المطبق على كل اتصال جديد (مثل "read_heavy")
+            query_stats: QueryStats لقياس استعلامات المؤشرات المعارة (اختياري)
+        """
+        if max_size < 1:
+            raise ValueError("max_size يجب أن يكون 1 على الأقل")
+
+        self.db_path = str(db_path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.profile = profile
+        self.query_stats = query_stats
+
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+        self._local = threading.local()
+
+    # ════════════════════════════════════════════════════════════════
+    # إنشاء وفحص الاتصالات
+    # ════════════════════════════════════════════════════════════════
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """فتح اتصال جديد (يمكن نقله بين الخيوط بعد إعادته للمجمّع)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        apply_connection_profile(conn, self.profile)
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """فحص صلاحية الاتصال"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection):
+        """إغلاق اتصال تالف وتحرير مكانه"""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    # ════════════════════════════════════════════════════════════════
+    # الاستعارة والإعادة
+    # ════════════════════════════════════════════════════════════════
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        استعارة اتصال للخيط الحالي
+
+        المخرجات:
+            اتصال SQLite (نفس الاتصال إن كان الخيط يستعير اتصالاً بالفعل)
+        """
+        held = getattr(self._local, 'connection', None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        conn = self._acquire_unbound()
+        self._local.connection = conn
+        self._local.cursor = None
+        self._local.depth = 1
+        return conn
+
+    def _acquire_unbound(self) -> sqlite3.Connection:
+        """استعارة اتصال سليم دون ربطه بالخيط الحالي (انظر _bind)"""
+        while True:
+            conn = self._checkout()
+            if conn is None:
+                try:
+                    conn = self._create_connection()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+            elif not self._is_healthy(conn):
+                logger.warning("اتصال تالف في المجمّع، سيتم استبداله")
+                self._discard(conn)
+                continue
+            return conn
+
+    def _checkout(self) -> Optional[sqlite3.Connection]:
+        """
+        أخذ اتصال خامل أو حجز مكان لاتصال جديد
+
+        المخرجات:
+            اتصال خامل، أو None إذا يجب فتح اتصال جديد
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("المجمّع مغلق")
+
+            if not self._idle and self._size >= self.max_size:
+                if not self._condition.wait_for(
+                        lambda: self._idle or self._size < self.max_size or self._closed,
+                        timeout=self.timeout):
+                    raise TimeoutError(
+                        f"لا يوجد اتصال متاح خلال {self.timeout} ثانية "
+                        f"(الحد الأقصى {self.max_size})"
+                    )
+                if self._closed:
+                    raise RuntimeError("المجمّع مغلق")
+
+            if self._idle:
+                return self._idle.pop()
+
+            self._size += 1
+            return None
+
+    def release(self, conn: sqlite3.Connection = None):
+        """
+        إعادة اتصال الخيط الحالي للمجمّع
+
+        المعاملات:
+            conn: الاتصال المستعار (للتحقق فقط)
+        """
+        held = getattr(self._local, 'connection', None)
+        if held is None or (conn is not None and conn is not held):
+            raise RuntimeError("الاتصال غير مستعار من هذا الخيط")
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        if self._local.cursor is not None:
+            self._local.cursor.close()
+        self._local.connection = None
+        self._local.cursor = None
+        self._release_unbound(held)
+
+    def _release_unbound(self, conn: sqlite3.Connection):
+        """إعادة اتصال من _acquire_unbound للمجمّع (من أي خيط)"""
+        # عدم ترك معاملة مفتوحة لمستعير آخر
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._condition:
+            if self._closed:
+                conn.close()
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def _bind(self, conn: sqlite3.Connection):
+        """
+        ربط اتصال غير مربوط بالخيط الحالي داخل كتلة with
+
+        الاستعارة السابقة للخيط (إن وُجدت) تُستعاد عند الخروج.
+        """
+        previous = (getattr(self._local, 'connection', None),
+                    getattr(self._local, 'cursor', None),
+                    getattr(self._local, 'depth', 0))
+        self._local.connection = conn
+        self._local.cursor = None
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            if self._local.cursor is not None:
+                self._local.cursor.close()
+            self._local.connection, self._local.cursor, self._local.depth = previous
+
+    @contextmanager
+    def connection(self):
+        """
+        استعارة اتصال داخل كتلة with
+
+        مثال:
+            with pool.connection() as conn:
+                conn.execute(...)
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def current_cursor(self) -> Optional[sqlite3.Cursor]:
+        """
+        مؤشر اتصال الخيط الحالي (يُنشأ مرة واحدة لكل استعارة)
+
+        المخرجات:
+            المؤشر أو None إذا لم يستعر الخيط اتصالاً
+        """
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            return None
+        if self._local.cursor is None:
+            cursor = conn.cursor()
+            if self.query_stats is not None:
+                cursor = self.query_stats.wrap_cursor(cursor)
+            self._local.cursor = cursor
+        return self._local.cursor
+
+    # ════════════════════════════════════════════════════════════════
+    # الإغلاق والإحصائيات
+    # ════════════════════════════════════════════════════════════════
+
+    def close_all(self):
+        """إغلاق جميع الاتصالات الخاملة (المستعارة تُغلق عند إعادتها)"""
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        logger.debug("تم إغلاق مجمّع الاتصالات")
+
+    def stats(self) -> dict:
+        """عدد الاتصالات المفتوحة والخاملة"""
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'open': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+            }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+
+def pooled(method):
+    """
+    مُزخرف لدوال الخدمات: يستعير اتصالاً من مجمّع الخدمة طوال تنفيذ الدالة
+
+    إذا لم يكن للخدمة مجمّع (self.pool = None) تُنفذ الدالة كما هي.
+    دوال المولّدات تحتفظ بالاتصال حتى انتهاء المرور على النتائج أو إغلاق المولّد،
+    ويُربط بالخيط أثناء كل خطوة فقط: التوقف المبكر أو الإغلاق (أو جمع المولّد)
+    من خيط آخر يعيد الاتصال للمجمّع. المولّد المستدعى داخل دالة مستعيرة يستخدم
+    اتصالها (ويُستهلك قبل انتهائها).
+    """
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            if self.pool is None:
+                yield from method(self, *args, **kwargs)
+                return
+            pool = self.pool
+            if getattr(pool._local, 'connection', None) is not None:
+                yield from method(self, *args, **kwargs)
+                return
+            conn = pool._acquire_unbound()
+            inner = method(self, *args, **kwargs)
+            try:
+                while True:
+                    with pool._bind(conn):
+                        try:
+                            item = next(inner)
+                        except StopIteration:
+                            return
+                    yield item
+            finally:
+                try:
+                    with pool._bind(conn):
+                        inner.close()
+                finally:
+                    pool._release_unbound(conn)
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.pool is None:
+            return method(self, *args, **kwargs)
+        with self.pool.connection():
+            return method(self, *args, **kwargs)
+    return wrapper
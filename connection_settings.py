@@ -0,0 +1,127 @@
+# config/connection_settings.py - إعدادات اتصال SQLite
+# المهمة الوحيدة: ملفات إعداد (Profiles) لأنماط الاستخدام المختلفة
+# بدون معلومات الإنشاء أو الإدخال أو الربط
+
+import sqlite3
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# ملفات إعداد الاتصال
+# ============================================================
+# القيم بترتيب التطبيق: journal_mode أولاً لأنه يغيّر طريقة القفل
+#   journal_mode = WAL      : القرّاء لا يُحجبون أثناء الكتابة (الربط مثلاً)
+#                             يبقى في ملف القاعدة بعد الإغلاق (انظر restore_journal_mode)
+#   synchronous             : FULL آمن، NORMAL آمن مع WAL، OFF للإدراج القابل للإعادة فقط
+#   cache_size  (سالب)      : الحجم بالكيلوبايت (-65536 = 64 ميجابايت)
+#   mmap_size   (بايت)      : القراءة من الذاكرة مباشرة بدلاً من read()
+#   temp_store  = MEMORY    : الجداول المؤقتة للفرز و GROUP BY في الذاكرة
+
+CONNECTION_PROFILES = {
+
+    # للاستخدام العام (الخدمات والواجهات)
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,          # 16 MB
+        "mmap_size": 67108864,         # 64 MB
+        "temp_store": "MEMORY",
+    },
+
+    # للتحليل والاستعلامات الثقيلة على Element_Forces_Columns
+    "read_heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -131072,         # 128 MB
+        "mmap_size": 536870912,        # 512 MB
+        "temp_store": "MEMORY",
+    },
+
+    # للإدراج والربط: المرحلة تعيد journal_mode السابق عند الإغلاق
+    # (NORMAL مع WAL لا يفقد إلا آخر المعاملات عند انقطاع الكهرباء - القاعدة لا تتلف)
+    "bulk_write": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -262144,         # 256 MB
+        "mmap_size": 0,
+        "temp_store": "MEMORY",
+    },
+}
+
+# الملف المستخدم عند عدم التحديد (None = إعدادات SQLite الافتراضية بدون تعديل)
+DEFAULT_CONNECTION_PROFILE = None
+
+
+# ============================================================
+# دوال مساعدة
+# ============================================================
+
+def get_connection_profile(name: str) -> dict:
+    """الحصول على إعدادات ملف اتصال بالاسم"""
+    if name not in CONNECTION_PROFILES:
+        raise ValueError(
+            f"ملف اتصال غير معروف: {name} (المتاح: {', '.join(CONNECTION_PROFILES)})"
+        )
+    return CONNECTION_PROFILES[name]
+
+
+def apply_connection_profile(conn: sqlite3.Connection, name: str = None) -> dict:
+    """
+    تطبيق ملف اتصال على اتصال مفتوح
+
+    Args:
+        conn: اتصال SQLite
+        name: اسم الملف (None = بدون تعديل)
+
+    Returns:
+        قاموس بالقيم الفعلية بعد التطبيق
+    """
+    if name is None:
+        return {}
+
+    applied = {}
+    for pragma, value in get_connection_profile(name).items():
+        try:
+            row = conn.execute(f"PRAGMA {pragma} = {value}").fetchone()
+            applied[pragma] = row[0] if row else value
+        except sqlite3.Error as e:
+            # مثال: WAL غير ممكن على قاعدة للقراءة فقط أو في الذاكرة
+            logger.warning(f"⚠️ تعذر تطبيق PRAGMA {pragma}={value}: {e}")
+
+    return applied
+
+
+def get_journal_mode(conn: sqlite3.Connection) -> str:
+    """journal_mode الحالي للقاعدة الرئيسية (قبل تطبيق ملف الاتصال)"""
+    return conn.execute("PRAGMA main.journal_mode").fetchone()[0]
+
+
+def restore_journal_mode(conn: sqlite3.Connection, mode: str) -> bool:
+    """
+    إعادة journal_mode الذي سبق ملف الاتصال (WAL يبقى في الملف بعد الإغلاق)
+
+    يُستدعى قبل إغلاق الاتصال بعد آخر commit؛ الخروج من WAL يحتاج أن يكون
+    الاتصال الوحيد بالقاعدة - وإلا يبقى WAL مع تحذير.
+
+    Args:
+        conn: اتصال SQLite
+        mode: مخرجات get_journal_mode (None = بدون تعديل)
+
+    Returns:
+        True إذا أصبح journal_mode مساوياً لـ mode
+    """
+    if mode is None:
+        return True
+
+    try:
+        if get_journal_mode(conn) == mode:
+            return True
+        row = conn.execute(f"PRAGMA main.journal_mode = {mode}").fetchone()
+        if row and row[0] == mode:
+            return True
+        logger.warning(f"⚠️ تعذر إعادة journal_mode={mode} (الحالي: {row[0] if row else '?'})")
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ تعذر إعادة journal_mode={mode}: {e}")
+    return False
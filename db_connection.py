@@ -3,16 +3,109 @@
 # Database Connection & Data Retrieval - النسخة النهائية المكتملة
 
 
+import re
 import sqlite3
-from typing import Optional, List, Dict, Any
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Iterator
 from pathlib import Path
 
 
 from models.base import BaseElement, Material, Section, Story
-from models.column import Column
-from models.load_and_force import LoadCombination, Force, LoadCaseGroup
+from models.column import Column, LazyColumn
+from models.load_and_force import (LoadCombination, Force, LoadCaseGroup,
+                                   ForceRecord, FORCE_RECORD_COLUMNS)
+from config.connection_settings import apply_connection_profile
+from utils.query_stats import QueryStats
+from services.material_service import MaterialStrengthResolver, MATERIAL_STRENGTH_TABLES
 
 
+# الحد الأقصى لعدد القيم في قائمة IN الواحدة (حد SQLite للمعاملات 999 في الإصدارات القديمة)
+IN_CLAUSE_CHUNK_SIZE = 900
+
+# عدد صفوف القوى في كل fetchmany عند التحميل المجمّع (الذاكرة محدودة بالدفعة لا بعدد الصفوف)
+FORCE_FETCH_SIZE = 5000
+
+# أوضاع فتح قاعدة البيانات
+#   disk     : الملف مباشرة (الافتراضي)
+#   readonly : قراءة فقط وملف ثابت (immutable) - بدون أقفال أو فحص تغييرات
+#   memory   : نسخة كاملة في الذاكرة (backup)، تُكتب للملف مرة واحدة عند persist/disconnect
+CONNECTION_MODES = ("disk", "readonly", "memory")
+
+# عدد الصفوف في كل دفعة fetchmany عند القراءة المتدفقة
+STREAM_CHUNK_SIZE = 5000
+
+# الحجم الافتراضي لذاكرة المواد والمقاطع والطوابق لكل اتصال
+IDENTITY_MAP_SIZE = 256
+
+# استخراج أسماء الجداول المتأثرة بعمليات الكتابة
+_WRITE_TABLE_PATTERN = re.compile(
+    r'\b(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)'
+    r'\s+[`"\[]?(\w+)',
+    re.IGNORECASE
+)
+
+_MISSING = object()
+
+
+class _IdentityMap:
+    """
+    ذاكرة مؤقتة محدودة الحجم (LRU) لكائنات قاعدة البيانات
+    
+    المفتاح (اسم الجدول, المعرف)، ونفس المفتاح يعيد نفس الكائن
+    طالما لم يُحذف من الذاكرة.
+    """
+    
+    def __init__(self, max_size: int = IDENTITY_MAP_SIZE):
+        """
+        Args:
+            max_size: الحد الأقصى لعدد الكائنات (0 لتعطيل الذاكرة)
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, table: str, key):
+        """جلب كائن من الذاكرة أو _MISSING"""
+        entry = self.entries.get((table, key), _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return _MISSING
+        self.entries.move_to_end((table, key))
+        self.hits += 1
+        return entry
+    
+    def put(self, table: str, key, value):
+        """حفظ كائن مع حذف الأقدم استخداماً عند تجاوز الحد"""
+        if self.max_size <= 0:
+            return
+        self.entries[(table, key)] = value
+        self.entries.move_to_end((table, key))
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate_table(self, table: str):
+        """حذف جميع كائنات جدول معين"""
+        table = table.lower()
+        for entry_key in [k for k in self.entries if k[0].lower() == table]:
+            del self.entries[entry_key]
+    
+    def clear(self):
+        """تفريغ الذاكرة"""
+        self.entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """عدادات الإصابة والإخفاق"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'max_size': self.max_size
+        }
+
 
 class DatabaseConnection:
     """
@@ -37,16 +130,40 @@ class DatabaseConnection:
     ✅ Genralinput
     """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str = None, cache_size: int = IDENTITY_MAP_SIZE,
+                 profile: str = None, pool=None, query_stats: QueryStats = None,
+                 mode: str = "disk"):
         """
         تهيئة الاتصال
         
         Args:
-            db_path: مسار ملف قاعدة البيانات
+            db_path: مسار ملف قاعدة البيانات (اختياري عند تمرير pool)
+            cache_size: حجم ذاكرة المواد والمقاطع والطوابق (0 لتعطيلها)
+            profile: ملف الاتصال (read_heavy, bulk_write, default) - None بدون تعديل
+            pool: ConnectionPool يُستعار منه الاتصال في connect ويُعاد في disconnect
+                  (من نفس الخيط)، والملف يُحدَّد في المجمّع نفسه
+            query_stats: QueryStats لقياس زمن الاستعلامات (الافتراضي query_stats المجمّع)
+            mode: disk أو readonly أو memory (انظر CONNECTION_MODES)
         """
-        self.db_path = str(db_path)
+        if db_path is None and pool is None:
+            raise ValueError("يجب تمرير db_path أو pool")
+        if mode not in CONNECTION_MODES:
+            raise ValueError(f"وضع غير معروف: {mode} (المتاح: {', '.join(CONNECTION_MODES)})")
+        if pool is not None and mode != "disk":
+            raise ValueError("الوضع readonly/memory غير متاح مع pool")
+        
+        self.db_path = str(db_path if db_path is not None else pool.db_path)
+        self.profile = profile
+        self.mode = mode
+        self.pool = pool
+        if query_stats is None and pool is not None:
+            query_stats = pool.query_stats
+        self.query_stats = query_stats
         self.connection = None
         self.cursor = None
+        self._identity_map = _IdentityMap(cache_size)
+        self._material_strengths = {}
+        self._persisted_changes = 0
     
     def connect(self) -> bool:
         """
@@ -56,18 +173,105 @@ class DatabaseConnection:
             True إذا نجح الاتصال
         """
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            if self.pool is not None:
+                # الاتصال مشترك مع الخدمات، لذا row_factory على المؤشر فقط
+                self.connection = self.pool.acquire()
+                self.cursor = self._new_cursor()
+                self.cursor.row_factory = sqlite3.Row
+                return True
+            
+            if self.mode == "readonly":
+                uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro&immutable=1"
+                self.connection = sqlite3.connect(uri, uri=True)
+            elif self.mode == "memory":
+                self.connection = self._load_into_memory()
+            else:
+                self.connection = sqlite3.connect(self.db_path)
             self.connection.row_factory = sqlite3.Row  # للوصول بالأسماء
-            self.cursor = self.connection.cursor()
+            apply_connection_profile(self.connection, self.profile)
+            self.cursor = self._new_cursor()
             return True
         except Exception as e:
             print(f"❌ فشل الاتصال: {e}")
             return False
     
-    def disconnect(self):
-        """قطع الاتصال"""
+    def _load_into_memory(self) -> sqlite3.Connection:
+        """نسخ قاعدة البيانات من الملف إلى :memory: عبر backup"""
+        if not Path(self.db_path).exists():
+            raise FileNotFoundError(self.db_path)
+        
+        source = sqlite3.connect(self.db_path)
+        try:
+            memory = sqlite3.connect(":memory:")
+            source.backup(memory)
+        finally:
+            source.close()
+        
+        self._persisted_changes = memory.total_changes
+        return memory
+    
+    def is_dirty(self) -> bool:
+        """هل توجد تعديلات في النسخة الذاكرية لم تُكتب للملف؟"""
+        return (self.mode == "memory" and self.connection is not None
+                and self.connection.total_changes != self._persisted_changes)
+    
+    def persist(self) -> bool:
+        """
+        كتابة النسخة الذاكرية إلى الملف في خطوة backup واحدة
+        
+        Returns:
+            True إذا نجحت الكتابة (أو لا توجد تعديلات)
+        """
+        if not self.is_dirty():
+            return True
+        
+        try:
+            self.connection.commit()
+            target = sqlite3.connect(self.db_path)
+            try:
+                self.connection.backup(target)
+            finally:
+                target.close()
+            self._persisted_changes = self.connection.total_changes
+            return True
+        except Exception as e:
+            print(f"❌ فشل حفظ النسخة الذاكرية: {e}")
+            return False
+    
+    def _new_cursor(self):
+        """مؤشر جديد على الاتصال الحالي (مُقاس إذا وُجد query_stats)"""
+        cursor = self.connection.cursor()
+        if self.query_stats is not None:
+            cursor = self.query_stats.wrap_cursor(cursor)
+        return cursor
+    
+    def disconnect(self, persist: bool = True):
+        """
+        قطع الاتصال
+        
+        Args:
+            persist: في وضع memory، كتابة التعديلات للملف قبل الإغلاق
+        """
         if self.connection:
-            self.connection.close()
+            if persist:
+                self.persist()
+            if self.pool is not None:
+                self.cursor.close()
+                self.pool.release(self.connection)
+            else:
+                self.connection.close()
+            self.connection = None
+        self._identity_map.clear()
+        self._material_strengths.clear()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        إحصائيات ذاكرة المواد والمقاطع والطوابق
+        
+        Returns:
+            قاموس {hits, misses, evictions, size, max_size}
+        """
+        return self._identity_map.stats()
     
     # ════════════════════════════════════════════════════════════════
     # جلب المواد
@@ -83,6 +287,10 @@ class DatabaseConnection:
         Returns:
             كائن Material أو None
         """
+        cached = self._identity_map.get('Material_Properties_Concrete_Data', material_id)
+        if cached is not _MISSING:
+            return cached
+        
         try:
             self.cursor.execute("""
                 SELECT ID, Material, Fc, LtWtConc, IsUserFr, SSCurveOpt,
@@ -117,6 +325,7 @@ class DatabaseConnection:
                 DAngle=row['DAngle']
             )
             
+            self._identity_map.put('Material_Properties_Concrete_Data', material_id, concrete)
             return concrete
         except Exception as e:
             print(f"❌ خطأ في جلب الخرسانة: {e}")
@@ -132,6 +341,10 @@ class DatabaseConnection:
         Returns:
             كائن Material أو None
         """
+        cached = self._identity_map.get('Material_Properties_Rebar_Data', material_id)
+        if cached is not _MISSING:
+            return cached
+        
         try:
             self.cursor.execute("""
                 SELECT ID, Material, Fy, Fu, Fye, Fue, SSCurveOpt,
@@ -165,6 +378,7 @@ class DatabaseConnection:
                 FinalSlope=row['FinalSlope']
             )
             
+            self._identity_map.put('Material_Properties_Rebar_Data', material_id, rebar)
             return rebar
         except Exception as e:
             print(f"❌ خطأ في جلب الحديد: {e}")
@@ -254,6 +468,27 @@ class DatabaseConnection:
         
         return None
     
+    def get_material_strengths(self, input_id: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        مقاومات الحد الأدنى والمتوقعة لجميع المواد (محسوبة مرة واحدة)
+        
+        بديل get_concrete_lower_bound / get_rebar_lower_bound لكل عمود:
+        النتيجة تُحفظ حتى يعدّل execute_update أحد جداول المواد أو Genralinput.
+        
+        Args:
+            input_id: معرف سجل Genralinput
+            
+        Returns:
+            قاموس {factors, concrete, rebar} مفهرس بمعرف المادة واسمها
+            (انظر MaterialStrengthResolver) أو None
+        """
+        if input_id not in self._material_strengths:
+            strengths = MaterialStrengthResolver(self.connection, input_id).resolve_all()
+            if strengths is None:
+                return None
+            self._material_strengths[input_id] = strengths
+        return self._material_strengths[input_id]
+    
     # ════════════════════════════════════════════════════════════════
     # جلب المقاطع
     # ════════════════════════════════════════════════════════════════
@@ -268,6 +503,10 @@ class DatabaseConnection:
         Returns:
             كائن Section أو None
         """
+        cached = self._identity_map.get('Frame_Section_Property_Definitions_Concrete_Rectangular', section_id)
+        if cached is not _MISSING:
+            return cached
+        
         try:
             self.cursor.execute("""
                 SELECT ID, Name, Material, Depth, Width, Area,
@@ -323,6 +562,7 @@ class DatabaseConnection:
                 GUID=row['GUID']
             )
             
+            self._identity_map.put('Frame_Section_Property_Definitions_Concrete_Rectangular', section_id, section)
             return section
         except Exception as e:
             print(f"❌ خطأ في جلب المقطع: {e}")
@@ -342,6 +582,10 @@ class DatabaseConnection:
         Returns:
             كائن Story أو None
         """
+        cached = self._identity_map.get('Story_Definitions', story_id)
+        if cached is not _MISSING:
+            return cached
+        
         try:
             self.cursor.execute("""
                 SELECT ID, Tower, Name, Height, Master_Story, Similar_To,
@@ -372,6 +616,7 @@ class DatabaseConnection:
                 guid=row['GUID']
             )
             
+            self._identity_map.put('Story_Definitions', story_id, story)
             return story
         except Exception as e:
             print(f"❌ خطأ في جلب الطابق: {e}")
@@ -406,22 +651,7 @@ class DatabaseConnection:
                 return None
             
             # إنشاء كائن Column
-            column = Column(
-                etabs_id=f"C{column_id}",
-                story_name=connectivity_row['Story'],
-                section_name="Unknown"
-            )
-            
-            # تعيين بيانات الاتصال
-            column.set_connectivity(
-                unique_name=connectivity_row['Unique_Name'],
-                column_bay=connectivity_row['ColumnBay'],
-                pt_i=connectivity_row['UniquePtI'],
-                pt_j=connectivity_row['UniquePtJ'],
-                length=connectivity_row['Length'],
-                guid=connectivity_row['GUID']
-            )
-            column.element_id = connectivity_row['ElementID']
+            column = self._build_column(connectivity_row, column_id=column_id)
             
             # جلب جميع البيانات الإضافية
             self._load_column_dimensions(column)
@@ -434,6 +664,40 @@ class DatabaseConnection:
             print(f"❌ خطأ في جلب العمود: {e}")
             return None
     
+    def _build_column(self, connectivity_row, column_class=Column, column_id=None) -> Column:
+        """
+        إنشاء كائن Column من صف Column_Object_Connectivity
+        
+        Args:
+            connectivity_row: صف الاتصال
+            column_class: Column أو LazyColumn
+            column_id: المعرف المطلوب في get_column (etabs_id = C{column_id})؛
+                None = Unique_Name من الصف (التحميل المجمّع)
+            
+        Returns:
+            كائن Column ببيانات الاتصال فقط
+        """
+        if column_id is None:
+            column_id = connectivity_row['Unique_Name']
+        column = column_class(
+            etabs_id=f"C{column_id}",
+            story_name=connectivity_row['Story'],
+            section_name="Unknown"
+        )
+        
+        # تعيين بيانات الاتصال
+        column.set_connectivity(
+            unique_name=connectivity_row['Unique_Name'],
+            column_bay=connectivity_row['ColumnBay'],
+            pt_i=connectivity_row['UniquePtI'],
+            pt_j=connectivity_row['UniquePtJ'],
+            length=connectivity_row['Length'],
+            guid=connectivity_row['GUID']
+        )
+        column.element_id = connectivity_row['ElementID']
+        
+        return column
+    
     def _load_column_dimensions(self, column: Column):
         """
         تحميل الأبعاد الهندسية (Height, Width) من جدول المقاطع
@@ -465,17 +729,21 @@ class DatabaseConnection:
             
             dim_row = self.cursor.fetchone()
             if dim_row:
-                height = float(dim_row['Depth'])
-                width = float(dim_row['Width'])
-                area = float(dim_row['Area'])
-                
-                column.reinforcement['Height'] = height
-                column.reinforcement['Width'] = width
-                column.reinforcement['Area'] = area
-                column.section_name = section_name
+                self._apply_column_dimensions(column, section_name, dim_row)
         except Exception as e:
             print(f"⚠️ تحذير: خطأ في جلب الأبعاد: {e}")
     
+    def _apply_column_dimensions(self, column: Column, section_name: str, dim_row):
+        """تعيين الأبعاد الهندسية من صف المقطع"""
+        height = float(dim_row['Depth'])
+        width = float(dim_row['Width'])
+        area = float(dim_row['Area'])
+        
+        column.reinforcement['Height'] = height
+        column.reinforcement['Width'] = width
+        column.reinforcement['Area'] = area
+        column.section_name = section_name
+    
     def _load_column_reinforcement(self, column: Column):
         """
         تحميل بيانات التسليح الكاملة للعمود مع Foreign Keys
@@ -508,26 +776,30 @@ class DatabaseConnection:
             
             row = self.cursor.fetchone()
             if row:
-                column.reinforcement['ID'] = row['ID']
-                column.reinforcement['Longitudinal_Bar_Material'] = row['Longitudinal_Bar_Material']
-                column.reinforcement['Tie_Bar_Material'] = row['Tie_Bar_Material']
-                column.reinforcement['Clear_Cover_to_Ties'] = float(row['Clear_Cover_to_Ties']) if row['Clear_Cover_to_Ties'] else 40
-                column.reinforcement['Number_Bars_3_Dir'] = int(row['Number_Bars_3_Dir']) if row['Number_Bars_3_Dir'] else 0
-                column.reinforcement['Number_Bars_2_Dir'] = int(row['Number_Bars_2_Dir']) if row['Number_Bars_2_Dir'] else 0
-                column.reinforcement['Longitudinal_Bar_Size'] = float(row['Longitudinal_Bar_Size']) if row['Longitudinal_Bar_Size'] else 16
-                column.reinforcement['Tie_Bar_Size'] = float(row['Tie_Bar_Size']) if row['Tie_Bar_Size'] else 8
-                column.reinforcement['Tie_Bar_Spacing'] = float(row['Tie_Bar_Spacing']) if row['Tie_Bar_Spacing'] else 150
-                column.reinforcement['Number_Ties_3_Dir'] = int(row['Number_Ties_3_Dir']) if row['Number_Ties_3_Dir'] else 2
-                column.reinforcement['Number_Ties_2_Dir'] = int(row['Number_Ties_2_Dir']) if row['Number_Ties_2_Dir'] else 2
-                
-                # ✅ إضافة Foreign Keys:
-                column.reinforcement['LonZgitudinal_Bar_MaterialID'] = row['LonZgitudinal_Bar_MaterialID']
-                column.reinforcement['Tie_Bar_MaterialID'] = row['Tie_Bar_MaterialID']
-                column.reinforcement['NameID'] = row['NameID']
+                self._apply_column_reinforcement(column, row)
                 
         except Exception as e:
             print(f"⚠️ تحذير: خطأ في جلب التسليح: {e}")
     
+    def _apply_column_reinforcement(self, column: Column, row):
+        """تعيين بيانات التسليح من صف جدول التسليح"""
+        column.reinforcement['ID'] = row['ID']
+        column.reinforcement['Longitudinal_Bar_Material'] = row['Longitudinal_Bar_Material']
+        column.reinforcement['Tie_Bar_Material'] = row['Tie_Bar_Material']
+        column.reinforcement['Clear_Cover_to_Ties'] = float(row['Clear_Cover_to_Ties']) if row['Clear_Cover_to_Ties'] else 40
+        column.reinforcement['Number_Bars_3_Dir'] = int(row['Number_Bars_3_Dir']) if row['Number_Bars_3_Dir'] else 0
+        column.reinforcement['Number_Bars_2_Dir'] = int(row['Number_Bars_2_Dir']) if row['Number_Bars_2_Dir'] else 0
+        column.reinforcement['Longitudinal_Bar_Size'] = float(row['Longitudinal_Bar_Size']) if row['Longitudinal_Bar_Size'] else 16
+        column.reinforcement['Tie_Bar_Size'] = float(row['Tie_Bar_Size']) if row['Tie_Bar_Size'] else 8
+        column.reinforcement['Tie_Bar_Spacing'] = float(row['Tie_Bar_Spacing']) if row['Tie_Bar_Spacing'] else 150
+        column.reinforcement['Number_Ties_3_Dir'] = int(row['Number_Ties_3_Dir']) if row['Number_Ties_3_Dir'] else 2
+        column.reinforcement['Number_Ties_2_Dir'] = int(row['Number_Ties_2_Dir']) if row['Number_Ties_2_Dir'] else 2
+        
+        # ✅ إضافة Foreign Keys:
+        column.reinforcement['LonZgitudinal_Bar_MaterialID'] = row['LonZgitudinal_Bar_MaterialID']
+        column.reinforcement['Tie_Bar_MaterialID'] = row['Tie_Bar_MaterialID']
+        column.reinforcement['NameID'] = row['NameID']
+    
     def _load_column_joints(self, column: Column):
         """
         تحميل بيانات النقاط (Joints) والإحداثيات للعمود
@@ -548,16 +820,7 @@ class DatabaseConnection:
                 
                 joint_i = self.cursor.fetchone()
                 if joint_i:
-                    column.set_start_joint({
-                        'joint_id': joint_i['Joint_ID'],
-                        'name': joint_i['Unique_Name'],
-                        'x': float(joint_i['X_Coord']),
-                        'y': float(joint_i['Y_Coord']),
-                        'z': float(joint_i['Z_Coord']),
-                        'global_x': float(joint_i['Global_X']),
-                        'global_y': float(joint_i['Global_Y']),
-                        'global_z': float(joint_i['Global_Z'])
-                    })
+                    self._apply_column_joint(column, joint_i, is_start=True)
             
             # جلب بيانات النقطة الثانية
             if column.unique_pt_j:
@@ -571,19 +834,27 @@ class DatabaseConnection:
                 
                 joint_j = self.cursor.fetchone()
                 if joint_j:
-                    column.set_end_joint({
-                        'joint_id': joint_j['Joint_ID'],
-                        'name': joint_j['Unique_Name'],
-                        'x': float(joint_j['X_Coord']),
-                        'y': float(joint_j['Y_Coord']),
-                        'z': float(joint_j['Z_Coord']),
-                        'global_x': float(joint_j['Global_X']),
-                        'global_y': float(joint_j['Global_Y']),
-                        'global_z': float(joint_j['Global_Z'])
-                    })
+                    self._apply_column_joint(column, joint_j, is_start=False)
         except Exception as e:
             print(f"⚠️ تحذير: خطأ في جلب النقاط: {e}")
     
+    def _apply_column_joint(self, column: Column, joint_row, is_start: bool):
+        """تعيين نقطة البداية أو النهاية من صف Objects_and_Elements_Joints"""
+        joint = {
+            'joint_id': joint_row['Joint_ID'],
+            'name': joint_row['Unique_Name'],
+            'x': float(joint_row['X_Coord']),
+            'y': float(joint_row['Y_Coord']),
+            'z': float(joint_row['Z_Coord']),
+            'global_x': float(joint_row['Global_X']),
+            'global_y': float(joint_row['Global_Y']),
+            'global_z': float(joint_row['Global_Z'])
+        }
+        if is_start:
+            column.set_start_joint(joint)
+        else:
+            column.set_end_joint(joint)
+    
     def _load_column_forces(self, column: Column):
         """
         تحميل جميع القوى للعمود
@@ -592,31 +863,374 @@ class DatabaseConnection:
             column: كائن العمود المراد تحميل القوى إليه
         """
         try:
-            self.cursor.execute("""
-                SELECT Story, Column, Unique_Name, Output_Case, Case_Type,
-                       Station, P, V2, V3, T, M2, M3, Element,
-                       Elem_Station, Location, ElementID, Load_case_id
+            for record in self.iter_column_forces(unique_name=column.unique_name):
+                self._apply_force_record(column, record)
+        except Exception as e:
+            print(f"⚠️ تحذير: خطأ في جلب القوى: {e}")
+    
+    def _apply_column_force(self, column: Column, row):
+        """إضافة صف من Element_Forces_Columns إلى قوى العمود"""
+        column.add_force(
+            output_case=row['Output_Case'],
+            case_type=row['Case_Type'],
+            station=row['Station'],
+            p=row['P'],
+            v2=row['V2'],
+            v3=row['V3'],
+            t=row['T'],
+            m2=row['M2'],
+            m3=row['M3'],
+            element=row['Element'],
+            elem_station=row['Elem_Station'],
+            location=row['Location']
+        )
+    
+    def _apply_force_record(self, column: Column, record: ForceRecord):
+        """إضافة ForceRecord إلى قوى العمود (مقابل _apply_column_force)"""
+        column.add_force(
+            output_case=record.output_case,
+            case_type=record.case_type,
+            station=record.station,
+            p=record.p,
+            v2=record.v2,
+            v3=record.v3,
+            t=record.t,
+            m2=record.m2,
+            m3=record.m3,
+            element=record.element,
+            elem_station=record.elem_station,
+            location=record.location
+        )
+    
+    # ════════════════════════════════════════════════════════════════
+    # قراءة القوى المتدفقة (Streaming)
+    # ════════════════════════════════════════════════════════════════
+    
+    def iter_column_forces(self, story: str = None, case_type: str = None,
+                           unique_name: int = None,
+                           chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[ForceRecord]:
+        """
+        قراءة صفوف Element_Forces_Columns بشكل متدفق
+        
+        تُقرأ الصفوف على دفعات (fetchmany) بمؤشر مستقل، فتبقى الذاكرة
+        ثابتة مهما كان حجم الجدول، ويمكن استخدام الاتصال لاستعلامات
+        أخرى أثناء المرور على النتائج.
+        
+        Args:
+            story: اسم الطابق (اختياري)
+            case_type: نوع الحالة (اختياري)
+            unique_name: Unique_Name للعمود (اختياري)
+            chunk_size: عدد الصفوف في كل دفعة
+            
+        Yields:
+            ForceRecord مرتبة حسب Unique_Name ثم Output_Case
+        """
+        conditions = []
+        params = []
+        for column_name, value in (("Story", story), ("Case_Type", case_type),
+                                   ("Unique_Name", unique_name)):
+            if value is not None:
+                conditions.append(f"{column_name} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor = self._new_cursor()
+        cursor.row_factory = None  # صفوف tuple تُحوَّل مباشرة إلى ForceRecord
+        try:
+            cursor.execute(f"""
+                SELECT {', '.join(FORCE_RECORD_COLUMNS)}
                 FROM Element_Forces_Columns
-                WHERE Unique_Name = ?
-                ORDER BY Output_Case
-            """, (column.unique_name,))
+                {where}
+                ORDER BY Unique_Name, Output_Case
+            """, params)
             
-            rows = self.cursor.fetchall()
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield ForceRecord._make(row)
+        finally:
+            cursor.close()
+    
+    # ════════════════════════════════════════════════════════════════
+    # جلب الأعمدة دفعة واحدة (Bulk)
+    # ════════════════════════════════════════════════════════════════
+    
+    def get_columns_bulk(self, story: str = None,
+                         unique_names: List[int] = None,
+                         lazy: bool = False) -> List[Column]:
+        """
+        جلب مجموعة أعمدة دفعة واحدة بعدد ثابت من الاستعلامات
+        
+        بدلاً من 6 استعلامات أو أكثر لكل عمود (get_column)، يتم جلب
+        كل جدول مرة واحدة لجميع الأعمدة باستخدام قوائم IN ثم بناء
+        الكائنات في مرور واحد.
+        
+        في الوضع المؤجل (lazy=True) تُجلب بيانات الاتصال والمقطع فقط،
+        وتُعاد كائنات LazyColumn تُحمَّل قواها ونقاطها وتسليحها عند أول
+        وصول، لجميع أعمدة نفس الاستدعاء دفعة واحدة.
+        
+        Args:
+            story: اسم الطابق (اختياري)
+            unique_names: قائمة Unique_Name للأعمدة المطلوبة (اختياري)
+            lazy: تأجيل تحميل forces و joints و reinforcement
+            
+        Returns:
+            قائمة كائنات Column مطابقة لما يعيده get_column، مرتبة حسب Unique_Name
+        """
+        column_class = LazyColumn if lazy else Column
+        try:
+            connectivity_rows = self._fetch_bulk_connectivity(story, unique_names)
+            if not connectivity_rows:
+                return []
+            
+            columns = [self._build_column(row, column_class) for row in connectivity_rows]
+        except Exception as e:
+            print(f"❌ خطأ في جلب الأعمدة: {e}")
+            return []
+        
+        if lazy:
+            group = _LazyColumnGroup(self, columns)
+            for column in columns:
+                column.set_loader(group.load)
+            return columns
+        
+        self._bulk_load_dimensions(columns)
+        self._bulk_load_reinforcement(columns)
+        self._bulk_load_joints(columns)
+        self._bulk_load_forces(columns)
+        
+        return columns
+    
+    def _fetch_bulk_connectivity(self, story: str = None,
+                                 unique_names: List[int] = None) -> List[Any]:
+        """جلب صفوف Column_Object_Connectivity حسب الطابق و/أو قائمة المعرفات"""
+        query = """
+            SELECT Unique_Name, Story, ColumnBay, UniquePtI, UniquePtJ,
+                   Length, GUID, ElementID
+            FROM Column_Object_Connectivity
+        """
+        conditions = []
+        params = []
+        if story is not None:
+            conditions.append("Story = ?")
+            params.append(story)
+        
+        if unique_names is None:
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            self.cursor.execute(query + " ORDER BY Unique_Name", params)
+            return self.cursor.fetchall()
+        
+        conditions.append("Unique_Name IN ({placeholders})")
+        rows = self._fetch_in_chunks(
+            query + " WHERE " + " AND ".join(conditions),
+            unique_names,
+            prefix_params=tuple(params)
+        )
+        return sorted(rows, key=lambda row: row['Unique_Name'])
+    
+    def _fetch_in_chunks(self, query: str, values, prefix_params: tuple = ()) -> List[Any]:
+        """
+        تنفيذ استعلام يحتوي على {placeholders} لقائمة IN على دفعات
+        
+        SQLite يحدّ عدد المعاملات في الجملة الواحدة، لذلك تُقسَّم القيم
+        إلى دفعات بحجم IN_CLAUSE_CHUNK_SIZE.
+        
+        Args:
+            query: نص الاستعلام مع {placeholders} مكان قائمة IN
+            values: القيم المراد البحث عنها (تُحذف المكررة و None)
+            prefix_params: معاملات تسبق قائمة IN في الاستعلام
+            
+        Returns:
+            جميع الصفوف من جميع الدفعات
+        """
+        return list(self._iter_in_chunks(query, values, prefix_params))
+    
+    def _iter_in_chunks(self, query: str, values, prefix_params: tuple = (),
+                        fetch_size: int = None):
+        """
+        مثل _fetch_in_chunks لكن يعيد الصفوف تباعاً (fetchmany بحجم fetch_size)
+        
+        يُستخدم مؤشر مستقل حتى لا تتأثر القراءة باستعلامات self.cursor أثناء المرور.
+        
+        Args:
+            query: نص الاستعلام مع {placeholders} مكان قائمة IN
+            values: القيم المراد البحث عنها (تُحذف المكررة و None)
+            prefix_params: معاملات تسبق قائمة IN في الاستعلام
+            fetch_size: عدد الصفوف في كل fetchmany (None = fetchall لكل دفعة IN)
+            
+        Returns:
+            مولّد الصفوف
+        """
+        unique_values = list(dict.fromkeys(v for v in values if v is not None))
+        cursor = self._new_cursor()
+        cursor.row_factory = sqlite3.Row
+        try:
+            for start in range(0, len(unique_values), IN_CLAUSE_CHUNK_SIZE):
+                chunk = unique_values[start:start + IN_CLAUSE_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(query.format(placeholders=placeholders),
+                               tuple(prefix_params) + tuple(chunk))
+                if fetch_size is None:
+                    yield from cursor.fetchall()
+                    continue
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield from rows
+        finally:
+            cursor.close()
+    
+    def _bulk_load_dimensions(self, columns: List[Column]):
+        """تحميل الأبعاد لجميع الأعمدة (مقابل _load_column_dimensions)"""
+        dimensions = self._bulk_fetch_dimensions(columns)
+        for column in columns:
+            if id(column) not in dimensions:
+                continue
+            section_name, dim_row = dimensions[id(column)]
+            try:
+                self._apply_column_dimensions(column, section_name, dim_row)
+            except Exception as e:
+                print(f"⚠️ تحذير: خطأ في جلب الأبعاد: {e}")
+    
+    def _bulk_fetch_dimensions(self, columns: List[Column]) -> Dict[int, tuple]:
+        """
+        جلب اسم المقطع وصف الأبعاد لكل عمود
+        
+        Returns:
+            قاموس {id(column): (section_name, dim_row)} للأعمدة التي وُجد مقطعها
+        """
+        try:
+            section_by_element = {}
+            for row in self._fetch_in_chunks("""
+                SELECT ElementID, SectionName
+                FROM Frame_Assignments_Section_Properties
+                WHERE ElementID IN ({placeholders})
+            """, [column.element_id for column in columns]):
+                # أول صف لكل عنصر (مثل LIMIT 1)
+                section_by_element.setdefault(row['ElementID'], row['SectionName'])
+            
+            dims_by_name = {}
+            for row in self._fetch_in_chunks("""
+                SELECT Name, Depth, Width, Area
+                FROM Frame_Section_Property_Definitions_Concrete_Rectangular
+                WHERE Name IN ({placeholders})
+            """, section_by_element.values()):
+                dims_by_name.setdefault(row['Name'], row)
+        except Exception as e:
+            print(f"⚠️ تحذير: خطأ في جلب الأبعاد: {e}")
+            return {}
+        
+        dimensions = {}
+        for column in columns:
+            section_name = section_by_element.get(column.element_id)
+            dim_row = dims_by_name.get(section_name)
+            if dim_row:
+                dimensions[id(column)] = (section_name, dim_row)
+        return dimensions
+    
+    def _bulk_load_reinforcement(self, columns: List[Column]):
+        """تحميل التسليح لجميع الأعمدة (مقابل _load_column_reinforcement)"""
+        try:
+            reinforcement_by_name = {}
+            for row in self._fetch_in_chunks("""
+                SELECT 
+                    ID,
+                    Name,
+                    Longitudinal_Bar_Material,
+                    Tie_Bar_Material,
+                    Clear_Cover_to_Ties,
+                    Number_Bars_3_Dir,
+                    Number_Bars_2_Dir,
+                    Longitudinal_Bar_Size,
+                    Tie_Bar_Size,
+                    Tie_Bar_Spacing,
+                    Number_Ties_3_Dir,
+                    Number_Ties_2_Dir,
+                    Reinforcement_Configuration,
+                    LonZgitudinal_Bar_MaterialID,
+                    Tie_Bar_MaterialID,
+                    NameID
+                FROM Frame_Section_Property_Definitions_Concrete_Column_Reinforcing
+                WHERE Name IN ({placeholders})
+            """, [column.section_name for column in columns]):
+                reinforcement_by_name.setdefault(row['Name'], row)
+        except Exception as e:
+            print(f"⚠️ تحذير: خطأ في جلب التسليح: {e}")
+            return
+        
+        for column in columns:
+            row = reinforcement_by_name.get(column.section_name)
+            if not row:
+                continue
+            try:
+                self._apply_column_reinforcement(column, row)
+            except Exception as e:
+                print(f"⚠️ تحذير: خطأ في جلب التسليح: {e}")
+    
+    def _bulk_load_joints(self, columns: List[Column]):
+        """تحميل النقاط لجميع الأعمدة (مقابل _load_column_joints)"""
+        points = {}
+        for column in columns:
+            try:
+                points[id(column)] = (column.unique_pt_i, column.unique_pt_j)
+            except Exception as e:
+                print(f"⚠️ تحذير: خطأ في جلب النقاط: {e}")
+        
+        if not points:
+            return
+        
+        try:
+            joints_by_name = {}
+            for row in self._fetch_in_chunks("""
+                SELECT Joint_ID, Unique_Name, X_Coord, Y_Coord, Z_Coord,
+                       Global_X, Global_Y, Global_Z
+                FROM Objects_and_Elements_Joints
+                WHERE Unique_Name IN ({placeholders})
+            """, [pt for pair in points.values() for pt in pair if pt]):
+                joints_by_name.setdefault(row['Unique_Name'], row)
+        except Exception as e:
+            print(f"⚠️ تحذير: خطأ في جلب النقاط: {e}")
+            return
+        
+        for column in columns:
+            if id(column) not in points:
+                continue
+            pt_i, pt_j = points[id(column)]
+            try:
+                if pt_i and pt_i in joints_by_name:
+                    self._apply_column_joint(column, joints_by_name[pt_i], is_start=True)
+                if pt_j and pt_j in joints_by_name:
+                    self._apply_column_joint(column, joints_by_name[pt_j], is_start=False)
+            except Exception as e:
+                print(f"⚠️ تحذير: خطأ في جلب النقاط: {e}")
+    
+    def _bulk_load_forces(self, columns: List[Column]):
+        """تحميل القوى لجميع الأعمدة (مقابل _load_column_forces)"""
+        columns_by_name = {}
+        for column in columns:
+            columns_by_name.setdefault(column.unique_name, []).append(column)
+        
+        # الصفوف تُطبَّق أثناء القراءة (fetchmany) دون تحميل قوى جميع الأعمدة في قائمة
+        rows = self._iter_in_chunks("""
+            SELECT Story, Column, Unique_Name, Output_Case, Case_Type,
+                   Station, P, V2, V3, T, M2, M3, Element,
+                   Elem_Station, Location, ElementID, Load_case_id
+            FROM Element_Forces_Columns
+            WHERE Unique_Name IN ({placeholders})
+            ORDER BY Unique_Name, Output_Case
+        """, columns_by_name.keys(), fetch_size=FORCE_FETCH_SIZE)
+        
+        try:
             for row in rows:
-                column.add_force(
-                    output_case=row['Output_Case'],
-                    case_type=row['Case_Type'],
-                    station=row['Station'],
-                    p=row['P'],
-                    v2=row['V2'],
-                    v3=row['V3'],
-                    t=row['T'],
-                    m2=row['M2'],
-                    m3=row['M3'],
-                    element=row['Element'],
-                    elem_station=row['Elem_Station'],
-                    location=row['Location']
-                )
+                for column in columns_by_name.get(row['Unique_Name'], ()):
+                    try:
+                        self._apply_column_force(column, row)
+                    except Exception as e:
+                        print(f"⚠️ تحذير: خطأ في جلب القوى: {e}")
         except Exception as e:
             print(f"⚠️ تحذير: خطأ في جلب القوى: {e}")
     
@@ -746,31 +1360,45 @@ class DatabaseConnection:
 
     def get_load_combinations_extended(self) -> List[Dict]:
         """جلب حالات التحميل مع جميع المكونات (NEW)"""
+        return list(self.iter_load_combinations_extended())
+    
+    def iter_load_combinations_extended(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict]:
+        """
+        قراءة حالات التحميل مع المكونات بشكل متدفق (fetchmany)
+        
+        Args:
+            chunk_size: عدد الصفوف في كل دفعة
+            
+        Yields:
+            قاموس لكل صف بنفس شكل get_load_combinations_extended
+        """
+        cursor = self._new_cursor()
+        cursor.row_factory = sqlite3.Row
         try:
-            self.cursor.execute("""
+            cursor.execute("""
             SELECT ID, Name, Type, Is_Auto, GUID, Load_Name, SF
             FROM Load_Combination_Definitions
             ORDER BY Name
             """)
             
-            rows = self.cursor.fetchall()
-            results = []
-            for row in rows:
-                results.append({
-                    'id': row['ID'],
-                    'name': row['Name'],
-                    'type': row['Type'],
-                    'is_auto': row['Is_Auto'],
-                    'guid': row['GUID'],
-                    'load_name': row['Load_Name'],
-                    'scale_factor': float(row['SF']) if row['SF'] else 1.0
-                })
-            
-            return results
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row['ID'],
+                        'name': row['Name'],
+                        'type': row['Type'],
+                        'is_auto': row['Is_Auto'],
+                        'guid': row['GUID'],
+                        'load_name': row['Load_Name'],
+                        'scale_factor': float(row['SF']) if row['SF'] else 1.0
+                    }
         except Exception as e:
             print(f"❌ خطأ في جلب حالات التحميل: {e}")
-        
-        return []
+        finally:
+            cursor.close()
     
     # ════════════════════════════════════════════════════════════════
     # جلب البيانات العامة من Genralinput (NEW)
@@ -879,6 +1507,10 @@ class DatabaseConnection:
         try:
             self.cursor.execute(query, params)
             self.connection.commit()
+            for table in _WRITE_TABLE_PATTERN.findall(query):
+                self._identity_map.invalidate_table(table)
+                if table.lower() in {name.lower() for name in MATERIAL_STRENGTH_TABLES}:
+                    self._material_strengths.clear()
             return True
         except Exception as e:
             print(f"❌ خطأ في التحديث: {e}")
@@ -893,3 +1525,60 @@ class DatabaseConnection:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """دعم Context Manager"""
         self.disconnect()
+
+
+# ════════════════════════════════════════════════════════════════
+# مجموعة الأعمدة المؤجلة (Lazy)
+# ════════════════════════════════════════════════════════════════
+
+class _LazyColumnGroup:
+    """
+    محمّل مشترك لأعمدة LazyColumn الناتجة عن استدعاء get_columns_bulk واحد
+    
+    عند أول وصول لحقل في أي عمود من المجموعة يُحمَّل الحقل لجميع
+    أعمدة المجموعة باستعلامات IN مجمّعة.
+    """
+    
+    def __init__(self, db: DatabaseConnection, columns: List[LazyColumn]):
+        """
+        Args:
+            db: الاتصال المستخدم في التحميل
+            columns: أعمدة المجموعة (ببيانات الاتصال فقط)
+        """
+        self.db = db
+        self.columns = columns
+        self.loaded_fields = set()
+        
+        # اسم المقطع مطلوب مباشرة، والأبعاد تُحفظ حتى تحميل التسليح
+        self.dimensions = db._bulk_fetch_dimensions(columns)
+        for column in columns:
+            if id(column) in self.dimensions:
+                column.section_name = self.dimensions[id(column)][0]
+    
+    def load(self, field: str):
+        """
+        تحميل حقل لجميع أعمدة المجموعة (مرة واحدة لكل حقل)
+        
+        Args:
+            field: 'forces' أو 'joints' أو 'reinforcement'
+        """
+        if field in self.loaded_fields:
+            return
+        self.loaded_fields.add(field)
+        for column in self.columns:
+            column.mark_loaded(field)
+        
+        if field == 'forces':
+            self.db._bulk_load_forces(self.columns)
+        elif field == 'joints':
+            self.db._bulk_load_joints(self.columns)
+        elif field == 'reinforcement':
+            for column in self.columns:
+                if id(column) not in self.dimensions:
+                    continue
+                section_name, dim_row = self.dimensions[id(column)]
+                try:
+                    self.db._apply_column_dimensions(column, section_name, dim_row)
+                except Exception as e:
+                    print(f"⚠️ تحذير: خطأ في جلب الأبعاد: {e}")
+            self.db._bulk_load_reinforcement(self.columns)
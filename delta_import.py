@@ -0,0 +1,367 @@
+# database/delta_import.py - الإدراج التزايدي (delta)
+# المهمة الوحيدة: مقارنة بصمات صفوف VEDA بالإدراج السابق وتطبيق الفرق فقط (إضافة/تعديل/حذف)
+#
+# حالة الإدراج السابق في جدول Import_Row_Hashes داخل القاعدة الجديدة:
+#   (Table_Name, Row_Key) → (Row_Hash, Row_ID)
+#   Row_Key  = قيم أعمدة DELTA_KEYS + ترتيب تكرار المفتاح في VEDA (مثل صفوف Max/Min لنفس المحطة)
+#   Row_Hash = بصمة صف VEDA الخام (قبل التحويل - الصف غير المتغير لا يُحوّل ولا يُكتب)
+#   Row_ID   = عنوان الصف في الجدول الهدف (جدول التخزين للجداول المرمزة): قيمة المفتاح الأساسي
+#              إذا كان عموداً واحداً منسوخاً من VEDA (مثل WITHOUT ROWID)، وإلا rowid
+# الجدول بدون مفتاح يُقارن ببصمة الجدول كاملاً (Row_Key = '*'، Row_ID = عدد الصفوف)
+# ويُستبدل كاملاً عند أي تغيير (جداول صغيرة يتبع فيها ترتيب ID ترتيب VEDA، مثل الطوابق).
+#
+# أعمدة ID التي يملؤها الربط (id_fill / id_fill_complex / static_id) تُفرغ (NULL) للصفوف المعدلة
+# ولكل الصفوف التي تشير إلى جدول تغير، فيعيد main_link.py ملأها (الربط يملأ NULL فقط).
+
+import hashlib
+import sqlite3
+from typing import Callable, List, Optional
+
+from config.link_settings import ALL_LINKS
+from database.batch_insert import insert_rows
+
+DELTA_STATE_TABLE = "Import_Row_Hashes"
+TABLE_KEY = "*"
+LINK_FILL_TYPES = ("id_fill", "id_fill_complex", "static_id")
+
+
+# ============================================================
+# البصمات والاستعلامات
+# ============================================================
+
+def row_hash(row: tuple) -> int:
+    """بصمة صف (64 بت - تُخزن في عمود INTEGER)"""
+    digest = hashlib.blake2b(repr(row).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def get_source_query(table_name: str, columns_to_copy: list, key_columns: list = None) -> str:
+    """
+    استعلام قراءة جدول VEDA للإدراج التزايدي
+
+    مع مفتاح: عمود أخير إضافي = قيم المفتاح مجمعة داخل SQLite (quote) - يُضاف إليها
+    ترتيب التكرار في apply_chunk (أرخص من ROW_NUMBER الذي يفرز الجدول كاملاً).
+
+    Args:
+        table_name: جدول VEDA
+        columns_to_copy: [(عمود VEDA، عمود القاعدة الجديدة)]
+        key_columns: أعمدة المفتاح (بأسماء القاعدة الجديدة) أو None
+
+    Returns:
+        SQL
+    """
+    cols_str = ", ".join(f'"{veda_col}"' for veda_col, _ in columns_to_copy)
+    if not key_columns:
+        return f'SELECT {cols_str} FROM "{table_name}"'
+
+    veda_names = {new_col: veda_col for veda_col, new_col in columns_to_copy}
+    key_cols = [f'"{veda_names[col]}"' for col in key_columns]
+    key_expr = " || char(31) || ".join(f"quote({col})" for col in key_cols)
+    return f'SELECT {cols_str}, {key_expr} FROM "{table_name}" ORDER BY rowid'
+
+
+def ensure_state_table(conn: sqlite3.Connection):
+    """إنشاء جدول حالة الإدراج التزايدي إن لم يوجد"""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS "{DELTA_STATE_TABLE}" (
+            "Table_Name" TEXT NOT NULL,
+            "Row_Key" TEXT NOT NULL,
+            "Row_Hash" INTEGER NOT NULL,
+            "Row_ID" INTEGER,
+            PRIMARY KEY ("Table_Name", "Row_Key")
+        ) WITHOUT ROWID
+    ''')
+
+
+def reset_child_links(conn: sqlite3.Connection, table_name: str, storage_of: Callable) -> int:
+    """
+    إفراغ أعمدة ID التي تشير إلى جدول تغير (ليعيد الربط ملأها)
+
+    Args:
+        storage_of: دالة (الجدول، الأعمدة) → (جدول التخزين، أعمدته)
+
+    Returns:
+        عدد الصفوف المعدلة
+    """
+    reset = 0
+    for link in ALL_LINKS:
+        if link["target_table"] != table_name or link["type"] not in LINK_FILL_TYPES:
+            continue
+        source_table, (source_column,) = storage_of(link["source_table"], [link["source_column"]])
+        try:
+            cursor = conn.execute(
+                f'UPDATE "{source_table}" SET "{source_column}" = NULL WHERE "{source_column}" IS NOT NULL'
+            )
+            reset += cursor.rowcount
+        except sqlite3.OperationalError:
+            # جدول أو عمود غير موجود في هذه القاعدة
+            continue
+    return reset
+
+
+# ============================================================
+# تطبيق الفرق لجدول واحد
+# ============================================================
+
+class DeltaTable:
+    """
+    حالة جدول واحد ومقارنة صفوفه بالإدراج السابق
+
+    الاستدعاء: is_consistent / reset ثم apply_chunk لكل دفعة ثم finish (جدول بمفتاح)،
+    أو add_table_rows لكل دفعة ثم table_changed، وبعد إعادة الإدراج save_table_state (جدول بدون مفتاح).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, table_name: str, columns: List[str],
+                 key_columns: Optional[List[str]], storage_of: Callable):
+        self.conn = conn
+        self.table_name = table_name
+        self.columns = columns
+        self.target_table, self.target_cols = storage_of(table_name, columns)
+
+        info = conn.execute(f'PRAGMA table_info("{self.target_table}")').fetchall()
+        self.row_column, self.row_index = self._row_address(info)
+
+        # جدول WITHOUT ROWID بلا مفتاح أساسي منسوخ: لا عنوان للصف - مقارنة الجدول كاملاً
+        self.key_columns = key_columns if self.row_column else None
+
+        # أعمدة ID يملؤها الربط في هذا الجدول (تُفرغ للصفوف المعدلة)
+        own_links = [link["source_column"] for link in ALL_LINKS
+                     if link["source_table"] == table_name and link["type"] in LINK_FILL_TYPES]
+        existing = {col[1] for col in info}
+        self.own_links = [col for col in storage_of(table_name, own_links)[1] if col in existing]
+
+        self.stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "failed": 0}
+
+        # بصمة الجدول كاملاً (جدول بدون مفتاح)
+        self._digest = hashlib.blake2b(digest_size=8)
+        self.row_count = 0
+
+        ensure_state_table(conn)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS delta_chunk "
+                     "(Pos INTEGER PRIMARY KEY, Row_Key TEXT, Row_Hash INTEGER)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS delta_seen (Row_Key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.delta_seen")
+        self._occurrences = {}
+        self._failed_inserts = []
+
+    def _row_address(self, info: list):
+        """
+        عمود عنوان الصف في الجدول الهدف
+
+        Returns:
+            (المفتاح الأساسي، موضعه في الأعمدة المنسوخة) إذا كان عموداً واحداً منسوخاً،
+            وإلا ("rowid"، None) - أو (None، None) لجدول WITHOUT ROWID
+        """
+        keys = [col[1] for col in info if col[5]]
+        if len(keys) == 1 and keys[0] in self.target_cols:
+            return keys[0], self.target_cols.index(keys[0])
+        try:
+            self.conn.execute(f'SELECT rowid FROM "{self.target_table}" LIMIT 0')
+        except sqlite3.OperationalError:
+            return None, None
+        return "rowid", None
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.stats["inserted"] or self.stats["updated"] or self.stats["deleted"])
+
+    # ════════════════════════════════════════════════════════════════
+    # الحالة
+    # ════════════════════════════════════════════════════════════════
+
+    def _target_count(self) -> int:
+        return self.conn.execute(f'SELECT COUNT(*) FROM "{self.target_table}"').fetchone()[0]
+
+    def _table_state(self):
+        """(البصمة، عدد الصفوف) المحفوظة للجدول بدون مفتاح، أو None"""
+        return self.conn.execute(
+            f'SELECT "Row_Hash", "Row_ID" FROM "{DELTA_STATE_TABLE}" '
+            f'WHERE "Table_Name" = ? AND "Row_Key" = ?', (self.table_name, TABLE_KEY)
+        ).fetchone()
+
+    def is_consistent(self) -> bool:
+        """
+        هل تطابق الحالة المحفوظة محتوى الجدول الهدف؟
+
+        (عدد الصفوف - يكشف قاعدة أُدرجت بوضع آخر بعد آخر إدراج تزايدي)
+        """
+        if self.key_columns:
+            state_count = self.conn.execute(
+                f'SELECT COUNT(*) FROM "{DELTA_STATE_TABLE}" WHERE "Table_Name" = ?', (self.table_name,)
+            ).fetchone()[0]
+        else:
+            state = self._table_state()
+            state_count = state[1] if state else 0
+        return state_count == self._target_count()
+
+    def reset(self):
+        """حذف صفوف الجدول الهدف وحالته (إعادة إدراج كاملة)"""
+        self.stats["deleted"] += self.conn.execute(f'DELETE FROM "{self.target_table}"').rowcount
+        self.conn.execute(f'DELETE FROM "{DELTA_STATE_TABLE}" WHERE "Table_Name" = ?', (self.table_name,))
+
+    # ════════════════════════════════════════════════════════════════
+    # جدول بدون مفتاح
+    # ════════════════════════════════════════════════════════════════
+
+    def add_table_rows(self, rows: list):
+        """إضافة دفعة صفوف إلى بصمة الجدول كاملاً (بترتيب VEDA)"""
+        for row in rows:
+            self._digest.update(repr(row).encode("utf-8"))
+            self._digest.update(b"\x1e")
+        self.row_count += len(rows)
+
+    @property
+    def table_hash(self) -> int:
+        return int.from_bytes(self._digest.digest(), "big", signed=True)
+
+    def table_changed(self) -> bool:
+        """مقارنة بصمة الجدول كاملاً بالإدراج السابق"""
+        return self._table_state() != (self.table_hash, self.row_count)
+
+    def save_table_state(self):
+        """حفظ بصمة الجدول بعد إعادة إدراجه"""
+        self.conn.execute(
+            f'INSERT OR REPLACE INTO "{DELTA_STATE_TABLE}" VALUES (?, ?, ?, ?)',
+            (self.table_name, TABLE_KEY, self.table_hash, self.row_count)
+        )
+
+    # ════════════════════════════════════════════════════════════════
+    # جدول بمفتاح
+    # ════════════════════════════════════════════════════════════════
+
+    def _changed_positions(self, keys: list, hashes: list) -> list:
+        """
+        مواضع صفوف الدفعة الجديدة أو المتغيرة (المقارنة داخل SQLite)
+
+        Returns:
+            [(الموضع، Row_ID السابق أو None)]
+        """
+        self.conn.execute("DELETE FROM temp.delta_chunk")
+        self.conn.executemany("INSERT INTO temp.delta_chunk VALUES (?, ?, ?)",
+                              zip(range(len(keys)), keys, hashes))
+        self.conn.execute("INSERT OR IGNORE INTO temp.delta_seen SELECT Row_Key FROM temp.delta_chunk")
+        return self.conn.execute(
+            f'SELECT c.Pos, s."Row_ID" FROM temp.delta_chunk AS c '
+            f'LEFT JOIN "{DELTA_STATE_TABLE}" AS s ON s."Table_Name" = ? AND s."Row_Key" = c.Row_Key '
+            f'WHERE s."Row_Hash" IS NOT c.Row_Hash ORDER BY c.Pos',
+            (self.table_name,)
+        ).fetchall()
+
+    def apply_chunk(self, rows: list, keys: list, prepare: Callable):
+        """
+        مقارنة دفعة صفوف VEDA بالإدراج السابق وتطبيق الإضافات والتعديلات
+
+        Args:
+            rows: صفوف VEDA الخام (بدون عمود المفتاح)
+            keys: قيم مفتاح كل صف (العمود الأخير من get_source_query)
+            prepare: تحويل الصفوف الخام إلى قيم الجدول الهدف (التحويل والترميز) - للمتغيرة فقط
+        """
+        occurrences = self._occurrences
+        row_keys = []
+        for key in keys:
+            occurrence = occurrences[key] = occurrences.get(key, 0) + 1
+            row_keys.append(f"{key}\x1f{occurrence}")
+        keys = row_keys
+
+        hashes = [row_hash(row) for row in rows]
+        changed = self._changed_positions(keys, hashes)
+        self.stats["unchanged"] += len(rows) - len(changed)
+        if not changed:
+            return
+
+        positions = [pos for pos, _ in changed]
+        prepared = dict(zip(positions, prepare([rows[pos] for pos in positions])))
+
+        state = []
+        inserts = [(keys[pos], hashes[pos], prepared[pos]) for pos, row_id in changed if row_id is None]
+        if inserts:
+            state += self._insert(inserts)
+        updates = [(keys[pos], hashes[pos], prepared[pos], row_id) for pos, row_id in changed if row_id is not None]
+        if updates:
+            state += self._update(updates)
+        if state:
+            self.conn.executemany(f'INSERT OR REPLACE INTO "{DELTA_STATE_TABLE}" VALUES (?, ?, ?, ?)', state)
+
+    def _insert(self, inserts: list) -> list:
+        """
+        إدراج صفوف جديدة بـ executemany
+
+        عنوان كل صف: قيمة المفتاح الأساسي إذا كان منسوخاً، وإلا يُلحق SQLite
+        الصفوف بعد أكبر rowid بالتتابع (الصف المرفوض لا يستهلك رقماً).
+        """
+        cols_str = ", ".join(f'"{col}"' for col in self.target_cols)
+        placeholders = ", ".join("?" for _ in self.target_cols)
+        insert_sql = f'INSERT INTO "{self.target_table}" ({cols_str}) VALUES ({placeholders})'
+
+        next_rowid = None
+        if self.row_index is None:
+            next_rowid = self.conn.execute(
+                f'SELECT COALESCE(MAX(rowid), 0) + 1 FROM "{self.target_table}"'
+            ).fetchone()[0]
+        failed = set()
+        insert_rows(self.conn, insert_sql, [row for _, _, row in inserts],
+                    on_error=lambda index, row, error: failed.add(index))
+
+        state = []
+        for index, (key, hash_value, row) in enumerate(inserts):
+            if index in failed:
+                # يُعاد مرة بعد الحذف في finish (مفتاح أساسي لصف محذوف)، ثم في التشغيل التالي
+                self._failed_inserts.append((key, hash_value, row))
+                continue
+            if self.row_index is not None:
+                row_id = row[self.row_index]
+            else:
+                row_id = next_rowid
+                next_rowid += 1
+            state.append((self.table_name, key, hash_value, row_id))
+        self.stats["inserted"] += len(state)
+        return state
+
+    def _update(self, updates: list) -> list:
+        """تعديل الصفوف المتغيرة بعنوانها وإفراغ أعمدة الربط فيها"""
+        assignments = [f'"{col}" = ?' for col in self.target_cols]
+        assignments += [f'"{col}" = NULL' for col in self.own_links]
+        update_sql = f'UPDATE "{self.target_table}" SET {", ".join(assignments)} WHERE "{self.row_column}" = ?'
+
+        failed = set()
+        insert_rows(self.conn, update_sql, [tuple(row) + (row_id,) for _, _, row, row_id in updates],
+                    on_error=lambda index, row, error: failed.add(index))
+
+        state = []
+        for index, (key, hash_value, row, row_id) in enumerate(updates):
+            if index in failed:
+                continue
+            # تعديل المفتاح الأساسي يغير عنوان الصف نفسه
+            if self.row_index is not None:
+                row_id = row[self.row_index]
+            state.append((self.table_name, key, hash_value, row_id))
+        self.stats["failed"] += len(failed)
+        self.stats["updated"] += len(state)
+        return state
+
+    def finish(self):
+        """حذف الصفوف التي لم تعد في VEDA، ثم إعادة محاولة الإدراج المرفوض"""
+        missing = self.conn.execute(
+            f'SELECT "Row_Key", "Row_ID" FROM "{DELTA_STATE_TABLE}" '
+            f'WHERE "Table_Name" = ? AND "Row_Key" NOT IN (SELECT Row_Key FROM temp.delta_seen)',
+            (self.table_name,)
+        ).fetchall()
+        if missing:
+            self.conn.executemany(
+                f'DELETE FROM "{self.target_table}" WHERE "{self.row_column}" = ?',
+                [(row_id,) for _, row_id in missing]
+            )
+            self.conn.executemany(
+                f'DELETE FROM "{DELTA_STATE_TABLE}" WHERE "Table_Name" = ? AND "Row_Key" = ?',
+                [(self.table_name, key) for key, _ in missing]
+            )
+            self.stats["deleted"] += len(missing)
+
+        if missing and self._failed_inserts:
+            retry, self._failed_inserts = self._failed_inserts, []
+            state = self._insert(retry)
+            if state:
+                self.conn.executemany(f'INSERT OR REPLACE INTO "{DELTA_STATE_TABLE}" VALUES (?, ?, ?, ?)', state)
+        self.stats["failed"] += len(self._failed_inserts)
+        self._failed_inserts = []
+        self.conn.execute("DELETE FROM temp.delta_seen")
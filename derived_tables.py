@@ -0,0 +1,512 @@
+# database/derived_tables.py - الجداول المشتقة (تُبنى بعد الربط)
+# المهمة الوحيدة: بناء جداول ملخصة (غلاف القوى، حقائق الأعمدة) بتمريرة واحدة لكل جدول
+
+import sqlite3
+import logging
+from config.connection_settings import apply_connection_profile, get_journal_mode, restore_journal_mode
+from services.material_service import MaterialStrengthResolver
+from database.schema import ENCODED_TABLES
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Column_Force_Envelopes - غلاف قوى الأعمدة
+# ============================================================
+# صف واحد لكل (Story, Column): أقصى وأدنى قيمة لكل قوة مع التركيبة
+# (Output_Case) والمحطة (Station) والمعرف (ID) للصف الحاكم.
+# عند تساوي القيم يُختار الصف الأقدم (أصغر ID) - نفس قاعدة التحديث التزايدي.
+
+ENVELOPE_TABLE = "Column_Force_Envelopes"
+ENVELOPE_FORCES = ("P", "V2", "V3", "T", "M2", "M3")
+ENVELOPE_EXTREMES = (("Max", "MAX"), ("Min", "MIN"))
+
+
+def get_envelope_ddl() -> str:
+    """CREATE TABLE لجدول Column_Force_Envelopes"""
+    columns = [
+        '"Story" TEXT NOT NULL',
+        '"Column" TEXT NOT NULL',
+        '"Unique_Name" INTEGER',
+        '"Row_Count" INTEGER',
+    ]
+    for force in ENVELOPE_FORCES:
+        for suffix, _ in ENVELOPE_EXTREMES:
+            columns += [
+                f'"{force}_{suffix}" REAL',
+                f'"{force}_{suffix}_Case" TEXT',
+                f'"{force}_{suffix}_Station" REAL',
+                f'"{force}_{suffix}_ID" INTEGER',
+            ]
+    columns.append('PRIMARY KEY ("Story", "Column")')
+    columns_sql = ",\n\t".join(columns)
+    return f'CREATE TABLE "{ENVELOPE_TABLE}" (\n\t{columns_sql}\n) WITHOUT ROWID'
+
+
+def get_envelope_build_sql(source_table: str = "Element_Forces_Columns") -> str:
+    """
+    INSERT ... SELECT لبناء الغلاف بتمريرة واحدة
+
+    1. GROUP BY (Story, Column) لحساب القيم القصوى والدنيا
+    2. معرف الصف الحاكم لكل قيمة (بحث في فهرس Story, Column)
+    3. التركيبة والمحطة من الصف الحاكم (بحث بالمفتاح الأساسي)
+    """
+    aggregates = []
+    governing_ids = []
+    selects = []
+    joins = []
+    columns = ['"Story"', '"Column"', '"Unique_Name"', '"Row_Count"']
+
+    for force in ENVELOPE_FORCES:
+        for suffix, function in ENVELOPE_EXTREMES:
+            name = f"{force}_{suffix}"
+            alias = name.lower()
+            aggregates.append(f'{function}("{force}") AS "{name}"')
+            governing_ids.append(
+                f'(SELECT MIN(e."ID") FROM "{source_table}" AS e '
+                f'WHERE e."Story" = a."Story" AND e."Column" = a."Column" AND e."{force}" = a."{name}") '
+                f'AS "{name}_ID"'
+            )
+            selects.append(f'g."{name}", {alias}."Output_Case", {alias}."Station", g."{name}_ID"')
+            joins.append(f'LEFT JOIN "{source_table}" AS {alias} ON {alias}."ID" = g."{name}_ID"')
+            columns += [f'"{name}"', f'"{name}_Case"', f'"{name}_Station"', f'"{name}_ID"']
+
+    aggregates_sql = ",\n\t\t".join(aggregates)
+    governing_sql = ",\n\t\t".join(governing_ids)
+    selects_sql = ",\n\t".join(selects)
+    joins_sql = "\n".join(joins)
+    columns_sql = ", ".join(columns)
+
+    return f"""
+WITH a AS (
+	SELECT "Story", "Column", MIN("Unique_Name") AS "Unique_Name", COUNT(*) AS "Row_Count",
+		{aggregates_sql}
+	FROM "{source_table}"
+	WHERE "Story" IS NOT NULL AND "Column" IS NOT NULL
+	GROUP BY "Story", "Column"
+),
+g AS MATERIALIZED (
+	SELECT a.*,
+		{governing_sql}
+	FROM a
+)
+INSERT INTO "{ENVELOPE_TABLE}" ({columns_sql})
+SELECT g."Story", g."Column", g."Unique_Name", g."Row_Count",
+	{selects_sql}
+FROM g
+{joins_sql}
+"""
+
+
+# ============================================================
+# التحديث التزايدي - trigger على إدراج القوى
+# ============================================================
+# بعد البناء الكامل يحدّث trigger الغلاف لكل صف جديد (مقارنة واستبدال)،
+# فإضافة تركيبة جديدة تكلف بقدر صفوفها فقط.
+# الحذف أو تعديل القوى لا يُتتبع: يتطلب إعادة بناء كاملة.
+
+ENVELOPE_TRIGGER = "Column_Force_Envelopes_Incremental"
+
+
+def get_envelope_trigger_sql(source_table: str = "Element_Forces_Columns",
+                             encoded: dict = None) -> str:
+    """
+    CREATE TRIGGER لتحديث Column_Force_Envelopes عند كل إدراج
+
+    Args:
+        source_table: جدول القوى
+        encoded: تعريف ENCODED_TABLES إذا كان الجدول مرمزاً
+                 (يُربط الـ trigger بجدول التخزين وتُفك الرموز)
+
+    Returns:
+        نص SQL
+    """
+    def value(column):
+        if encoded and column in encoded["codes"]:
+            return f'(SELECT "Value" FROM "{encoded["codes"][column]}" WHERE "Code" = NEW."{column}_Code")'
+        return f'NEW."{column}"'
+
+    def present(column):
+        if encoded and column in encoded["codes"]:
+            return f'NEW."{column}_Code" IS NOT NULL'
+        return f'NEW."{column}" IS NOT NULL'
+
+    table = encoded["storage"] if encoded else source_table
+    assignments = [
+        '"Row_Count" = "Row_Count" + 1',
+        '"Unique_Name" = MIN(COALESCE("Unique_Name", NEW."Unique_Name"), '
+        'COALESCE(NEW."Unique_Name", "Unique_Name"))',
+    ]
+    for force in ENVELOPE_FORCES:
+        for suffix, function in ENVELOPE_EXTREMES:
+            name = f"{force}_{suffix}"
+            operator = ">" if function == "MAX" else "<"
+            condition = f'NEW."{force}" IS NOT NULL AND ("{name}" IS NULL OR NEW."{force}" {operator} "{name}")'
+            for target, source in ((name, f'NEW."{force}"'),
+                                   (f"{name}_Case", value("Output_Case")),
+                                   (f"{name}_Station", 'NEW."Station"'),
+                                   (f"{name}_ID", 'NEW."ID"')):
+                assignments.append(f'"{target}" = CASE WHEN {condition} THEN {source} ELSE "{target}" END')
+
+    assignments_sql = ",\n\t\t".join(assignments)
+    story, column = value("Story"), value("Column")
+
+    return f"""
+CREATE TRIGGER "{ENVELOPE_TRIGGER}" AFTER INSERT ON "{table}"
+WHEN {present("Story")} AND {present("Column")}
+BEGIN
+	INSERT OR IGNORE INTO "{ENVELOPE_TABLE}" ("Story", "Column", "Unique_Name", "Row_Count")
+	VALUES ({story}, {column}, NEW."Unique_Name", 0);
+	UPDATE "{ENVELOPE_TABLE}" SET
+		{assignments_sql}
+	WHERE "Story" = {story} AND "Column" = {column};
+END
+"""
+
+
+# ============================================================
+# Column_Facts - صف واحد عريض لكل عمود
+# ============================================================
+# يجمع الاتصال والمقطع والتسليح والمواد والطابق والنقاط (روابط main_link):
+#   Column_Object_Connectivity (Unique_Name, Story) → Frame_Assignments_Section_Properties (UniqueName, Story)
+#     (نفس مفتاح رابط ElementID - أول تخصيص بالمعرف إذا تكرر، فلا يعتمد على تنفيذ الربط)
+#   Frame_Assignments.Section_PropertyID        → Frame_Section_..._Concrete_Rectangular.ID
+#   Column_Reinforcing.NameID                   → Concrete_Rectangular.ID
+#   MaterialID / LonZgitudinal_Bar_MaterialID / Tie_Bar_MaterialID → جداول المواد
+#   UniquePtI / UniquePtJ                       → Objects_and_Elements_Joints.Element_Name
+#
+# المقاومات بنفس معادلات MaterialStrengthResolver:
+#   lower_bound = LowerBound إن وُجد وإلا Fc / Fy، expected = lower_bound × λ،
+#   effective = κ × (lower_bound / expected)
+#
+# منسوب الطابق = أعلى Global_Z لنقاط الطابق في Objects_and_Elements_Joints (منسوب حقيقي
+# لا يفترض ترتيب تصدير الطوابق أو برجاً واحداً). المساحة من عمود Area إن وُجد في جدول
+# المقاطع، وإلا Depth × Width (الجدول للمقاطع المستطيلة).
+
+COLUMN_FACTS_TABLE = "Column_Facts"
+
+COLUMN_FACTS_SOURCES = (
+    "Column_Object_Connectivity",
+    "Frame_Assignments_Section_Properties",
+    "Frame_Section_Property_Definitions_Concrete_Rectangular",
+    "Frame_Section_Property_Definitions_Concrete_Column_Reinforcing",
+    "Material_Properties_Concrete_Data",
+    "Material_Properties_Rebar_Data",
+    "Story_Definitions",
+    "Objects_and_Elements_Joints",
+)
+
+# (العمود، النوع، التعبير) - :kappa و :lambda_c و :lambda_s معاملات الاستعلام
+COLUMN_FACTS_COLUMNS = (
+    ("Unique_Name", "INTEGER PRIMARY KEY", 'c."Unique_Name"'),
+    ("Story", "TEXT", 'c."Story"'),
+    ("ColumnBay", "TEXT", 'c."ColumnBay"'),
+    ("Length", "REAL", 'c."Length"'),
+    ("ElementID", "INTEGER", 'c."ElementID"'),
+    # الطابق
+    ("Story_Height", "REAL", 'st."Height"'),
+    ("Story_Elevation", "REAL", 'st."Elevation"'),
+    # النقاط
+    ("UniquePtI", "INTEGER", 'c."UniquePtI"'),
+    ("Joint_I_X", "REAL", 'ji."Global_X"'),
+    ("Joint_I_Y", "REAL", 'ji."Global_Y"'),
+    ("Joint_I_Z", "REAL", 'ji."Global_Z"'),
+    ("UniquePtJ", "INTEGER", 'c."UniquePtJ"'),
+    ("Joint_J_X", "REAL", 'jj."Global_X"'),
+    ("Joint_J_Y", "REAL", 'jj."Global_Y"'),
+    ("Joint_J_Z", "REAL", 'jj."Global_Z"'),
+    # المقطع
+    ("Section_Property", "TEXT", 'fa."Section_Property"'),
+    ("Depth", "REAL", 'r."Depth"'),
+    ("Width", "REAL", 'r."Width"'),
+    ("Area", "REAL", '{area}'),
+    # التسليح
+    ("Reinforcement_Configuration", "TEXT", 'rf."Reinforcement_Configuration"'),
+    ("Clear_Cover_to_Ties", "REAL", 'rf."Clear_Cover_to_Ties"'),
+    ("Number_Bars_3_Dir", "INTEGER", 'rf."Number_Bars_3_Dir"'),
+    ("Number_Bars_2_Dir", "INTEGER", 'rf."Number_Bars_2_Dir"'),
+    ("Longitudinal_Bar_Size", "REAL", 'rf."Longitudinal_Bar_Size"'),
+    ("Corner_Bar_Size", "REAL", 'rf."Corner_Bar_Size"'),
+    ("Tie_Bar_Size", "REAL", 'rf."Tie_Bar_Size"'),
+    ("Tie_Bar_Spacing", "REAL", 'rf."Tie_Bar_Spacing"'),
+    ("Number_Ties_3_Dir", "INTEGER", 'rf."Number_Ties_3_Dir"'),
+    ("Number_Ties_2_Dir", "INTEGER", 'rf."Number_Ties_2_Dir"'),
+    # المواد
+    ("Concrete_Material", "TEXT", 'mc."Material"'),
+    ("Fc", "REAL", 'mc."Fc"'),
+    ("Fc_Lower_Bound", "REAL", '{fc_lb}'),
+    ("Fc_Expected", "REAL", '{fc_lb} * :lambda_c'),
+    ("Fc_Effective_Lower_Bound", "REAL", ':kappa * {fc_lb}'),
+    ("Fc_Effective_Expected", "REAL", ':kappa * {fc_lb} * :lambda_c'),
+    ("Longitudinal_Bar_Material", "TEXT", 'ml."Material"'),
+    ("Fy", "REAL", 'ml."Fy"'),
+    ("Fy_Lower_Bound", "REAL", '{fy_lb}'),
+    ("Fy_Expected", "REAL", '{fy_lb} * :lambda_s'),
+    ("Fy_Effective_Lower_Bound", "REAL", ':kappa * {fy_lb}'),
+    ("Fy_Effective_Expected", "REAL", ':kappa * {fy_lb} * :lambda_s'),
+    ("Tie_Bar_Material", "TEXT", 'mt."Material"'),
+    ("Fyt", "REAL", 'mt."Fy"'),
+    ("Fyt_Lower_Bound", "REAL", '{fyt_lb}'),
+    ("Fyt_Expected", "REAL", '{fyt_lb} * :lambda_s'),
+    ("Fyt_Effective_Lower_Bound", "REAL", ':kappa * {fyt_lb}'),
+    ("Fyt_Effective_Expected", "REAL", ':kappa * {fyt_lb} * :lambda_s'),
+    # المعاملات
+    ("Knowledge_Factor", "REAL", ':kappa'),
+    ("Lambda_c", "REAL", ':lambda_c'),
+    ("Lambda_s", "REAL", ':lambda_s'),
+)
+
+
+def get_column_facts_ddl() -> str:
+    """CREATE TABLE لجدول Column_Facts"""
+    columns_sql = ",\n\t".join(f'"{name}" {sql_type}' for name, sql_type, _ in COLUMN_FACTS_COLUMNS)
+    return f'CREATE TABLE "{COLUMN_FACTS_TABLE}" (\n\t{columns_sql}\n)'
+
+
+def get_column_facts_build_sql(concrete_lower_bound: bool = False, rebar_lower_bound: bool = False,
+                               stored_area: bool = False) -> str:
+    """
+    INSERT ... SELECT لبناء Column_Facts بتمريرة واحدة
+
+    Args:
+        concrete_lower_bound: جدول Material_Properties_Concrete_LowerBound موجود
+        rebar_lower_bound: جدول Material_Properties_Rebar_LowerBound موجود
+        stored_area: جدول المقاطع يحتوي عمود Area
+    """
+    lower_bounds = {
+        "area": 'r."Area"' if stored_area else 'r."Depth" * r."Width"',
+        "fc_lb": 'COALESCE(NULLIF(lbc."Fc_LB", 0), mc."Fc")' if concrete_lower_bound else 'mc."Fc"',
+        "fy_lb": 'COALESCE(NULLIF(lbl."Fy_LB", 0), ml."Fy")' if rebar_lower_bound else 'ml."Fy"',
+        "fyt_lb": 'COALESCE(NULLIF(lbt."Fy_LB", 0), mt."Fy")' if rebar_lower_bound else 'mt."Fy"',
+    }
+    joins = []
+    if concrete_lower_bound:
+        joins.append('LEFT JOIN "Material_Properties_Concrete_LowerBound" AS lbc ON lbc."ID" = mc."ID"')
+    if rebar_lower_bound:
+        joins.append('LEFT JOIN "Material_Properties_Rebar_LowerBound" AS lbl ON lbl."ID" = ml."ID"')
+        joins.append('LEFT JOIN "Material_Properties_Rebar_LowerBound" AS lbt ON lbt."ID" = mt."ID"')
+
+    columns_sql = ", ".join(f'"{name}"' for name, _, _ in COLUMN_FACTS_COLUMNS)
+    selects_sql = ",\n\t".join(expression.format(**lower_bounds) for _, _, expression in COLUMN_FACTS_COLUMNS)
+    lower_bound_joins = "\n".join(joins)
+
+    return f"""
+WITH levels AS (
+	SELECT "Story", MAX("Global_Z") AS "Elevation"
+	FROM "Objects_and_Elements_Joints"
+	GROUP BY "Story"
+),
+st AS (
+	SELECT s."Name", s."Height", levels."Elevation"
+	FROM "Story_Definitions" AS s
+	LEFT JOIN levels ON levels."Story" = s."Name"
+),
+joints AS (
+	SELECT "Element_Name", "Global_X", "Global_Y", "Global_Z"
+	FROM "Objects_and_Elements_Joints"
+	WHERE "ID" IN (SELECT MIN("ID") FROM "Objects_and_Elements_Joints" GROUP BY "Element_Name")
+)
+INSERT INTO "{COLUMN_FACTS_TABLE}" ({columns_sql})
+SELECT
+	{selects_sql}
+FROM "Column_Object_Connectivity" AS c
+LEFT JOIN "Frame_Assignments_Section_Properties" AS fa ON fa."ID" = (
+	SELECT MIN(a."ID") FROM "Frame_Assignments_Section_Properties" AS a
+	WHERE a."UniqueName" = c."Unique_Name" AND a."Story" = c."Story"
+)
+LEFT JOIN "Frame_Section_Property_Definitions_Concrete_Rectangular" AS r ON r."ID" = fa."Section_PropertyID"
+LEFT JOIN "Frame_Section_Property_Definitions_Concrete_Column_Reinforcing" AS rf ON rf."NameID" = r."ID"
+LEFT JOIN "Material_Properties_Concrete_Data" AS mc ON mc."ID" = r."MaterialID"
+LEFT JOIN "Material_Properties_Rebar_Data" AS ml ON ml."ID" = rf."LonZgitudinal_Bar_MaterialID"
+LEFT JOIN "Material_Properties_Rebar_Data" AS mt ON mt."ID" = rf."Tie_Bar_MaterialID"
+{lower_bound_joins}
+LEFT JOIN st ON st."Name" = c."Story"
+LEFT JOIN joints AS ji ON ji."Element_Name" = c."UniquePtI"
+LEFT JOIN joints AS jj ON jj."Element_Name" = c."UniquePtJ"
+WHERE c."Unique_Name" IS NOT NULL
+ORDER BY c."Unique_Name"
+"""
+
+
+# ============================================================
+# فئة بناء الجداول المشتقة
+# ============================================================
+
+class DerivedTablesBuilder:
+    """فئة متخصصة لبناء الجداول المشتقة بعد الإدراج والربط"""
+
+    def __init__(self, db_path: str, profile: str = None):
+        self.db_path = db_path
+        self.profile = profile  # ملف الاتصال (مثل "bulk_write")
+        self.conn = None
+        self.build_stats = {}
+        self.journal_mode = None  # journal_mode قبل ملف الاتصال (يُعاد عند الإغلاق)
+
+    def connect(self) -> bool:
+        """الاتصال بقاعدة البيانات"""
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            if self.profile:
+                self.journal_mode = get_journal_mode(self.conn)
+                apply_connection_profile(self.conn, self.profile)
+            logger.info(f"✅ اتصال قاعدة البيانات: {self.db_path}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ فشل الاتصال: {e}")
+            return False
+
+    def build_column_force_envelopes(self) -> int:
+        """
+        إعادة بناء Column_Force_Envelopes من Element_Forces_Columns
+
+        Returns:
+            عدد الصفوف (عمود × طابق)
+        """
+        self.conn.execute(f'DROP TABLE IF EXISTS "{ENVELOPE_TABLE}"')
+        self.conn.execute(get_envelope_ddl())
+        self.conn.execute(get_envelope_build_sql())
+        self.conn.commit()
+
+        count = self.conn.execute(f'SELECT COUNT(*) FROM "{ENVELOPE_TABLE}"').fetchone()[0]
+        self.build_stats[ENVELOPE_TABLE] = count
+        logger.info(f"   ✅ {ENVELOPE_TABLE}: {count} صف")
+        return count
+
+    def _table_exists(self, table_name: str) -> bool:
+        """التحقق من وجود جدول أو VIEW"""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table_name,)
+        ).fetchone()
+        return row is not None
+
+    def _column_exists(self, table_name: str, column_name: str) -> bool:
+        """التحقق من وجود عمود في جدول"""
+        columns = {row[1] for row in self.conn.execute(f'PRAGMA table_info("{table_name}")')}
+        return column_name in columns
+
+    def _strength_factors(self, input_id: int = 1) -> dict:
+        """معاملات κ و λc و λs (MaterialStrengthResolver) بأسماء معاملات الاستعلام"""
+        factors = MaterialStrengthResolver(self.conn, input_id).get_factors()
+        return {
+            "kappa": factors["knowledge_factor"],
+            "lambda_c": factors["lambda_c"],
+            "lambda_s": factors["lambda_s"],
+        }
+
+    def build_column_facts(self) -> int:
+        """
+        إعادة بناء Column_Facts (صف واحد لكل عمود)
+
+        Returns:
+            عدد الأعمدة، أو 0 إذا نقص أحد الجداول المصدر
+        """
+        missing = [table for table in COLUMN_FACTS_SOURCES if not self._table_exists(table)]
+        if missing:
+            logger.warning(f"   ⚠️ {COLUMN_FACTS_TABLE}: جداول غير موجودة {missing}")
+            return 0
+
+        self.conn.execute(f'DROP TABLE IF EXISTS "{COLUMN_FACTS_TABLE}"')
+        self.conn.execute(get_column_facts_ddl())
+        self.conn.execute(
+            get_column_facts_build_sql(
+                concrete_lower_bound=self._table_exists("Material_Properties_Concrete_LowerBound"),
+                rebar_lower_bound=self._table_exists("Material_Properties_Rebar_LowerBound"),
+                stored_area=self._column_exists("Frame_Section_Property_Definitions_Concrete_Rectangular", "Area"),
+            ),
+            self._strength_factors()
+        )
+        self.conn.commit()
+
+        count = self.conn.execute(f'SELECT COUNT(*) FROM "{COLUMN_FACTS_TABLE}"').fetchone()[0]
+        self.build_stats[COLUMN_FACTS_TABLE] = count
+        logger.info(f"   ✅ {COLUMN_FACTS_TABLE}: {count} عمود")
+        return count
+
+    def _source_encoding(self, source_table: str):
+        """تعريف ENCODED_TABLES إذا كان جدول القوى VIEW مرمزاً، وإلا None"""
+        encoded = ENCODED_TABLES.get(source_table)
+        if encoded is None:
+            return None
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?", (source_table,)
+        ).fetchone()
+        return encoded if row else None
+
+    def install_envelope_triggers(self, source_table: str = "Element_Forces_Columns"):
+        """
+        تثبيت trigger التحديث التزايدي لـ Column_Force_Envelopes
+
+        يُبنى الغلاف كاملاً أولاً إذا لم يكن موجوداً.
+        """
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (ENVELOPE_TABLE,)
+        ).fetchone()
+        if row is None:
+            self.build_column_force_envelopes()
+
+        self.conn.execute(f'DROP TRIGGER IF EXISTS "{ENVELOPE_TRIGGER}"')
+        self.conn.execute(get_envelope_trigger_sql(source_table, self._source_encoding(source_table)))
+        self.conn.commit()
+        logger.info(f"   ✅ {ENVELOPE_TRIGGER}: تحديث تزايدي عند الإدراج")
+
+    def remove_envelope_triggers(self):
+        """إزالة trigger التحديث التزايدي (الغلاف يبقى كما هو)"""
+        self.conn.execute(f'DROP TRIGGER IF EXISTS "{ENVELOPE_TRIGGER}"')
+        self.conn.commit()
+
+    def build_all(self, incremental: bool = False) -> bool:
+        """
+        بناء جميع الجداول المشتقة
+
+        Args:
+            incremental: تثبيت triggers تحدّث الغلاف عند إدراج قوى جديدة
+        """
+        try:
+            if not self.connect():
+                return False
+
+            logger.info("\n" + "="*70)
+            logger.info("📐 بناء الجداول المشتقة...")
+            logger.info("="*70)
+
+            self.build_column_force_envelopes()
+            if incremental:
+                self.install_envelope_triggers()
+            self.build_column_facts()
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ خطأ في بناء الجداول المشتقة: {e}")
+            return False
+
+        finally:
+            self.close()
+
+    def close(self):
+        """إغلاق الاتصال"""
+        try:
+            if self.conn:
+                restore_journal_mode(self.conn, self.journal_mode)
+                self.conn.close()
+        except Exception as e:
+            logger.error(f"❌ خطأ في الإغلاق: {e}")
+
+
+# ============================================================
+# دالة عامة للبناء
+# ============================================================
+
+def build_derived_tables(db_path: str, profile: str = None, incremental: bool = False) -> bool:
+    """
+    دالة سريعة لبناء الجداول المشتقة
+
+    Args:
+        db_path: مسار قاعدة البيانات
+        profile: ملف الاتصال (مثل "bulk_write")
+        incremental: تثبيت triggers التحديث التزايدي للغلاف
+
+    Returns:
+        bool: True إذا نجح، False إذا فشل
+    """
+    builder = DerivedTablesBuilder(db_path, profile=profile)
+    return builder.build_all(incremental=incremental)
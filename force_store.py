@@ -0,0 +1,382 @@
+# database/force_store.py - مخزن عمودي (NumPy) لجداول القوى
+# المهمة الوحيدة: تصدير جداول القوى إلى ملفات .npy وقراءتها كمصفوفات بدون نسخ
+#
+# لكل جدول مجلد يحتوي:
+#   <field>.npy        مصفوفة لكل حقل (النصوص كرموز int32، القاموس في manifest.json)
+#   element_keys.npy   مفتاح كل عنصر (رمز الطابق × عدد العناصر + رمز العنصر) مرتباً
+#   offsets.npy        بداية صفوف كل عنصر (الصفوف مرتبة: طابق، عنصر، تركيبة، محطة)
+#   story_offsets.npy  بداية صفوف كل طابق
+#   case_order.npy     ترتيب الصفوف حسب التركيبة + case_offsets.npy
+#
+# numpy اختياري: مطلوب فقط لهذه المرحلة (pip install numpy)
+
+import json
+import sqlite3
+import logging
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, Dict, List
+
+from database.schema_catalog import get_file_state
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# الجداول المصدّرة
+# ============================================================
+# element: عمود اسم العنصر (مع Story يحدد العنصر)
+# labels: حقول نصية تُخزن كرموز
+# integers / floats: حقول رقمية (NULL = -1 للصحيحة و NaN للعشرية)
+
+FORCE_STORE_TABLES = {
+    "Element_Forces_Columns": {
+        "element": "Column",
+        "labels": ("Story", "Column", "Output_Case", "Case_Type"),
+        "integers": ("ID", "Unique_Name"),
+        "floats": ("Station", "P", "V2", "V3", "T", "M2", "M3"),
+    },
+    "Element_Forces_Beams": {
+        "element": "Beam",
+        "labels": ("Story", "Beam", "Output_Case", "Case_Type", "Location"),
+        "integers": ("ID", "Unique_Name"),
+        "floats": ("Station", "P", "V2", "V3", "T", "M2", "M3"),
+    },
+    "Pier_Forces": {
+        "element": "Pier",
+        "labels": ("Story", "Pier", "Output_Case", "Case_Type", "Location"),
+        "integers": ("ID",),
+        "floats": ("P", "V2", "V3", "T", "M2", "M3"),
+    },
+}
+
+MANIFEST_NAME = "manifest.json"
+EXPORT_CHUNK_SIZE = 50000
+
+
+def _require_numpy():
+    """التحقق من توفر numpy"""
+    if np is None:
+        raise ImportError("المخزن العمودي يتطلب numpy (pip install numpy)")
+
+
+# ============================================================
+# التصدير
+# ============================================================
+
+class ForceStoreExporter:
+    """تصدير جداول القوى من SQLite إلى مخزن عمودي"""
+
+    def __init__(self, db_path: str, store_dir: str, chunk_size: int = EXPORT_CHUNK_SIZE):
+        _require_numpy()
+        self.db_path = str(db_path)
+        self.store_dir = Path(store_dir)
+        self.chunk_size = chunk_size
+        self.conn = None
+        self.export_stats = {}
+        self._manifests = {}  # {الجدول: (المجلد، البيان)} - تُختم بحالة القاعدة بعد الإغلاق
+
+    def _table_exists(self, table_name: str) -> bool:
+        """التحقق من وجود جدول أو VIEW"""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?",
+            (table_name,)
+        ).fetchone()
+        return row is not None
+
+    def _read_table(self, table_name: str, spec: dict) -> tuple:
+        """
+        قراءة الجدول على دفعات إلى مصفوفات
+
+        Returns:
+            (المصفوفات {field: array}, القواميس {label: [values]})
+        """
+        rows_total = self.conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+        labels, integers, floats = spec["labels"], spec["integers"], spec["floats"]
+        fields = labels + integers + floats
+
+        arrays = {field: np.empty(rows_total, dtype=np.int32) for field in labels}
+        arrays.update({field: np.empty(rows_total, dtype=np.int64) for field in integers})
+        arrays.update({field: np.empty(rows_total, dtype=np.float64) for field in floats})
+        lookups = {field: {} for field in labels}
+
+        cursor = self.conn.execute(
+            f'SELECT {", ".join(f"{chr(34)}{field}{chr(34)}" for field in fields)} FROM "{table_name}"'
+        )
+        start = 0
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            end = start + len(rows)
+            for field, values in zip(fields, zip(*rows)):
+                if field in lookups:
+                    lookup = lookups[field]
+                    arrays[field][start:end] = [
+                        -1 if value is None else lookup.setdefault(value, len(lookup))
+                        for value in values
+                    ]
+                elif field in integers:
+                    arrays[field][start:end] = [-1 if value is None else value for value in values]
+                else:
+                    arrays[field][start:end] = np.array(values, dtype=np.float64)
+            start = end
+        cursor.close()
+
+        # رموز مرتبة أبجدياً (ترتيب الطوابق والتركيبات ثابت بين التصديرات)
+        dictionaries = {}
+        for field, lookup in lookups.items():
+            values = sorted(lookup, key=str)
+            remap = np.empty(len(lookup) + 1, dtype=np.int32)
+            remap[-1] = -1
+            for new_code, value in enumerate(values):
+                remap[lookup[value]] = new_code
+            arrays[field] = remap[arrays[field]]
+            dictionaries[field] = values
+
+        return arrays, dictionaries
+
+    def export_table(self, table_name: str) -> int:
+        """
+        تصدير جدول واحد
+
+        Returns:
+            عدد الصفوف المصدّرة
+        """
+        spec = FORCE_STORE_TABLES[table_name]
+        arrays, dictionaries = self._read_table(table_name, spec)
+        element = spec["element"]
+        rows_total = len(arrays["Story"])
+
+        # الترتيب: طابق، عنصر، تركيبة، محطة (np.lexsort: المفتاح الأخير هو الأساسي)
+        sort_keys = [arrays["Output_Case"], arrays[element], arrays["Story"]]
+        if "Station" in arrays:
+            sort_keys.insert(0, arrays["Station"])
+        order = np.lexsort(sort_keys)
+        arrays = {field: array[order] for field, array in arrays.items()}
+
+        element_count = len(dictionaries[element]) + 1
+        keys = arrays["Story"].astype(np.int64) * element_count + arrays[element]
+        element_keys, starts = np.unique(keys, return_index=True)
+        offsets = np.append(starts, rows_total).astype(np.int64)
+
+        story_offsets = np.searchsorted(arrays["Story"], np.arange(len(dictionaries["Story"]) + 1))
+        case_order = np.argsort(arrays["Output_Case"], kind="stable")
+        case_offsets = np.searchsorted(arrays["Output_Case"][case_order],
+                                       np.arange(len(dictionaries["Output_Case"]) + 1))
+
+        table_dir = self.store_dir / table_name
+        table_dir.mkdir(parents=True, exist_ok=True)
+        for field, array in arrays.items():
+            np.save(table_dir / f"{field}.npy", array)
+        np.save(table_dir / "element_keys.npy", element_keys)
+        np.save(table_dir / "offsets.npy", offsets)
+        np.save(table_dir / "story_offsets.npy", story_offsets.astype(np.int64))
+        np.save(table_dir / "case_order.npy", case_order.astype(np.int64))
+        np.save(table_dir / "case_offsets.npy", case_offsets.astype(np.int64))
+
+        manifest = {
+            "table": table_name,
+            "rows": rows_total,
+            "element": element,
+            "element_count": element_count,
+            "fields": {field: str(array.dtype) for field, array in arrays.items()},
+            "dictionaries": dictionaries,
+            "source": self.db_path,
+            "source_state": None,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        _write_manifest(table_dir, manifest)
+        self._manifests[table_name] = (table_dir, manifest)
+
+        self.export_stats[table_name] = rows_total
+        logger.info(f"   ✅ {table_name}: {rows_total} صف، {len(element_keys)} عنصر")
+        return rows_total
+
+    def export_all(self, tables: List[str] = None) -> bool:
+        """تصدير جميع جداول القوى الموجودة في القاعدة"""
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            logger.info(f"📦 تصدير المخزن العمودي إلى: {self.store_dir}")
+
+            for table_name in tables or FORCE_STORE_TABLES:
+                if not self._table_exists(table_name):
+                    logger.warning(f"   ⚠️ {table_name} غير موجود")
+                    continue
+                self.export_table(table_name)
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ خطأ في تصدير المخزن العمودي: {e}")
+            return False
+
+        finally:
+            if self.conn:
+                self.conn.close()
+            self._stamp_source_state()
+
+    def _stamp_source_state(self):
+        """
+        تسجيل حالة القاعدة (mtime، الحجم للملف وملف WAL) في بيانات الجداول المصدّرة
+
+        بعد إغلاق الاتصال: الإغلاق قد ينقل WAL إلى الملف ويحذفه فتتغير الحالة دون تعديل.
+        """
+        state = get_file_state(self.db_path)
+        for table_dir, manifest in self._manifests.values():
+            manifest["source_state"] = state
+            _write_manifest(table_dir, manifest)
+
+
+def _write_manifest(table_dir: Path, manifest: dict):
+    """كتابة ملف بيانات الجدول"""
+    with open(table_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def export_force_store(db_path: str, store_dir: str, tables: List[str] = None) -> bool:
+    """
+    دالة سريعة لتصدير جداول القوى إلى مخزن عمودي
+
+    Args:
+        db_path: مسار قاعدة البيانات
+        store_dir: مجلد المخزن
+        tables: الجداول المصدّرة (الافتراضي FORCE_STORE_TABLES)
+
+    Returns:
+        bool: True إذا نجح، False إذا فشل
+    """
+    exporter = ForceStoreExporter(db_path, store_dir)
+    return exporter.export_all(tables)
+
+
+# ============================================================
+# القراءة
+# ============================================================
+
+class ForceStore:
+    """
+    قراءة جدول قوى من المخزن العمودي كمصفوفات NumPy (memory-mapped)
+
+    element() و story() تعيد شرائح من الملفات بدون نسخ.
+    load_case() تجمع صفوف التركيبة (غير متجاورة) في مصفوفات جديدة.
+
+    مثال:
+        store = ForceStore(store_dir, "Element_Forces_Columns")
+        forces = store.element("Story2", "C1")
+        max_m3 = np.nanmax(np.abs(forces["M3"]))
+    """
+
+    def __init__(self, store_dir: str, table_name: str = "Element_Forces_Columns"):
+        _require_numpy()
+        self.table_dir = Path(store_dir) / table_name
+        with open(self.table_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.table_name = table_name
+        self.element_field = self.manifest["element"]
+        self._arrays = {}
+        self._codes = {
+            field: {value: code for code, value in enumerate(values)}
+            for field, values in self.manifest["dictionaries"].items()
+        }
+
+    def _load(self, name: str):
+        """فتح ملف .npy كـ memmap (مرة واحدة)"""
+        array = self._arrays.get(name)
+        if array is None:
+            array = np.load(self.table_dir / f"{name}.npy", mmap_mode="r")
+            self._arrays[name] = array
+        return array
+
+    @property
+    def fields(self) -> List[str]:
+        """أسماء الحقول"""
+        return list(self.manifest["fields"])
+
+    def __len__(self) -> int:
+        return self.manifest["rows"]
+
+    def __getitem__(self, field: str):
+        """الحقل كاملاً (memmap)"""
+        return self._load(field)
+
+    def is_stale(self, db_path: str = None) -> bool:
+        """
+        التحقق من أن القاعدة عُدّلت بعد التصدير
+
+        تُقارن (mtime، الحجم) للملف وملف -wal: في وضع WAL تذهب الكتابة إلى -wal
+        ولا يتغير الملف الرئيسي حتى نقطة الحفظ (checkpoint).
+        """
+        db_path = str(db_path or self.manifest["source"])
+        if "source_state" not in self.manifest:
+            # مخزن قديم (mtime الملف الرئيسي فقط)
+            return Path(db_path).stat().st_mtime > self.manifest["source_mtime"]
+        return get_file_state(db_path) != self.manifest["source_state"]
+
+    # ════════════════════════════════════════════════════════════════
+    # الرموز
+    # ════════════════════════════════════════════════════════════════
+
+    def code_of(self, field: str, value) -> Optional[int]:
+        """رمز قيمة نصية (None إذا لم توجد)"""
+        return self._codes[field].get(value)
+
+    def decode(self, field: str, codes) -> list:
+        """تحويل رموز حقل نصي إلى القيم الأصلية"""
+        values = self.manifest["dictionaries"][field]
+        return [values[code] if code >= 0 else None for code in codes]
+
+    # ════════════════════════════════════════════════════════════════
+    # الشرائح
+    # ════════════════════════════════════════════════════════════════
+
+    def _slice(self, start: int, end: int) -> Dict[str, "np.ndarray"]:
+        return {field: self._load(field)[start:end] for field in self.fields}
+
+    def element(self, story: str, name: str) -> Optional[Dict[str, "np.ndarray"]]:
+        """
+        صفوف عنصر واحد (عمود / كمرة / حائط) في طابق - بدون نسخ
+
+        Returns:
+            {field: array} مرتبة حسب التركيبة ثم المحطة، أو None
+        """
+        story_code = self.code_of("Story", story)
+        element_code = self.code_of(self.element_field, name)
+        if story_code is None or element_code is None:
+            return None
+
+        key = story_code * self.manifest["element_count"] + element_code
+        element_keys = self._load("element_keys")
+        index = int(np.searchsorted(element_keys, key))
+        if index >= len(element_keys) or element_keys[index] != key:
+            return None
+
+        offsets = self._load("offsets")
+        return self._slice(int(offsets[index]), int(offsets[index + 1]))
+
+    def story(self, story: str) -> Optional[Dict[str, "np.ndarray"]]:
+        """صفوف طابق كامل - بدون نسخ"""
+        code = self.code_of("Story", story)
+        if code is None:
+            return None
+        offsets = self._load("story_offsets")
+        return self._slice(int(offsets[code]), int(offsets[code + 1]))
+
+    def load_case_rows(self, output_case: str):
+        """أرقام صفوف تركيبة (شريحة من case_order بدون نسخ)"""
+        code = self.code_of("Output_Case", output_case)
+        if code is None:
+            return None
+        offsets = self._load("case_offsets")
+        return self._load("case_order")[int(offsets[code]):int(offsets[code + 1])]
+
+    def load_case(self, output_case: str) -> Optional[Dict[str, "np.ndarray"]]:
+        """صفوف تركيبة (مصفوفات جديدة - الصفوف غير متجاورة في الملفات)"""
+        rows = self.load_case_rows(output_case)
+        if rows is None:
+            return None
+        return {field: self._load(field)[rows] for field in self.fields}
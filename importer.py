@@ -1,12 +1,19 @@
 # database/importer.py - إدراج البيانات من VEDA إلى القاعدة الجديدة
 # المهمة الوحيدة: نسخ البيانات بدون أي ربط أو Foreign Keys
 
+import time
 import sqlite3
 import logging
 from pathlib import Path
 from datetime import datetime
-from config.input_settings import COLUMN_MAPPING, COLUMNS_TO_IGNORE, TABLES_TO_IMPORT
+from config.input_settings import COLUMN_MAPPING, COLUMNS_TO_IGNORE, TABLES_TO_IMPORT, DELTA_KEYS
 from config.settings import VEDA_DATABASE_PATH, NEW_DATABASE_PATH
+from config.connection_settings import apply_connection_profile, get_journal_mode, restore_journal_mode
+from database.schema import ENCODED_TABLES, get_storage_columns
+from database.schema_catalog import get_schema_catalog
+from database.batch_insert import insert_rows, fetch_chunks
+from database.parallel_import import ImportTask, get_import_order, run_parallel_import
+from database.delta_import import DeltaTable, get_source_query, reset_child_links
 
 
 # ============================================================
@@ -48,6 +55,157 @@ def setup_logger(log_file: str = None):
 logger = setup_logger()
 
 
+# ============================================================
+# تحويل القيم إلى النوع المعلن
+# ============================================================
+
+def declared_affinity(declared_type: str):
+    """
+    نوع العمود حسب قواعد SQLite (INTEGER / REAL / TEXT)
+    
+    Returns:
+        النوع، أو None للأعمدة بدون نوع محدد (لا يتم التحويل)
+    """
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return "INTEGER"
+    if any(name in declared_type for name in ("CHAR", "CLOB", "TEXT")):
+        return "TEXT"
+    if any(name in declared_type for name in ("REAL", "FLOA", "DOUB")):
+        return "REAL"
+    return None
+
+
+def coerce_value(value, affinity: str):
+    """
+    تحويل قيمة من VEDA إلى نوع العمود (VEDA تخلط النصوص والأرقام)
+    
+    - النص الفارغ في عمود رقمي → None
+    - "12.0" في عمود INTEGER → 12
+    
+    Raises:
+        ValueError: إذا لم يمكن التحويل بدون فقدان (مثل "abc" أو 1.5 في INTEGER)
+    """
+    if value is None or affinity is None or isinstance(value, bytes):
+        return value
+    
+    if affinity == "TEXT":
+        return value if isinstance(value, str) else str(value)
+    
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            value = float(value)
+    
+    if affinity == "REAL":
+        return float(value)
+    
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{value} ليست قيمة صحيحة")
+        return int(value)
+    return int(value)
+
+
+def coerce_row(row, affinities: list):
+    """
+    تحويل صف كامل إلى أنواع الأعمدة
+    
+    Returns:
+        (الصف المحول, عدد القيم التي تعذر تحويلها وأصبحت None)
+    """
+    values = []
+    failures = 0
+    for value, affinity in zip(row, affinities):
+        try:
+            values.append(coerce_value(value, affinity))
+        except (TypeError, ValueError):
+            values.append(None)
+            failures += 1
+    return tuple(values), failures
+
+
+# ============================================================
+# قراءة جدول من VEDA
+# ============================================================
+
+def iter_table_rows(cursor: sqlite3.Cursor, table_name: str, columns_to_copy: list, affinities: list,
+                    fetch_size: int = None):
+    """
+    قراءة أعمدة جدول من VEDA وتحويلها إلى أنواع أعمدة القاعدة الجديدة على دفعات
+    
+    Args:
+        fetch_size: عدد الصفوف في كل دفعة (None = الجدول كاملاً في دفعة واحدة)
+    
+    Yields:
+        (الصفوف المحولة, عدد القيم التي تعذر تحويلها) لكل دفعة
+    """
+    veda_cols_str = ", ".join([f'"{col}"' for col, _ in columns_to_copy])
+    cursor.execute(f'SELECT {veda_cols_str} FROM "{table_name}"')
+    
+    for rows in fetch_chunks(cursor, fetch_size):
+        coerce_failures = 0
+        coerced_rows = []
+        for row in rows:
+            row, failures = coerce_row(row, affinities)
+            coerce_failures += failures
+            coerced_rows.append(row)
+        yield coerced_rows, coerce_failures
+
+
+def read_table_rows(cursor: sqlite3.Cursor, table_name: str, columns_to_copy: list, affinities: list):
+    """
+    قراءة أعمدة جدول من VEDA كاملاً وتحويلها إلى أنواع أعمدة القاعدة الجديدة
+    
+    Returns:
+        (الصفوف المحولة, عدد القيم التي تعذر تحويلها)
+    """
+    for chunk in iter_table_rows(cursor, table_name, columns_to_copy, affinities):
+        return chunk
+    return [], 0
+
+
+def read_table(veda_path: str, table_name: str, columns_to_copy: list, affinities: list):
+    """
+    مثل read_table_rows باتصال مستقل للقراءة فقط (لعمال الإدراج المتوازي)
+    """
+    conn = sqlite3.connect(f"file:{veda_path}?mode=ro", uri=True)
+    try:
+        return read_table_rows(conn.cursor(), table_name, columns_to_copy, affinities)
+    finally:
+        conn.close()
+
+
+def stream_table(veda_path: str, table_name: str, columns_to_copy: list, affinities: list,
+                 fetch_size: int):
+    """
+    مثل iter_table_rows باتصال مستقل للقراءة فقط (لعمال الإدراج المتوازي بوضع الدفعات)
+    """
+    conn = sqlite3.connect(f"file:{veda_path}?mode=ro", uri=True)
+    try:
+        yield from iter_table_rows(conn.cursor(), table_name, columns_to_copy, affinities, fetch_size)
+    finally:
+        conn.close()
+
+
+# ============================================================
+# أوضاع الإدراج
+# ============================================================
+# python: قراءة الصفوف وتحويلها في Python ثم executemany
+# attach: ATTACH لملف VEDA و INSERT ... SELECT لكل جدول (بدون مرور الصفوف في Python)؛
+#         الجدول الذي يحتوي قيماً تحتاج coerce_value يُدرج بوضع python
+# delta: مقارنة بصمات الصفوف بالإدراج السابق وتطبيق الإضافات والتعديلات والحذف فقط
+#        (انظر delta_import و DELTA_KEYS - VEDA تُقرأ كاملة للمقارنة، أما الكتابة وإعادة الربط
+#        فتتبع حجم التغيير)
+
+IMPORT_MODES = ("python", "attach", "delta")
+ATTACH_ALIAS = "veda"
+
+
 # ============================================================
 # فئة الإدراج
 # ============================================================
@@ -55,14 +213,26 @@ logger = setup_logger()
 class DatabaseImporter:
     """فئة متخصصة لإدراج البيانات من VEDA إلى القاعدة الجديدة"""
     
-    def __init__(self, veda_path: str, new_path: str):
+    def __init__(self, veda_path: str, new_path: str, profile: str = None, mode: str = "python",
+                 workers: int = 1, executor: str = "thread", fetch_size: int = None):
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"وضع إدراج غير معروف: {mode} (المتاح: {', '.join(IMPORT_MODES)})")
         self.veda_path = veda_path
         self.new_path = new_path
+        self.profile = profile  # ملف اتصال القاعدة الجديدة (مثل "bulk_write")
+        self.mode = mode        # "python" أو "attach" (INSERT ... SELECT داخل SQLite) أو "delta" (الفرق فقط)
+        self.workers = workers  # أكثر من 1: قراءة وتحويل الجداول بالتوازي (انظر import_parallel)
+        self.executor = executor
+        self.fetch_size = fetch_size  # قراءة وكتابة الجدول على دفعات fetchmany (None = الجدول كاملاً)
         self.veda_conn = None
         self.veda_cursor = None
         self.new_conn = None
         self.new_cursor = None
+        self.veda_catalog = None
+        self.new_catalog = None
         self.import_stats = {}
+        self.failed_tables = []  # جداول فشل إدراجها (import_all يعيد False)
+        self.journal_mode = None  # journal_mode قبل ملف الاتصال (يُعاد عند الإغلاق)
     
     def connect_databases(self) -> bool:
         """الاتصال بقاعدتي البيانات"""
@@ -75,11 +245,23 @@ class DatabaseImporter:
             # الاتصال بـ القاعدة الجديدة
             self.new_conn = sqlite3.connect(self.new_path)
             self.new_cursor = self.new_conn.cursor()
+            if self.profile:
+                self.journal_mode = get_journal_mode(self.new_conn)
+                apply_connection_profile(self.new_conn, self.profile)
+                logger.info(f"⚙️ ملف الاتصال: {self.profile}")
             
             # تعطيل المفاتيح الخارجية مؤقتاً
             self.new_cursor.execute("PRAGMA foreign_keys = OFF")
             self.new_conn.commit()
             
+            # هيكل القاعدتين (مرة واحدة - مشترك مع باقي المستوردين)
+            self.veda_catalog = get_schema_catalog(self.veda_path, self.veda_conn)
+            self.new_catalog = get_schema_catalog(self.new_path, self.new_conn)
+            
+            if self.mode == "attach":
+                self.new_cursor.execute(f"ATTACH DATABASE ? AS {ATTACH_ALIAS}", (self.veda_path,))
+                logger.info(f"🔗 وضع attach: VEDA مرفقة باسم {ATTACH_ALIAS}")
+            
             logger.info(f"✅ اتصال القاعدة الجديدة: {self.new_path}")
             return True
         
@@ -90,80 +272,499 @@ class DatabaseImporter:
     def get_veda_columns(self, table_name: str) -> list:
         """الحصول على أسماء الأعمدة الفعلية من VEDA"""
         try:
-            self.veda_cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row[1] for row in self.veda_cursor.fetchall()]
-            return columns
+            return self.veda_catalog.columns(table_name)
         except Exception as e:
             logger.error(f"❌ خطأ في قراءة أعمدة {table_name}: {e}")
             return []
     
+    def get_new_column_types(self, table_name: str) -> dict:
+        """أنواع أعمدة الجدول في القاعدة الجديدة {العمود: INTEGER / REAL / TEXT / None}"""
+        return {name: declared_affinity(declared_type)
+                for name, declared_type in self.new_catalog.column_types(table_name).items()}
+    
+    def get_encoding(self, table_name: str):
+        """
+        ترميز الجدول في القاعدة الجديدة
+        
+        Returns:
+            تعريف ENCODED_TABLES إذا كان الجدول VIEW مرمزاً، وإلا None
+        """
+        encoded = ENCODED_TABLES.get(table_name)
+        if encoded is None:
+            return None
+        return encoded if self.new_catalog.is_view(table_name) else None
+    
+    def get_storage_of(self, table_name: str, columns: list):
+        """
+        الجدول الذي تُكتب فيه أعمدة الجدول فعلياً
+        
+        Returns:
+            (جدول التخزين، أعمدته) للجدول المرمز، وإلا (الجدول نفسه، الأعمدة)
+        """
+        if self.get_encoding(table_name):
+            return get_storage_columns(table_name, columns)
+        return table_name, list(columns)
+    
+    def _encode_rows(self, encoded: dict, columns: list, rows: list) -> list:
+        """
+        تعبئة جداول القاموس بالقيم الجديدة واستبدال النصوص برموزها
+        
+        (أسرع من الإدراج صفاً صفاً عبر INSTEAD OF trigger على الـ VIEW)
+        """
+        lookups = {}
+        for col, code_table in encoded["codes"].items():
+            if col not in columns:
+                continue
+            index = columns.index(col)
+            values = sorted({row[index] for row in rows if row[index] is not None})
+            self.new_cursor.executemany(
+                f'INSERT OR IGNORE INTO "{code_table}" ("Value") VALUES (?)',
+                [(value,) for value in values]
+            )
+            self.new_cursor.execute(f'SELECT "Value", "Code" FROM "{code_table}"')
+            lookups[index] = dict(self.new_cursor.fetchall())
+        
+        encoded_rows = []
+        for row in rows:
+            row = list(row)
+            for index, lookup in lookups.items():
+                if row[index] is not None:
+                    row[index] = lookup[row[index]]
+            encoded_rows.append(tuple(row))
+        return encoded_rows
+    
+    def _count_unconvertible(self, table_name: str, columns_to_copy: list, affinities: list) -> int:
+        """
+        عدد القيم في VEDA التي لا يحولها SQLite كما تحولها coerce_value
+
+        (نص في عمود رقمي، أو كسر عشري في عمود INTEGER، أو رقم عشري في عمود TEXT:
+        CAST(real AS TEXT) يقرب إلى 15 رقماً ويكتب 1.0e+20 حيث يكتب str() في Python 1e+20)
+        """
+        conditions = []
+        for (veda_col, _), affinity in zip(columns_to_copy, affinities):
+            value = f'v."{veda_col}"'
+            if affinity == "TEXT":
+                conditions.append(f"typeof({value}) = 'real'")
+            elif affinity == "REAL":
+                conditions.append(f"typeof({value}) = 'text'")
+            elif affinity == "INTEGER":
+                conditions.append(
+                    f"typeof({value}) = 'text' OR "
+                    f"(typeof({value}) = 'real' AND {value} <> CAST({value} AS INTEGER))"
+                )
+        if not conditions:
+            return 0
+        
+        count_sql = " + ".join(f"SUM({condition})" for condition in conditions)
+        self.new_cursor.execute(f'SELECT {count_sql} FROM {ATTACH_ALIAS}."{table_name}" AS v')
+        return self.new_cursor.fetchone()[0] or 0
+    
+    @staticmethod
+    def _sql_value(veda_col: str, affinity: str) -> str:
+        """
+        تعبير SQL لقيمة عمود VEDA (الأعداد الصحيحة في عمود TEXT تُحول لنص مثل coerce_value)
+        
+        (الأرقام العشرية في عمود TEXT تُحول في Python - انظر _count_unconvertible)
+        """
+        value = f'v."{veda_col}"'
+        if affinity == "TEXT":
+            return f"CASE WHEN typeof({value}) = 'integer' THEN CAST({value} AS TEXT) ELSE {value} END"
+        return value
+    
+    def copy_table_sql(self, table_name: str, columns_to_copy: list, checked: bool = False) -> bool:
+        """
+        نسخ جدول بجملة INSERT ... SELECT واحدة من VEDA المرفقة (ATTACH)
+        
+        Args:
+            checked: True إذا تم التحقق مسبقاً من عدم وجود قيم تحتاج تحويل
+        
+        Returns:
+            True إذا تم النسخ، False إذا احتاج الجدول وضع python (قيم تحتاج تحويل أو خطأ)
+        """
+        new_cols = [new_col for _, new_col in columns_to_copy]
+        column_types = self.get_new_column_types(table_name)
+        affinities = [column_types.get(col) for col in new_cols]
+        
+        unconvertible = 0 if checked else self._count_unconvertible(table_name, columns_to_copy, affinities)
+        if unconvertible:
+            logger.info(f"   ↪️ {unconvertible} قيمة تحتاج تحويل - إدراج عبر Python")
+            return False
+        
+        values = [self._sql_value(veda_col, affinity)
+                  for (veda_col, _), affinity in zip(columns_to_copy, affinities)]
+        target_table, target_cols = table_name, new_cols
+        joins = []
+        
+        self.new_conn.execute("SAVEPOINT attach_copy")
+        try:
+            # الجدول المرمز: تعبئة القاموس ثم ربط الرموز بـ JOIN
+            encoded = self.get_encoding(table_name)
+            if encoded:
+                target_table, target_cols = get_storage_columns(table_name, new_cols)
+                for index, col in enumerate(new_cols):
+                    code_table = encoded["codes"].get(col)
+                    if code_table is None:
+                        continue
+                    self.new_conn.execute(
+                        f'INSERT OR IGNORE INTO "{code_table}" ("Value") '
+                        f'SELECT DISTINCT {values[index]} FROM {ATTACH_ALIAS}."{table_name}" AS v '
+                        f'WHERE {values[index]} IS NOT NULL'
+                    )
+                    joins.append(f'LEFT JOIN "{code_table}" AS c{index} ON c{index}."Value" = {values[index]}')
+                    values[index] = f'c{index}."Code"'
+            
+            target_cols_str = ", ".join([f'"{col}"' for col in target_cols])
+            values_str = ", ".join(values)
+            joins_str = " ".join(joins)
+            start = time.perf_counter()
+            cursor = self.new_conn.execute(
+                f'INSERT INTO "{target_table}" ({target_cols_str}) '
+                f'SELECT {values_str} FROM {ATTACH_ALIAS}."{table_name}" AS v {joins_str}'
+            )
+            inserted_count = cursor.rowcount
+            self.new_conn.execute("RELEASE attach_copy")
+            self.new_conn.commit()
+            elapsed = time.perf_counter() - start
+        
+        except sqlite3.Error as e:
+            self.new_conn.execute("ROLLBACK TO attach_copy")
+            self.new_conn.execute("RELEASE attach_copy")
+            logger.warning(f"   ⚠️ فشل INSERT ... SELECT ({str(e)[:60]}) - إدراج عبر Python")
+            return False
+        
+        self.import_stats[table_name] = inserted_count
+        if not inserted_count:
+            logger.info(f"   ℹ️ جدول {table_name} بدون بيانات")
+            return True
+        logger.info(f"   ✅ {inserted_count} صف ({inserted_count / max(elapsed, 1e-9):,.0f} صف/ث، INSERT ... SELECT)")
+        return True
+    
+    def get_columns_to_copy(self, table_name: str):
+        """
+        أعمدة الجدول المراد نسخها [(عمود VEDA، عمود القاعدة الجديدة)]
+        
+        Returns:
+            القائمة، أو None إذا تعذر نسخ الجدول (مع تسجيل السبب)
+        """
+        # الحصول على الترجمة
+        mapping = COLUMN_MAPPING.get(table_name, {})
+        if not mapping:
+            logger.warning(f"   ⚠️ لا توجد ترجمة لـ {table_name}")
+            return None
+        
+        # الحصول على أعمدة VEDA الفعلية
+        veda_columns = self.get_veda_columns(table_name)
+        if not veda_columns:
+            logger.warning(f"   ⚠️ جدول {table_name} فارغ في VEDA")
+            return None
+        
+        # بناء قائمة الأعمدة المراد نسخها
+        columns_to_copy = []
+        for veda_col in veda_columns:
+            if veda_col in mapping:
+                new_col = mapping[veda_col]
+                # التحقق من عدم تجاهل هذا العمود
+                if not self._should_ignore(table_name, new_col):
+                    columns_to_copy.append((veda_col, new_col))
+        
+        if not columns_to_copy:
+            logger.warning(f"   ⚠️ لا توجد أعمدة قابلة للنسخ في {table_name}")
+            return None
+        
+        return columns_to_copy
+    
+    def get_affinities(self, table_name: str, columns_to_copy: list) -> list:
+        """أنواع أعمدة القاعدة الجديدة بترتيب columns_to_copy"""
+        column_types = self.get_new_column_types(table_name)
+        return [column_types.get(new_col) for _, new_col in columns_to_copy]
+    
+    def insert_chunks(self, table_name: str, columns_to_copy: list, chunks) -> tuple:
+        """
+        إدراج دفعات صفوف محولة بدون commit (الاستدعاء مسؤول عن المعاملة)
+        
+        Args:
+            chunks: دفعات (الصفوف المحولة, عدد القيم التي تعذر تحويلها) - مخرجات iter_table_rows
+                    (تُكتب كل دفعة قبل قراءة التالية)
+        
+        Returns:
+            (المُدرج، المرفوض، القيم التي تعذر تحويلها، عدد الصفوف المقروءة، زمن الإدراج)
+        """
+        new_cols = [new_col for _, new_col in columns_to_copy]
+        new_cols_str = ", ".join([f'`{col}`' for col in new_cols])
+        placeholders = ", ".join(["?" for _ in new_cols])
+        
+        insert_query = f"INSERT INTO `{table_name}` ({new_cols_str}) VALUES ({placeholders})"
+        
+        # الجدول المرمز: تعبئة القاموس ثم الإدراج مباشرة في جدول التخزين
+        encoded = self.get_encoding(table_name)
+        if encoded:
+            storage_table, storage_cols = get_storage_columns(table_name, new_cols)
+            storage_cols_str = ", ".join([f'`{col}`' for col in storage_cols])
+            insert_query = f"INSERT INTO `{storage_table}` ({storage_cols_str}) VALUES ({placeholders})"
+        
+        offset = 0
+        
+        def report_error(index, row, error):
+            logger.debug(f"   ⚠️ خطأ في إدراج صف {offset + index + 1}: {str(error)[:50]}")
+        
+        inserted_count = failed_count = coerce_failures = 0
+        elapsed = 0.0
+        for rows, chunk_failures in chunks:
+            start = time.perf_counter()
+            if encoded:
+                rows = self._encode_rows(encoded, new_cols, rows)
+            chunk_inserted, chunk_failed = insert_rows(
+                self.new_conn, insert_query, rows, on_error=report_error
+            )
+            elapsed += time.perf_counter() - start
+            inserted_count += chunk_inserted
+            failed_count += chunk_failed
+            coerce_failures += chunk_failures
+            offset += len(rows)
+        
+        return inserted_count, failed_count, coerce_failures, offset, elapsed
+    
+    def write_table(self, table_name: str, columns_to_copy: list, chunks) -> bool:
+        """
+        إدراج صفوف محولة في القاعدة الجديدة داخل معاملة واحدة
+        
+        Args:
+            chunks: دفعات (الصفوف المحولة, عدد القيم التي تعذر تحويلها) - مخرجات iter_table_rows
+        """
+        try:
+            inserted_count, failed_count, coerce_failures, offset, elapsed = \
+                self.insert_chunks(table_name, columns_to_copy, chunks)
+        except Exception:
+            # فشل أثناء التدفق: لا تبقى دفعات جزئية تُثبتها معاملة الجدول التالي
+            self.new_conn.rollback()
+            raise
+        
+        if not offset:
+            logger.info(f"   ℹ️ جدول {table_name} بدون بيانات")
+            self.import_stats[table_name] = 0
+            return True
+        
+        start = time.perf_counter()
+        self.new_conn.commit()
+        elapsed += time.perf_counter() - start
+        
+        self.import_stats[table_name] = inserted_count
+        logger.info(f"   ✅ {inserted_count} صف ({inserted_count / max(elapsed, 1e-9):,.0f} صف/ث)")
+        if failed_count:
+            logger.warning(f"   ⚠️ {failed_count} صف مرفوض (التفاصيل في السجل)")
+        if coerce_failures:
+            logger.warning(f"   ⚠️ {coerce_failures} قيمة لا تطابق نوع العمود (أُدرجت NULL)")
+        
+        return True
+    
     def import_table(self, table_name: str) -> bool:
         """إدراج بيانات جدول واحد"""
         try:
             logger.info(f"\n   📥 إدراج {table_name}...")
             
-            # الحصول على الترجمة
-            mapping = COLUMN_MAPPING.get(table_name, {})
-            if not mapping:
-                logger.warning(f"   ⚠️ لا توجد ترجمة لـ {table_name}")
-                return False
-            
-            # الحصول على أعمدة VEDA الفعلية
-            veda_columns = self.get_veda_columns(table_name)
-            if not veda_columns:
-                logger.warning(f"   ⚠️ جدول {table_name} فارغ في VEDA")
+            columns_to_copy = self.get_columns_to_copy(table_name)
+            if columns_to_copy is None:
                 return False
             
-            # بناء قائمة الأعمدة المراد نسخها
-            columns_to_copy = []
-            for veda_col in veda_columns:
-                if veda_col in mapping:
-                    new_col = mapping[veda_col]
-                    # التحقق من عدم تجاهل هذا العمود
-                    if not self._should_ignore(table_name, new_col):
-                        columns_to_copy.append((veda_col, new_col))
-            
-            if not columns_to_copy:
-                logger.warning(f"   ⚠️ لا توجد أعمدة قابلة للنسخ في {table_name}")
-                return False
+            # وضع attach: النسخ داخل SQLite إن أمكن
+            if self.mode == "attach" and self.copy_table_sql(table_name, columns_to_copy):
+                return True
             
-            # قراءة البيانات من VEDA
-            veda_cols_str = ", ".join([f'"{col}"' for col, _ in columns_to_copy])
-            query_veda = f'SELECT {veda_cols_str} FROM "{table_name}"'
+            # قراءة البيانات من VEDA مع تحويل القيم إلى الأنواع المعلنة (ضروري لجداول STRICT)
+            affinities = self.get_affinities(table_name, columns_to_copy)
+            chunks = iter_table_rows(self.veda_cursor, table_name, columns_to_copy, affinities, self.fetch_size)
             
-            self.veda_cursor.execute(query_veda)
-            rows = self.veda_cursor.fetchall()
+            return self.write_table(table_name, columns_to_copy, chunks)
+        
+        except Exception as e:
+            logger.error(f"   ❌ خطأ: {str(e)[:100]}")
+            self.failed_tables.append(table_name)
+            return False
+    
+    def import_table_delta(self, table_name: str) -> bool:
+        """
+        إدراج تزايدي لجدول واحد: تطبيق الفرق عن الإدراج السابق فقط
+        
+        الجدول بمفتاح (DELTA_KEYS): إضافة وتعديل وحذف صف بصف حسب بصمة كل صف.
+        الجدول بدون مفتاح: يُستبدل كاملاً إذا تغيرت بصمته.
+        أعمدة ID التي تشير إلى جدول تغير تُفرغ ليعيد main_link.py ملأها.
+        """
+        try:
+            logger.info(f"\n   📥 إدراج تزايدي {table_name}...")
             
-            if not rows:
-                logger.info(f"   ℹ️ جدول {table_name} بدون بيانات")
-                self.import_stats[table_name] = 0
-                return True
+            columns_to_copy = self.get_columns_to_copy(table_name)
+            if columns_to_copy is None:
+                return False
             
-            # إدراج البيانات في القاعدة الجديدة
+            affinities = self.get_affinities(table_name, columns_to_copy)
             new_cols = [new_col for _, new_col in columns_to_copy]
-            new_cols_str = ", ".join([f'`{col}`' for col in new_cols])
-            placeholders = ", ".join(["?" for _ in new_cols])
             
-            insert_query = f"INSERT INTO `{table_name}` ({new_cols_str}) VALUES ({placeholders})"
+            key_columns = DELTA_KEYS.get(table_name)
+            if key_columns and not set(key_columns) <= set(new_cols):
+                logger.warning(f"   ⚠️ أعمدة المفتاح {key_columns} غير موجودة - مقارنة الجدول كاملاً")
+                key_columns = None
             
-            inserted_count = 0
-            for row in rows:
-                try:
-                    self.new_cursor.execute(insert_query, row)
-                    inserted_count += 1
-                except Exception as e:
-                    logger.debug(f"   ⚠️ خطأ في إدراج صف: {str(e)[:50]}")
+            delta = DeltaTable(self.new_conn, table_name, new_cols, key_columns, self.get_storage_of)
+            if key_columns and not delta.key_columns:
+                logger.warning("   ⚠️ لا عنوان لصفوف الجدول الهدف (WITHOUT ROWID) - مقارنة الجدول كاملاً")
             
-            self.new_conn.commit()
-            self.import_stats[table_name] = inserted_count
-            logger.info(f"   ✅ {inserted_count} صف")
+            start = time.perf_counter()
+            # معاملة واحدة تغطي الفرق كاملاً (الحذف والإدراج والحالة وتفريغ الروابط)
+            if not self.new_conn.in_transaction:
+                self.new_conn.execute("BEGIN")
+            try:
+                if delta.key_columns:
+                    coerce_failures = self._apply_row_delta(delta, columns_to_copy, affinities)
+                else:
+                    coerce_failures = self._apply_table_delta(delta, columns_to_copy, affinities)
+                
+                links_reset = 0
+                if delta.changed:
+                    links_reset = reset_child_links(self.new_conn, table_name, self.get_storage_of)
+                self.new_conn.commit()
+            except Exception:
+                self.new_conn.rollback()
+                raise
+            elapsed = time.perf_counter() - start
             
+            stats = delta.stats
+            self.import_stats[table_name] = stats["inserted"] + stats["updated"]
+            logger.info(
+                f"   ✅ +{stats['inserted']} ~{stats['updated']} -{stats['deleted']} "
+                f"(بدون تغيير {stats['unchanged']}) في {elapsed:.2f}s"
+            )
+            if links_reset:
+                logger.info(f"   🔗 {links_reset} رابط أُفرغ (يُعاد ملؤه في main_link.py)")
+            if stats["failed"]:
+                logger.warning(f"   ⚠️ {stats['failed']} صف مرفوض (يُعاد في الإدراج التالي)")
+            if coerce_failures:
+                logger.warning(f"   ⚠️ {coerce_failures} قيمة لا تطابق نوع العمود (أُدرجت NULL)")
             return True
         
         except Exception as e:
             logger.error(f"   ❌ خطأ: {str(e)[:100]}")
+            self.failed_tables.append(table_name)
             return False
     
+    def _apply_row_delta(self, delta: DeltaTable, columns_to_copy: list, affinities: list) -> int:
+        """
+        مقارنة صفوف جدول بمفتاح بالإدراج السابق على دفعات fetch_size
+        
+        Returns:
+            عدد القيم التي تعذر تحويلها (في الصفوف المكتوبة فقط)
+        """
+        table_name = delta.table_name
+        if not delta.is_consistent():
+            logger.warning("   ⚠️ الجدول لا يطابق حالة الإدراج السابق - إعادة إدراج كاملة")
+            delta.reset()
+        
+        encoded = self.get_encoding(table_name)
+        coerce_failures = 0
+        
+        def prepare(rows):
+            nonlocal coerce_failures
+            coerced_rows = []
+            for row in rows:
+                row, failures = coerce_row(row, affinities)
+                coerce_failures += failures
+                coerced_rows.append(row)
+            if encoded:
+                coerced_rows = self._encode_rows(encoded, delta.columns, coerced_rows)
+            return coerced_rows
+        
+        self.veda_cursor.execute(get_source_query(table_name, columns_to_copy, delta.key_columns))
+        for rows in fetch_chunks(self.veda_cursor, self.fetch_size):
+            delta.apply_chunk([row[:-1] for row in rows], [row[-1] for row in rows], prepare)
+        
+        delta.finish()
+        return coerce_failures
+    
+    def _apply_table_delta(self, delta: DeltaTable, columns_to_copy: list, affinities: list) -> int:
+        """
+        مقارنة جدول بدون مفتاح ببصمته السابقة، وإعادة إدراجه كاملاً إذا تغير
+        
+        (قراءة ثانية من VEDA عند التغيير فقط؛ بدون commit - ضمن معاملة import_table_delta)
+        
+        Returns:
+            عدد القيم التي تعذر تحويلها
+        """
+        table_name = delta.table_name
+        self.veda_cursor.execute(get_source_query(table_name, columns_to_copy))
+        for rows in fetch_chunks(self.veda_cursor, self.fetch_size):
+            delta.add_table_rows(rows)
+        
+        if delta.is_consistent() and not delta.table_changed():
+            delta.stats["unchanged"] = delta.row_count
+            return 0
+        
+        delta.reset()
+        chunks = iter_table_rows(self.veda_cursor, table_name, columns_to_copy, affinities, self.fetch_size)
+        inserted, failed, coerce_failures, _, _ = self.insert_chunks(table_name, columns_to_copy, chunks)
+        delta.stats["inserted"] += inserted
+        delta.stats["failed"] += failed
+        # الصفوف المرفوضة تجعل عدد الصفوف أقل من الحالة المحفوظة: إعادة إدراج كاملة في المرة التالية
+        delta.save_table_state()
+        return coerce_failures
+    
+    def import_parallel(self):
+        """
+        إدراج جميع الجداول بالتوازي
+        
+        القراءة والتحويل في العمال (اتصال VEDA مستقل لكل جدول)، والكتابة في هذا الخيط
+        بترتيب التبعيات (get_import_order). في وضع attach لا يحتاج الجدول عاملاً
+        إلا إذا احتوى قيماً تحتاج تحويل. مع fetch_size يمرر العامل الجدول دفعة دفعة
+        (stream) بدل تحميله كاملاً.
+        """
+        stream = bool(self.fetch_size)
+        plans = {}
+        tasks = []
+        for table_name in get_import_order(TABLES_TO_IMPORT):
+            columns_to_copy = self.get_columns_to_copy(table_name)
+            if columns_to_copy is None:
+                continue
+            affinities = self.get_affinities(table_name, columns_to_copy)
+            plans[table_name] = (columns_to_copy, affinities)
+            
+            if self.mode == "attach" and not self._count_unconvertible(table_name, columns_to_copy, affinities):
+                tasks.append(ImportTask(table_name, None, ()))
+            else:
+                read_args = (self.veda_path, table_name, columns_to_copy, affinities)
+                if stream:
+                    tasks.append(ImportTask(table_name, stream_table, read_args + (self.fetch_size,)))
+                else:
+                    tasks.append(ImportTask(table_name, read_table, read_args))
+        
+        def write(table_name, result):
+            logger.info(f"\n   📥 إدراج {table_name}...")
+            columns_to_copy, affinities = plans[table_name]
+            try:
+                if result is None:
+                    if self.copy_table_sql(table_name, columns_to_copy, checked=True):
+                        return
+                    # اتصال قراءة مستقل - اتصالا الكاتب مشغولان بمعاملة الجدول
+                    result = stream_table(self.veda_path, table_name, columns_to_copy, affinities, self.fetch_size)
+                elif not stream:
+                    result = [result]
+                self.write_table(table_name, columns_to_copy, result)
+            except Exception as e:
+                logger.error(f"   ❌ خطأ: {str(e)[:100]}")
+                self.failed_tables.append(table_name)
+        
+        logger.info(f"⚡ إدراج متوازٍ: {self.workers} عامل ({self.executor})، {len(tasks)} جدول"
+                    + (f"، دفعات {self.fetch_size} صف" if stream else ""))
+        timings = run_parallel_import(tasks, write, workers=self.workers, executor=self.executor,
+                                      stream=stream)
+        
+        logger.info("\n⏱️ التوقيت لكل جدول (قراءة في العامل | انتظار الكاتب | كتابة):")
+        for table_name, timing in timings.items():
+            if timing["error"]:
+                logger.error(f"   ❌ {table_name}: فشلت القراءة ({timing['error'][:80]})")
+                # في وضع الدفعات يصل الخطأ إلى write أيضاً
+                if table_name not in self.failed_tables:
+                    self.failed_tables.append(table_name)
+                continue
+            logger.info(f"   {table_name:<50} {timing['read']:>7.2f}s {timing['wait']:>7.2f}s {timing['write']:>7.2f}s")
+    
     def _should_ignore(self, table_name: str, column_name: str) -> bool:
         """التحقق من أن العمود يجب تجاهله"""
         ignored = COLUMNS_TO_IGNORE.get(table_name, [])
@@ -179,8 +780,16 @@ class DatabaseImporter:
             logger.info("📥 بدء إدراج البيانات...")
             logger.info("="*70)
             
-            for table_name in TABLES_TO_IMPORT:
-                self.import_table(table_name)
+            # نفس ترتيب التبعيات في كل الأوضاع (الجدول الأب قبل الابن)
+            tables = get_import_order(TABLES_TO_IMPORT)
+            if self.mode == "delta":
+                for table_name in tables:
+                    self.import_table_delta(table_name)
+            elif self.workers > 1:
+                self.import_parallel()
+            else:
+                for table_name in tables:
+                    self.import_table(table_name)
             
             # النتيجة
             logger.info("\n" + "="*70)
@@ -196,6 +805,9 @@ class DatabaseImporter:
             logger.info(f"إجمالي الصفوف المُدرجة: {total_inserted}")
             logger.info("="*70)
             
+            if self.failed_tables:
+                logger.error(f"❌ فشل إدراج {len(self.failed_tables)} جدول: {', '.join(self.failed_tables)}")
+                return False
             return True
         
         except Exception as e:
@@ -216,6 +828,7 @@ class DatabaseImporter:
             if self.new_cursor:
                 self.new_cursor.close()
             if self.new_conn:
+                restore_journal_mode(self.new_conn, self.journal_mode)
                 self.new_conn.close()
             
             logger.info("✅ إغلاق الاتصالات")
@@ -227,16 +840,23 @@ class DatabaseImporter:
 # دالة عامة للإدراج
 # ============================================================
 
-def import_data(veda_path: str, new_path: str) -> bool:
+def import_data(veda_path: str, new_path: str, profile: str = None, mode: str = "python",
+                workers: int = 1, executor: str = "thread", fetch_size: int = None) -> bool:
     """
     دالة سريعة لإدراج البيانات
     
     Args:
         veda_path: مسار VEDA.db
         new_path: مسار structural_database.db
+        profile: ملف اتصال القاعدة الجديدة (اختياري)
+        mode: "python" أو "attach" أو "delta" (انظر IMPORT_MODES)
+        workers: عدد عمال القراءة (1 = جدول بعد جدول)
+        executor: "thread" أو "process" لعمال القراءة
+        fetch_size: قراءة وكتابة كل جدول على دفعات بهذا الحجم (None = الجدول كاملاً)
     
     Returns:
         bool: True إذا نجح، False إذا فشل
     """
-    importer = DatabaseImporter(veda_path, new_path)
+    importer = DatabaseImporter(veda_path, new_path, profile, mode=mode,
+                                workers=workers, executor=executor, fetch_size=fetch_size)
     return importer.import_all()
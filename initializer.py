@@ -5,7 +5,9 @@ import sqlite3
 import logging
 from pathlib import Path
 from datetime import datetime
-from database.schema import get_create_tables_sql, get_alter_tables_sql, split_sql_statements
+from database.schema import (compile_sqlite_ddl, split_sql_statements, get_storage_columns,
+                             get_index_plan, get_index_verification_queries, get_code_plan_names,
+                             STRICT_MIN_SQLITE_VERSION)
 
 
 # ============================================================
@@ -54,8 +56,10 @@ logger = setup_logger()
 class DatabaseInitializer:
     """فئة متخصصة لإنشاء قاعدة البيانات الجديدة بالجداول الفارغة"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, strict: bool = False, encode: bool = False):
         self.db_path = Path(db_path)
+        self.strict = strict
+        self.encode = encode  # ترميز جداول القوى (ENCODED_TABLES)
         self.conn = None
         self.cursor = None
         self.tables_created = []
@@ -88,16 +92,29 @@ class DatabaseInitializer:
             return False
     
     def create_tables(self) -> bool:
-        """إنشاء جميع الجداول من schema.py"""
+        """إنشاء جميع الجداول من schema.py (بصيغة SQLite الأصلية)"""
         try:
             logger.info("\n" + "="*70)
             logger.info("🏗️  إنشاء الجداول الفارغة...")
             logger.info("="*70)
             
-            # الحصول على جميع جمل SQL من CREATE_TABLES_SQL
-            create_sql = get_create_tables_sql()
+            # تحويل CREATE_TABLES_SQL و ALTER_TABLES_SQL إلى صيغة SQLite
+            if self.strict and sqlite3.sqlite_version_info < STRICT_MIN_SQLITE_VERSION:
+                logger.error(f"❌ الصيغة STRICT تتطلب SQLite 3.37 أو أحدث (الحالي {sqlite3.sqlite_version})")
+                return False
+            if self.strict:
+                logger.info("   🧱 الصيغة STRICT")
+            if self.encode:
+                logger.info("   🔢 ترميز النصوص المتكررة في جداول القوى")
+            create_sql, skipped_keys = compile_sqlite_ddl(strict=self.strict, encode=self.encode)
             statements = split_sql_statements(create_sql)
             
+            for fk in skipped_keys:
+                logger.warning(
+                    f"   ⚠️ مفتاح خارجي متخطى: {fk['table']}.{fk['column']} → "
+                    f"{fk['ref_table']}.{fk['ref_column']} ({fk['reason']})"
+                )
+            
             for statement in statements:
                 if statement.strip():
                     try:
@@ -127,9 +144,9 @@ class DatabaseInitializer:
     def _extract_table_name(self, sql_statement: str) -> str:
         """استخراج اسم الجدول من جملة SQL"""
         try:
-            # البحث عن CREATE TABLE IF NOT EXISTS `table_name`
+            # البحث عن CREATE TABLE/VIEW/TRIGGER IF NOT EXISTS `table_name`
             import re
-            match = re.search(r'CREATE TABLE IF NOT EXISTS [`"]?(\w+)[`"]?', sql_statement, re.IGNORECASE)
+            match = re.search(r'CREATE (?:TABLE|VIEW|TRIGGER) IF NOT EXISTS [`"]?(\w+)[`"]?', sql_statement, re.IGNORECASE)
             if match:
                 return match.group(1)
             return "Unknown"
@@ -157,6 +174,140 @@ class DatabaseInitializer:
             logger.error(f"❌ خطأ في التحقق: {e}")
             return 0, []
     
+    # ════════════════════════════════════════════════════════════════
+    # الفهارس (بعد الإدراج)
+    # ════════════════════════════════════════════════════════════════
+    
+    def _table_columns(self, table_name: str) -> list:
+        """أسماء أعمدة جدول (قائمة فارغة إذا لم يوجد)"""
+        self.cursor.execute(f'PRAGMA table_info("{table_name}")')
+        return [row[1] for row in self.cursor.fetchall()]
+    
+    def _is_view(self, name: str) -> bool:
+        """التحقق من أن الاسم VIEW وليس جدولاً"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+    
+    def _has_equivalent_index(self, table_name: str, columns: list) -> str:
+        """
+        البحث عن فهرس قائم يبدأ بنفس الأعمدة
+        
+        Returns:
+            اسم الفهرس القائم أو None
+        """
+        self.cursor.execute(f'PRAGMA index_list("{table_name}")')
+        for index_row in self.cursor.fetchall():
+            index_name = index_row[1]
+            self.cursor.execute(f'PRAGMA index_info("{index_name}")')
+            index_columns = [row[2] for row in sorted(self.cursor.fetchall())]
+            if index_columns[:len(columns)] == columns:
+                return index_name
+        return None
+    
+    def create_indexes(self) -> bool:
+        """
+        إنشاء فهارس INDEX_PLAN (يُستدعى بعد اكتمال الإدراج)
+        
+        - يُتخطى الفهرس إذا لم يوجد الجدول أو أحد أعمدته
+        - يُتخطى إذا وُجد فهرس آخر يبدأ بنفس الأعمدة (مثل UNIQUE)
+        """
+        try:
+            logger.info("\n" + "="*70)
+            logger.info("📇 إنشاء الفهارس...")
+            logger.info("="*70)
+            
+            created = 0
+            for index in get_index_plan():
+                table_name = index["table"]
+                columns = index["columns"]
+                
+                # الجدول المرمز (الصيغة STRICT) VIEW: الفهرس على جدول التخزين
+                if self._is_view(table_name):
+                    table_name, columns = get_storage_columns(table_name, columns)
+                
+                table_columns = self._table_columns(table_name)
+                missing = [col for col in columns if col not in table_columns]
+                if not table_columns or missing:
+                    logger.warning(f"   ⚠️ {index['name']}: أعمدة غير موجودة {missing or table_name}")
+                    continue
+                
+                existing = self._has_equivalent_index(table_name, columns)
+                if existing and existing != index["name"]:
+                    logger.info(f"   ⏭️ {index['name']}: مغطى بـ {existing}")
+                    continue
+                
+                columns_sql = ", ".join(f'"{col}"' for col in columns)
+                self.cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{index["name"]}" ON "{table_name}" ({columns_sql})'
+                )
+                created += 1
+                logger.info(f"   ✅ {index['name']} ({', '.join(columns)})")
+            
+            self.conn.commit()
+            logger.info(f"✅ تم إنشاء/تأكيد {created} فهرس")
+            return True
+        
+        except Exception as e:
+            logger.error(f"❌ خطأ في إنشاء الفهارس: {e}")
+            return False
+    
+    def verify_index_usage(self) -> dict:
+        """
+        التحقق عبر EXPLAIN QUERY PLAN من أن استعلامات الخدمات تستخدم فهرساً
+        
+        أي SCAN لجدول غير القاموس يعني استعلاماً بدون فهرس (في الجداول المرمزة تظهر
+        عمليات بحث القاموس بـ INTEGER PRIMARY KEY حتى مع مسح جدول التخزين كاملاً).
+        
+        Returns:
+            قاموس {اسم الاستعلام: (يستخدم فهرساً؟, تفاصيل الخطة)}
+        """
+        code_names = get_code_plan_names()
+        results = {}
+        for name, query, params in get_index_verification_queries():
+            try:
+                self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                details = [row[3] for row in self.cursor.fetchall()]
+            except Exception as e:
+                results[name] = (False, [f"خطأ: {e}"])
+                logger.warning(f"   ⚠️ {name}: {e}")
+                continue
+            
+            scans = [detail for detail in details
+                     if detail.startswith("SCAN ") and detail.split()[1] not in code_names]
+            uses_index = not scans and any(
+                "USING INDEX" in detail or "USING COVERING INDEX" in detail
+                or "USING INTEGER PRIMARY KEY" in detail or "USING PRIMARY KEY" in detail
+                for detail in details
+            )
+            results[name] = (uses_index, details)
+            if uses_index:
+                logger.info(f"   ✅ {name}: {' | '.join(details)}")
+            else:
+                logger.warning(f"   ⚠️ {name} بدون فهرس: {' | '.join(details)}")
+        
+        return results
+    
+    def build_indexes(self) -> bool:
+        """إنشاء الفهارس ثم التحقق من استخدامها"""
+        try:
+            if not self.connect_database():
+                return False
+            
+            if not self.create_indexes():
+                return False
+            
+            logger.info("\n🔍 التحقق من استخدام الفهارس...")
+            results = self.verify_index_usage()
+            unindexed = [name for name, (used, _) in results.items() if not used]
+            if unindexed:
+                logger.warning(f"⚠️ استعلامات بدون فهرس: {', '.join(unindexed)}")
+            else:
+                logger.info(f"✅ جميع الاستعلامات ({len(results)}) تستخدم فهرساً")
+            
+            return True
+        finally:
+            self.close()
+    
     def initialize(self) -> bool:
         """تنفيذ الإنشاء الكامل"""
         try:
@@ -206,15 +357,31 @@ class DatabaseInitializer:
 # دالة عامة للإنشاء
 # ============================================================
 
-def initialize_database(db_path: str) -> bool:
+def initialize_database(db_path: str, strict: bool = False, encode: bool = False) -> bool:
     """
     دالة سريعة لتهيئة قاعدة البيانات الجديدة
     
     Args:
         db_path: مسار قاعدة البيانات الجديدة
+        strict: جداول STRICT (تتطلب SQLite 3.37 أو أحدث)
+        encode: ترميز النصوص المتكررة في جداول القوى (رموز القاموس)
     
     Returns:
         bool: True إذا نجح، False إذا فشل
     """
-    initializer = DatabaseInitializer(db_path)
+    initializer = DatabaseInitializer(db_path, strict=strict, encode=encode)
     return initializer.initialize()
+
+
+def build_indexes(db_path: str) -> bool:
+    """
+    دالة سريعة لإنشاء الفهارس بعد الإدراج
+    
+    Args:
+        db_path: مسار قاعدة البيانات
+    
+    Returns:
+        bool: True إذا نجح، False إذا فشل
+    """
+    initializer = DatabaseInitializer(db_path)
+    return initializer.build_indexes()
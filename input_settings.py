@@ -174,6 +174,44 @@ COLUMN_MAPPING = {
         "Elem Station": "Elem_Station",
         "Location": "Location",
     },
+    
+    # ═══════════════════════════════════════════════════════
+    # 1️⃣1️⃣ Element_Forces_Beams
+    # ═══════════════════════════════════════════════════════
+    "Element_Forces_Beams": {
+        "Story": "Story",
+        "Beam": "Beam",
+        "Unique Name": "Unique_Name",
+        "Output Case": "Output_Case",
+        "Case Type": "Case_Type",
+        "Station": "Station",
+        "P": "P",
+        "V2": "V2",
+        "V3": "V3",
+        "T": "T",
+        "M2": "M2",
+        "M3": "M3",
+        "Element": "Element",
+        "Elem Station": "Elem_Station",
+        "Location": "Location",
+    },
+    
+    # ═══════════════════════════════════════════════════════
+    # 1️⃣2️⃣ Pier_Forces
+    # ═══════════════════════════════════════════════════════
+    "Pier_Forces": {
+        "Story": "Story",
+        "Pier": "Pier",
+        "Output Case": "Output_Case",
+        "Case Type": "Case_Type",
+        "Location": "Location",
+        "P": "P",
+        "V2": "V2",
+        "V3": "V3",
+        "T": "T",
+        "M2": "M2",
+        "M3": "M3",
+    },
 }
 
 
@@ -212,7 +250,28 @@ COLUMNS_TO_IGNORE = {
 
 
 # ============================================================
-# الجداول المراد نسخ البيانات منها (11 جدول فقط)
+# مفاتيح الإدراج التزايدي (IMPORT_MODE = "delta")
+# ============================================================
+# أعمدة تحدد الصف نفسه بين تصديرين من ETABS (بأسماء القاعدة الجديدة)
+# تكرار المفتاح (مثل صفوف Max/Min لنفس المحطة) يُميز بترتيبه في VEDA
+# الجدول غير المذكور يُقارن كاملاً ويُستبدل عند أي تغيير (يحفظ ترتيب ID كما في VEDA)
+
+DELTA_KEYS = {
+    "Material_Properties_Concrete_Data": ["Material"],
+    "Material_Properties_Rebar_Data": ["Material"],
+    "Objects_and_Elements_Joints": ["Element_Name"],
+    "Column_Object_Connectivity": ["GUID"],
+    "Frame_Section_Property_Definitions_Concrete_Column_Reinforcing": ["Name"],
+    "Frame_Section_Property_Definitions_Concrete_Rectangular": ["GUID"],
+    "Frame_Assignments_Section_Properties": ["Story", "UniqueName"],
+    "Element_Forces_Columns": ["Unique_Name", "Output_Case", "Station"],
+    "Element_Forces_Beams": ["Unique_Name", "Output_Case", "Station"],
+    "Pier_Forces": ["Story", "Pier", "Output_Case", "Location"],
+}
+
+
+# ============================================================
+# الجداول المراد نسخ البيانات منها (12 جدول فقط)
 # ============================================================
 
 TABLES_TO_IMPORT = list(COLUMN_MAPPING.keys())
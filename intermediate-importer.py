@@ -12,6 +12,9 @@ database/intermediate_importer.py - نظام الاستيراد الوسيط ا
 import sqlite3
 import logging
 from typing import Dict, Tuple, List, Optional
+from database.schema_catalog import get_schema_catalog
+from database.batch_insert import fetch_chunks
+from config.settings import IMPORT_FETCH_SIZE
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +23,13 @@ logger = logging.getLogger(__name__)
 # الخطوة 1: نسخ خام من VEDA إلى Intermediate DB
 # ============================================================
 
-def copy_veda_to_intermediate(veda_path: str, intermediate_path: str) -> bool:
-    """نسخ كل الجداول من VEDA إلى قاعدة وسيطة بدون تعديل"""
+def copy_veda_to_intermediate(veda_path: str, intermediate_path: str,
+                              fetch_size: Optional[int] = IMPORT_FETCH_SIZE) -> bool:
+    """
+    نسخ كل الجداول من VEDA إلى قاعدة وسيطة بدون تعديل
+    
+    fetch_size: عدد الصفوف المقروءة والمكتوبة في كل دفعة (None = الجدول كاملاً)
+    """
     try:
         veda_conn = sqlite3.connect(veda_path)
         intermediate_conn = sqlite3.connect(intermediate_path)
@@ -29,15 +37,14 @@ def copy_veda_to_intermediate(veda_path: str, intermediate_path: str) -> bool:
         logger.info("🔄 المرحلة 1: نسخ VEDA → قاعدة وسيطة")
         
         veda_cursor = veda_conn.cursor()
-        veda_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in veda_cursor.fetchall()]
+        catalog = get_schema_catalog(veda_path, veda_conn)
+        tables = catalog.table_names()
         
         logger.info(f"   وجدت {len(tables)} جدول في VEDA")
         
         for table in tables:
             try:
-                veda_cursor.execute(f"PRAGMA table_info({table})")
-                columns_info = veda_cursor.fetchall()
+                columns_info = catalog.table_info(table)
                 
                 if not columns_info:
                     logger.warning(f"   ⚠ {table}: لا توجد أعمدة")
@@ -56,23 +63,25 @@ def copy_veda_to_intermediate(veda_path: str, intermediate_path: str) -> bool:
                 intermediate_cursor = intermediate_conn.cursor()
                 intermediate_cursor.execute(create_sql)
                 
-                # نسخ البيانات
+                # نسخ البيانات (دفعة بدفعة - كل دفعة تُكتب قبل قراءة التالية)
                 veda_cursor.execute(f"SELECT * FROM \"{table}\"")
-                rows = veda_cursor.fetchall()
+                placeholders = ", ".join(["?" for _ in columns_info])
+                col_names = ", ".join([f'"{col[1]}"' for col in columns_info])
+                insert_sql = f"INSERT INTO \"{table}\" ({col_names}) VALUES ({placeholders})"
                 
-                if rows:
-                    placeholders = ", ".join(["?" for _ in columns_info])
-                    col_names = ", ".join([f'"{col[1]}"' for col in columns_info])
-                    insert_sql = f"INSERT INTO \"{table}\" ({col_names}) VALUES ({placeholders})"
-                    
+                row_count = 0
+                for rows in fetch_chunks(veda_cursor, fetch_size):
                     intermediate_cursor.executemany(insert_sql, rows)
+                    row_count += len(rows)
+                
+                if row_count:
                     intermediate_conn.commit()
-                    
-                    logger.info(f"   ✓ {table}: {len(rows)} صف")
+                    logger.info(f"   ✓ {table}: {row_count} صف")
                 else:
                     logger.info(f"   ⊘ {table}: فارغ")
             
             except Exception as e:
+                intermediate_conn.rollback()
                 logger.error(f"   ✗ خطأ في {table}: {str(e)[:50]}")
                 continue
         
@@ -181,8 +190,13 @@ def create_mapping_tables(intermediate_path: str) -> bool:
 # الخطوة 3: تحويل من Intermediate إلى قاعدة النهائية
 # ============================================================
 
-def transform_to_final(intermediate_path: str, final_path: str) -> bool:
-    """تحويل البيانات من الوسيطة إلى قاعدة النهائية"""
+def transform_to_final(intermediate_path: str, final_path: str,
+                       fetch_size: Optional[int] = IMPORT_FETCH_SIZE) -> bool:
+    """
+    تحويل البيانات من الوسيطة إلى قاعدة النهائية
+    
+    fetch_size: عدد الصفوف المقروءة والمكتوبة في كل دفعة (None = الجدول كاملاً)
+    """
     try:
         intermediate_conn = sqlite3.connect(intermediate_path)
         final_conn = sqlite3.connect(final_path)
@@ -253,25 +267,29 @@ def transform_to_final(intermediate_path: str, final_path: str) -> bool:
                 
                 source_col_str = ", ".join([f'"{c}"' for c in source_cols])
                 intermediate_cursor.execute(f"SELECT {source_col_str} FROM \"{source_table}\"")
-                rows = intermediate_cursor.fetchall()
-                
-                if not rows:
-                    logger.info(f"   ⊘ {source_table} → {target_table}: فارغ")
-                    continue
                 
-                # إدراج في الجدول النهائي
+                # إدراج في الجدول النهائي (دفعة بدفعة)
                 target_col_str = ", ".join([f'"{c}"' for c in target_cols])
                 placeholders = ", ".join(["?" for _ in target_cols])
                 insert_sql = f"INSERT INTO \"{target_table}\" ({target_col_str}) VALUES ({placeholders})"
                 
-                final_cursor.executemany(insert_sql, rows)
+                row_count = 0
+                for rows in fetch_chunks(intermediate_cursor, fetch_size):
+                    final_cursor.executemany(insert_sql, rows)
+                    row_count += len(rows)
+                
+                if not row_count:
+                    logger.info(f"   ⊘ {source_table} → {target_table}: فارغ")
+                    continue
+                
                 final_conn.commit()
                 
-                logger.info(f"   ✓ {source_table} → {target_table}: {len(rows)} صف")
-                total_rows += len(rows)
+                logger.info(f"   ✓ {source_table} → {target_table}: {row_count} صف")
+                total_rows += row_count
                 successful_imports += 1
                 
             except Exception as e:
+                final_conn.rollback()
                 logger.error(f"   ✗ خطأ في {source_table}: {str(e)[:50]}")
                 continue
         
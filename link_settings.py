@@ -137,6 +137,7 @@ ID_FILL_LINKS = [
         "target_table": "Material_Properties_Rebar_Data",
         "target_column": "ID",
         "lookup_column": "Tie_Bar_Material",
+        "target_lookup_column": "Material",  # اسم العمود في الجدول الهدف
         "type": "id_fill",
         "priority": 2,  # بعد الربط المباشر
     },
@@ -147,6 +148,7 @@ ID_FILL_LINKS = [
         "target_table": "Material_Properties_Rebar_Data",
         "target_column": "ID",
         "lookup_column": "Longitudinal_Bar_Material",
+        "target_lookup_column": "Material",  # اسم العمود في الجدول الهدف
         "type": "id_fill",
         "priority": 2,
     },
@@ -167,6 +169,7 @@ ID_FILL_LINKS = [
         "target_table": "Frame_Section_Property_Definitions_Concrete_Rectangular",
         "target_column": "ID",
         "lookup_column": "Section_Property",
+        "target_lookup_column": "Name",  # اسم العمود في الجدول الهدف
         "type": "id_fill",
         "priority": 2,
     },
@@ -187,6 +190,7 @@ ID_FILL_LINKS = [
         "target_table": "Load_Combination_Definitions",
         "target_column": "ID",
         "lookup_column": "Output_Case",
+        "target_lookup_column": "Name",  # اسم العمود في الجدول الهدف
         "type": "id_fill",
         "priority": 2,
     },
@@ -7,6 +7,9 @@ from pathlib import Path
 from datetime import datetime
 from config.link_settings import ALL_LINKS, DIRECT_LINKS, ID_FILL_LINKS, ID_FILL_COMPLEX_LINKS, STATIC_ID_LINKS, VALIDATION_LINKS
 from config.settings import NEW_DATABASE_PATH
+from config.connection_settings import apply_connection_profile, get_journal_mode, restore_journal_mode
+from database.schema import ENCODED_TABLES, get_storage_columns
+from database.schema_catalog import get_schema_catalog
 
 
 # ============================================================
@@ -55,17 +58,24 @@ logger = setup_logger()
 class DatabaseLinker:
     """فئة متخصصة لربط البيانات بين الجداول"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, profile: str = None):
         self.db_path = db_path
+        self.profile = profile  # ملف الاتصال (مثل "bulk_write")
         self.conn = None
         self.cursor = None
+        self.catalog = None
         self.link_stats = {}
+        self.journal_mode = None  # journal_mode قبل ملف الاتصال (يُعاد عند الإغلاق)
     
     def connect(self) -> bool:
         """الاتصال بقاعدة البيانات"""
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.cursor = self.conn.cursor()
+            if self.profile:
+                self.journal_mode = get_journal_mode(self.conn)
+                apply_connection_profile(self.conn, self.profile)
+            self.catalog = get_schema_catalog(self.db_path, self.conn)
             logger.info(f"✅ اتصال قاعدة البيانات: {self.db_path}")
             return True
         except Exception as e:
@@ -81,11 +91,37 @@ class DatabaseLinker:
         except Exception as e:
             logger.warning(f"⚠️ خطأ في تعطيل المفاتيح: {e}")
     
+    def _source(self, table_name: str):
+        """
+        الجدول الذي يُحدث فعلياً ودالة تعبير أعمدته
+        
+        الجدول المرمز (VIEW): جدول التخزين مباشرة - التحديث عبر VIEW يشغل INSTEAD OF trigger
+        لكل صف ولا يعيد عدد الصفوف؛ العمود المرمز يُقرأ من القاموس.
+        
+        Returns:
+            (الجدول، دالة (العمود) → تعبير SQL، دالة (العمود) → اسم العمود في الجدول)
+        """
+        encoded = ENCODED_TABLES.get(table_name)
+        if encoded is None or not self.catalog.is_view(table_name):
+            return (table_name,
+                    lambda col: f"`{table_name}`.`{col}`",
+                    lambda col: col)
+        
+        storage = encoded["storage"]
+        
+        def value(col):
+            code_table = encoded["codes"].get(col)
+            if code_table is None:
+                return f"`{storage}`.`{col}`"
+            return f'(SELECT "Value" FROM `{code_table}` WHERE "Code" = `{storage}`.`{col}_Code`)'
+        
+        return storage, value, lambda col: get_storage_columns(table_name, [col])[1][0]
+    
     def link_static_id(self, link: dict) -> int:
         """ملء Static ID"""
         try:
-            source_table = link["source_table"]
-            source_column = link["source_column"]
+            source_table, _, column = self._source(link["source_table"])
+            source_column = column(link["source_column"])
             static_value = link["static_value"]
             
             query = f"UPDATE `{source_table}` SET `{source_column}` = ? WHERE `{source_column}` IS NULL"
@@ -101,20 +137,22 @@ class DatabaseLinker:
     def link_id_fill(self, link: dict) -> int:
         """ملء ID من قيمة نصية"""
         try:
-            source_table = link["source_table"]
-            source_column = link["source_column"]
+            source_table, value, column = self._source(link["source_table"])
+            source_column = column(link["source_column"])
             target_table = link["target_table"]
             target_column = link["target_column"]
             lookup_column = link["lookup_column"]
+            # العمود المقابل في الجدول الهدف (الافتراضي: نفس الاسم)
+            target_lookup = link.get("target_lookup_column", lookup_column)
             
             query = f"""
-            UPDATE `{source_table}` AS st
+            UPDATE `{source_table}`
             SET `{source_column}` = (
-                SELECT `{target_column}`
-                FROM `{target_table}`
-                WHERE `{lookup_column}` = st.`{lookup_column}`
+                SELECT t.`{target_column}`
+                FROM `{target_table}` AS t
+                WHERE t.`{target_lookup}` = {value(lookup_column)}
             )
-            WHERE st.`{source_column}` IS NULL
+            WHERE `{source_table}`.`{source_column}` IS NULL
             """
             
             self.cursor.execute(query)
@@ -129,8 +167,8 @@ class DatabaseLinker:
     def link_id_fill_complex(self, link: dict) -> int:
         """ملء ID بشرط مركب"""
         try:
-            source_table = link["source_table"]
-            source_column = link["source_column"]
+            source_table, value, column = self._source(link["source_table"])
+            source_column = column(link["source_column"])
             target_table = link["target_table"]
             target_column = link["target_column"]
             source_cols = link["join_on"]["source"]
@@ -138,18 +176,18 @@ class DatabaseLinker:
             
             # بناء شرط الجمع
             join_condition = " AND ".join([
-                f"st.`{src}` = t.`{tgt}`"
+                f"{value(src)} = t.`{tgt}`"
                 for src, tgt in zip(source_cols, target_cols)
             ])
             
             query = f"""
-            UPDATE `{source_table}` AS st
+            UPDATE `{source_table}`
             SET `{source_column}` = (
                 SELECT t.`{target_column}`
                 FROM `{target_table}` AS t
                 WHERE {join_condition}
             )
-            WHERE st.`{source_column}` IS NULL
+            WHERE `{source_table}`.`{source_column}` IS NULL
             """
             
             self.cursor.execute(query)
@@ -251,6 +289,7 @@ class DatabaseLinker:
             if self.cursor:
                 self.cursor.close()
             if self.conn:
+                restore_journal_mode(self.conn, self.journal_mode)
                 self.conn.close()
             logger.info("✅ إغلاق الاتصال")
         except Exception as e:
@@ -261,15 +300,16 @@ class DatabaseLinker:
 # دالة عامة للربط
 # ============================================================
 
-def link_data(db_path: str) -> bool:
+def link_data(db_path: str, profile: str = None) -> bool:
     """
     دالة سريعة لربط البيانات
     
     Args:
         db_path: مسار قاعدة البيانات
+        profile: ملف الاتصال (اختياري)
     
     Returns:
         bool: True إذا نجح، False إذا فشل
     """
-    linker = DatabaseLinker(db_path)
+    linker = DatabaseLinker(db_path, profile)
     return linker.link_all()
@@ -1,6 +1,7 @@
 # models/load_combination.py
 # نموذج حالات التحميل (Load Combination Model)
 
+from collections import namedtuple
 from datetime import datetime
 from typing import Dict, Optional, Any
 from base import BaseElement
@@ -223,6 +224,30 @@ class Force:
         }
 
 
+# ============================================================
+# 🟣 سجل قوة خفيف (Force Record) للقراءة المتدفقة
+# ============================================================
+
+# ترتيب الحقول يطابق ترتيب أعمدة FORCE_RECORD_COLUMNS في الاستعلام
+FORCE_RECORD_COLUMNS = (
+    "Story", "Column", "Unique_Name", "Output_Case", "Case_Type",
+    "Station", "P", "V2", "V3", "T", "M2", "M3", "Element",
+    "Elem_Station", "Location", "ElementID", "Load_case_id"
+)
+
+ForceRecord = namedtuple("ForceRecord", [
+    "story", "column", "unique_name", "output_case", "case_type",
+    "station", "p", "v2", "v3", "t", "m2", "m3", "element",
+    "elem_station", "location", "element_id", "load_case_id"
+])
+ForceRecord.__doc__ = """
+    صف واحد من Element_Forces_Columns (بدون إنشاء كائن Force كامل)
+    
+    يُستخدم مع المولّدات (iter_column_forces) حتى تبقى الذاكرة ثابتة
+    مهما كان حجم الجدول.
+    """
+
+
 # ============================================================
 # 🟢 نموذج حالات التحميل المتعددة (LoadCases Group)
 # ============================================================
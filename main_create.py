@@ -10,7 +10,7 @@ PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from database.initializer import initialize_database
-from config.settings import NEW_DATABASE_PATH, LOG_DIR
+from config.settings import NEW_DATABASE_PATH, LOG_DIR, STRICT_SCHEMA, ENCODED_SCHEMA, TOTAL_NEW_TABLES
 
 
 # ============================================================
@@ -62,14 +62,14 @@ def main():
     logger.info("="*80)
     
     logger.info(f"\n📁 المسار: {NEW_DATABASE_PATH}")
-    logger.info(f"📊 الجداول: 11 جدول")
+    logger.info(f"📊 الجداول: {TOTAL_NEW_TABLES} جدول")
     
     # استدعاء initializer
     logger.info("\n" + "-"*80)
     logger.info("🔧 بدء الإنشاء...")
     logger.info("-"*80 + "\n")
     
-    success = initialize_database(NEW_DATABASE_PATH)
+    success = initialize_database(NEW_DATABASE_PATH, strict=STRICT_SCHEMA, encode=ENCODED_SCHEMA)
     
     # النتيجة
     logger.info("\n" + "="*80)
@@ -0,0 +1,94 @@
+# main_export.py - المرحلة الخامسة (اختيارية): تصدير المخزن العمودي
+# المهمة الوحيدة: استدعاء export_force_store() فقط (يتطلب numpy)
+
+import sys
+from pathlib import Path
+import logging
+from datetime import datetime
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from database.force_store import export_force_store
+from config.settings import NEW_DATABASE_PATH, FORCE_STORE_DIR, LOG_DIR
+
+
+# ============================================================
+# إعداد السجل
+# ============================================================
+
+def setup_logger():
+    """إعداد السجل الرئيسي"""
+    log_dir = Path(LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    
+    logger = logging.getLogger("main_export")
+    logger.setLevel(logging.DEBUG)
+    
+    # مسح المعالجات السابقة
+    logger.handlers.clear()
+    
+    # معالج الملف
+    log_file = log_dir / f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    
+    # معالج الكونسول
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    
+    # الصيغة
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+    
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    
+    return logger
+
+
+logger = setup_logger()
+
+
+# ============================================================
+# البرنامج الرئيسي
+# ============================================================
+
+def main():
+    """المرحلة الخامسة: تصدير جداول القوى إلى مخزن عمودي"""
+    
+    logger.info("\n" + "="*80)
+    logger.info("🚀 المرحلة الخامسة: تصدير المخزن العمودي (NumPy)")
+    logger.info("="*80)
+    
+    logger.info(f"\n📁 قاعدة البيانات: {NEW_DATABASE_PATH}")
+    logger.info(f"📁 المخزن: {FORCE_STORE_DIR}")
+    
+    # التحقق من وجود القاعدة
+    if not Path(NEW_DATABASE_PATH).exists():
+        logger.error(f"❌ لم يتم العثور على {NEW_DATABASE_PATH}")
+        logger.error("💡 الحل: شغّل main_create.py و main_import.py و main_link.py أولاً")
+        return 1
+    
+    try:
+        success = export_force_store(NEW_DATABASE_PATH, FORCE_STORE_DIR)
+    except ImportError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    
+    # النتيجة
+    logger.info("\n" + "="*80)
+    if success:
+        logger.info("✅ اكتملت المرحلة الخامسة بنجاح!")
+        logger.info("="*80 + "\n")
+        return 0
+    else:
+        logger.error("❌ فشلت المرحلة الخامسة!")
+        logger.info("="*80 + "\n")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -10,7 +10,9 @@ PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from database.importer import import_data
-from config.settings import VEDA_DATABASE_PATH, NEW_DATABASE_PATH, LOG_DIR
+from database.initializer import build_indexes
+from config.settings import (VEDA_DATABASE_PATH, NEW_DATABASE_PATH, LOG_DIR,
+                             IMPORT_MODE, IMPORT_WORKERS, IMPORT_EXECUTOR, IMPORT_FETCH_SIZE)
 
 
 # ============================================================
@@ -81,7 +83,13 @@ def main():
     logger.info("🔄 بدء الإدراج...")
     logger.info("-"*80 + "\n")
     
-    success = import_data(VEDA_DATABASE_PATH, NEW_DATABASE_PATH)
+    success = import_data(VEDA_DATABASE_PATH, NEW_DATABASE_PATH, profile="bulk_write",
+                          mode=IMPORT_MODE, workers=IMPORT_WORKERS, executor=IMPORT_EXECUTOR,
+                          fetch_size=IMPORT_FETCH_SIZE)
+    
+    # الفهارس بعد الإدراج (أسرع من تحديثها مع كل صف)
+    if success:
+        success = build_indexes(NEW_DATABASE_PATH)
     
     # النتيجة
     logger.info("\n" + "="*80)
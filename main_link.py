@@ -10,7 +10,8 @@ PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from database.linker import link_data
-from config.settings import NEW_DATABASE_PATH, LOG_DIR
+from database.derived_tables import build_derived_tables
+from config.settings import NEW_DATABASE_PATH, LOG_DIR, INCREMENTAL_ENVELOPES
 
 
 # ============================================================
@@ -75,17 +76,23 @@ def main():
     logger.info("🔗 بدء الربط...")
     logger.info("-"*80 + "\n")
     
-    success = link_data(NEW_DATABASE_PATH)
+    success = link_data(NEW_DATABASE_PATH, profile="bulk_write")
+    
+    # الجداول المشتقة (غلاف القوى) بعد اكتمال الربط
+    if success:
+        success = build_derived_tables(NEW_DATABASE_PATH, profile="bulk_write",
+                                       incremental=INCREMENTAL_ENVELOPES)
     
     # النتيجة
     logger.info("\n" + "="*80)
     if success:
         logger.info("✅ اكتملت المرحلة الثالثة بنجاح!")
-        logger.info("\n🎉 انتهت جميع المراحل!")
+        logger.info("\n🎉 انتهت مراحل البناء!")
         logger.info("\n📊 ملخص العملية:")
         logger.info("   1️⃣ المرحلة الأولى: إنشاء القاعدة الجديدة ✅")
         logger.info("   2️⃣ المرحلة الثانية: إدراج البيانات من VEDA ✅")
         logger.info("   3️⃣ المرحلة الثالثة: ربط البيانات ✅")
+        logger.info("\n💡 التالي: main_optimize.py (ANALYZE / VACUUM)")
         logger.info("="*80 + "\n")
         return 0
     else:
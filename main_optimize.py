@@ -0,0 +1,95 @@
+# main_optimize.py - المرحلة الرابعة: تحسين القاعدة (ANALYZE / VACUUM)
+# المهمة الوحيدة: استدعاء DatabaseOptimizer فقط
+
+import sys
+from pathlib import Path
+import logging
+from datetime import datetime
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from database.optimizer import DatabaseOptimizer
+from config.settings import NEW_DATABASE_PATH, LOG_DIR, OPTIMIZE_VACUUM, OPTIMIZE_PAGE_SIZE
+
+
+# ============================================================
+# إعداد السجل
+# ============================================================
+
+def setup_logger():
+    """إعداد السجل الرئيسي"""
+    log_dir = Path(LOG_DIR)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    
+    logger = logging.getLogger("main_optimize")
+    logger.setLevel(logging.DEBUG)
+    
+    # مسح المعالجات السابقة
+    logger.handlers.clear()
+    
+    # معالج الملف
+    log_file = log_dir / f"optimize_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    
+    # معالج الكونسول
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    
+    # الصيغة
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+    
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
+    
+    return logger
+
+
+logger = setup_logger()
+
+
+# ============================================================
+# البرنامج الرئيسي
+# ============================================================
+
+def main():
+    """المرحلة الرابعة: تحسين القاعدة"""
+    
+    logger.info("\n" + "="*80)
+    logger.info("🚀 المرحلة الرابعة: تحسين القاعدة (ANALYZE / VACUUM)")
+    logger.info("="*80)
+    
+    logger.info(f"\n📁 قاعدة البيانات: {NEW_DATABASE_PATH}")
+    
+    # التحقق من وجود القاعدة
+    if not Path(NEW_DATABASE_PATH).exists():
+        logger.error(f"❌ لم يتم العثور على {NEW_DATABASE_PATH}")
+        logger.error("💡 الحل: شغّل main_create.py و main_import.py و main_link.py أولاً")
+        return 1
+    
+    optimizer = DatabaseOptimizer(NEW_DATABASE_PATH, vacuum=OPTIMIZE_VACUUM,
+                                  page_size=OPTIMIZE_PAGE_SIZE)
+    success = optimizer.optimize()
+    
+    # القياس قبل/بعد
+    if success:
+        optimizer.print_metrics(logger)
+    
+    # النتيجة
+    logger.info("\n" + "="*80)
+    if success:
+        logger.info("✅ اكتملت المرحلة الرابعة بنجاح!")
+        logger.info("="*80 + "\n")
+        return 0
+    else:
+        logger.error("❌ فشلت المرحلة الرابعة!")
+        logger.info("="*80 + "\n")
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,158 @@
+"""
+===============================================================================
+services/material_service.py - حساب مقاومات المواد لجميع المواد دفعة واحدة
+===============================================================================
+"""
+
+import sqlite3
+from typing import Optional, Dict, Any
+import logging
+
+from config.default_values import CONCRETE_DEFAULTS, REBAR_DEFAULTS
+
+logger = logging.getLogger(__name__)
+
+
+# الجداول التي تعتمد عليها النتائج (لإلغاء أي نسخة محفوظة عند تعديلها)
+MATERIAL_STRENGTH_TABLES = (
+    "Material_Properties_Concrete_Data",
+    "Material_Properties_Concrete_LowerBound",
+    "Material_Properties_Rebar_Data",
+    "Material_Properties_Rebar_LowerBound",
+    "Genralinput",
+)
+
+
+class MaterialStrengthResolver:
+    """
+    حساب مقاومة الحد الأدنى (Lower Bound) والمتوقعة (Expected) لجميع المواد
+
+    بدلاً من استعلامين لكل مادة ولكل عمود (get_concrete_lower_bound و
+    get_rebar_lower_bound)، تُحسب جميع المواد باستعلام واحد لكل نوع:
+
+        lower_bound           = قيمة جدول LowerBound إن وُجدت وإلا Fc / Fy
+        expected              = lower_bound × λ  (λc للخرسانة، λs للحديد)
+        effective_lower_bound = κ × lower_bound
+        effective_expected    = κ × expected
+
+    حيث κ معامل المعرفة و λ معاملات Genralinput (ASCE 41-17 جدول 10-1).
+    """
+
+    def __init__(self, db_connection: sqlite3.Connection, input_id: int = 1):
+        """
+        تهيئة الخدمة
+
+        المعاملات:
+            db_connection: الاتصال بقاعدة البيانات (أي row_factory - الصفوف تُقرأ بالموضع)
+            input_id: معرف سجل Genralinput المستخدم للمعاملات
+        """
+        self.db = db_connection
+        self.input_id = input_id
+
+    def _execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """تنفيذ استعلام بمؤشر صفوفه tuple مهما كان row_factory الاتصال (مثل اتصالات المجمّع)"""
+        cursor = self.db.cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params)
+
+    def _table_exists(self, table_name: str) -> bool:
+        """التحقق من وجود جدول"""
+        row = self._execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table_name,)
+        ).fetchone()
+        return row is not None
+
+    def get_factors(self) -> Dict[str, float]:
+        """
+        معاملات κ و λc و λs من Genralinput (أو القيم الافتراضية)
+
+        المخرجات:
+            قاموس {knowledge_factor, lambda_c, lambda_s}
+        """
+        factors = {
+            'knowledge_factor': CONCRETE_DEFAULTS['knowledge_factor'],
+            'lambda_c': CONCRETE_DEFAULTS['lambda_c'],
+            'lambda_s': REBAR_DEFAULTS['lambda_s'],
+        }
+        try:
+            row = self._execute("""
+            SELECT Knowledge_Factor,
+                   Concrete_Strength_Factor_Lambda_c,
+                   Steel_Strength_Factor_Lambda_s
+            FROM Genralinput
+            WHERE id = ?
+            """, (self.input_id,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"تعذر قراءة Genralinput، استخدام القيم الافتراضية: {e}")
+            return factors
+
+        if row:
+            for key, value in zip(('knowledge_factor', 'lambda_c', 'lambda_s'), row):
+                if value:
+                    factors[key] = float(value)
+        return factors
+
+    def _resolve(self, data_table: str, lower_bound_table: str, strength_column: str,
+                 lower_bound_column: str, lambda_factor: float,
+                 knowledge_factor: float) -> Dict[Any, Dict[str, Any]]:
+        """حساب مقاومات جميع مواد جدول واحد باستعلام واحد"""
+        if self._table_exists(lower_bound_table):
+            query = f"""
+            SELECT d.ID, d.Material, d.{strength_column},
+                   COALESCE(NULLIF(lb.{lower_bound_column}, 0), d.{strength_column})
+            FROM {data_table} d
+            LEFT JOIN {lower_bound_table} lb ON lb.ID = d.ID
+            """
+        else:
+            query = f"""
+            SELECT ID, Material, {strength_column}, {strength_column}
+            FROM {data_table}
+            """
+
+        lookup = {}
+        for material_id, name, nominal, lower_bound in self._execute(query):
+            if lower_bound is None:
+                continue
+            lower_bound = float(lower_bound)
+            expected = lower_bound * lambda_factor
+            entry = {
+                'id': material_id,
+                'name': name,
+                'nominal': float(nominal) if nominal is not None else None,
+                'lower_bound': lower_bound,
+                'expected': expected,
+                'effective_lower_bound': knowledge_factor * lower_bound,
+                'effective_expected': knowledge_factor * expected,
+            }
+            lookup[material_id] = entry
+            if name is not None:
+                lookup[name] = entry
+        return lookup
+
+    def resolve_all(self) -> Optional[Dict[str, Any]]:
+        """
+        حساب مقاومات جميع مواد الخرسانة والحديد
+
+        المخرجات:
+            قاموس {factors, concrete, rebar} حيث concrete و rebar
+            مفهرسة بمعرف المادة واسمها معاً، أو None عند الخطأ
+        """
+        try:
+            factors = self.get_factors()
+            concrete = self._resolve(
+                "Material_Properties_Concrete_Data", "Material_Properties_Concrete_LowerBound",
+                "Fc", "Fc_LB", factors['lambda_c'], factors['knowledge_factor']
+            )
+            rebar = self._resolve(
+                "Material_Properties_Rebar_Data", "Material_Properties_Rebar_LowerBound",
+                "Fy", "Fy_LB", factors['lambda_s'], factors['knowledge_factor']
+            )
+            return {
+                'factors': factors,
+                'concrete': concrete,
+                'rebar': rebar,
+            }
+        except Exception as e:
+            logger.error(f"خطأ في حساب مقاومات المواد: {e}")
+            return None
@@ -0,0 +1,212 @@
+# database/optimizer.py - تحسين القاعدة بعد الإدراج والربط
+# المهمة الوحيدة: ANALYZE و PRAGMA optimize و VACUUM INTO (مع حجم صفحة اختياري) وقياس الأثر
+
+import os
+import time
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# استعلامات القياس (قبل/بعد)
+# ============================================================
+# استعلام يفشل (جدول غير موجود) يُسجل زمنه None
+
+BENCHMARK_QUERIES = {
+    "max_moment_per_column": """
+        SELECT Story, "Column", MAX(ABS(M3)), MAX(ABS(M2))
+        FROM Element_Forces_Columns
+        GROUP BY Story, "Column"
+    """,
+    "story_filter": """
+        SELECT * FROM Element_Forces_Columns
+        WHERE Story = (SELECT MIN(Story) FROM Element_Forces_Columns)
+    """,
+    "forces_with_combination": """
+        SELECT f.Story, f."Column", l.Name, l.Type, f.P, f.M3
+        FROM Element_Forces_Columns f
+        JOIN Load_Combination_Definitions l ON l.ID = f.Load_case_id
+        WHERE f.Story = (SELECT MIN(Story) FROM Element_Forces_Columns)
+    """,
+    "forces_with_connectivity": """
+        SELECT c.Story, c.ColumnBay, c.Length, MAX(ABS(f.P))
+        FROM Column_Object_Connectivity c
+        JOIN Element_Forces_Columns f ON f.Unique_Name = c.Unique_Name
+        GROUP BY c.Unique_Name
+    """,
+}
+
+BENCHMARK_REPEATS = 3
+VALID_PAGE_SIZES = (512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+# ============================================================
+# فئة التحسين
+# ============================================================
+
+class DatabaseOptimizer:
+    """فئة متخصصة لتحسين القاعدة بعد اكتمال الإدراج والربط"""
+
+    def __init__(self, db_path: str, vacuum: bool = True, page_size: int = None):
+        if page_size is not None and page_size not in VALID_PAGE_SIZES:
+            raise ValueError(f"حجم صفحة غير صالح: {page_size} (المتاح: {VALID_PAGE_SIZES})")
+        self.db_path = db_path
+        self.vacuum = vacuum
+        self.page_size = page_size
+        self.conn = None
+        self.metrics = {}
+
+    def connect(self) -> bool:
+        """الاتصال بقاعدة البيانات"""
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            logger.info(f"✅ اتصال قاعدة البيانات: {self.db_path}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ فشل الاتصال: {e}")
+            return False
+
+    # ════════════════════════════════════════════════════════════════
+    # القياس
+    # ════════════════════════════════════════════════════════════════
+
+    def _time_query(self, query: str) -> Optional[float]:
+        """أفضل زمن (ثانية) من عدة تكرارات، None إذا فشل الاستعلام"""
+        best = None
+        for _ in range(BENCHMARK_REPEATS):
+            start = time.perf_counter()
+            try:
+                self.conn.execute(query).fetchall()
+            except sqlite3.Error:
+                return None
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def measure(self) -> dict:
+        """
+        حجم الملف وإحصائيات الصفحات وزمن استعلامات القياس
+
+        Returns:
+            {"file_size", "page_size", "page_count", "freelist_count", "queries": {name: seconds}}
+        """
+        return {
+            "file_size": Path(self.db_path).stat().st_size,
+            "page_size": self.conn.execute("PRAGMA page_size").fetchone()[0],
+            "page_count": self.conn.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_count": self.conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "queries": {name: self._time_query(query) for name, query in BENCHMARK_QUERIES.items()},
+        }
+
+    # ════════════════════════════════════════════════════════════════
+    # الخطوات
+    # ════════════════════════════════════════════════════════════════
+
+    def analyze(self):
+        """ANALYZE ثم PRAGMA optimize (إحصائيات المخطط للاستعلامات متعددة الجداول)"""
+        self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA optimize")
+        self.conn.commit()
+        stats = self.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0]
+        logger.info(f"   ✅ ANALYZE: {stats} إحصائية في sqlite_stat1")
+
+    def vacuum_into(self):
+        """
+        VACUUM INTO ملف مؤقت ثم استبدال القاعدة به
+
+        يزيل التجزئة والصفحات الفارغة ويطبق page_size إذا حُدد.
+        """
+        tmp_path = f"{self.db_path}.vacuum"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        # دمج WAL في الملف الرئيسي قبل النسخ
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if self.page_size:
+            self.conn.execute(f"PRAGMA page_size = {self.page_size}")
+        self.conn.execute("VACUUM INTO ?", (tmp_path,))
+        self.conn.close()
+
+        # ملفات WAL/SHM القديمة لا تخص الملف الجديد
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+        os.replace(tmp_path, self.db_path)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA optimize")
+        logger.info(f"   ✅ VACUUM INTO (page_size = {self.page_size or 'كما هو'})")
+
+    def optimize(self) -> bool:
+        """تشغيل جميع خطوات التحسين مع القياس قبل/بعد"""
+        try:
+            if not self.connect():
+                return False
+
+            logger.info("\n" + "="*70)
+            logger.info("⚡ تحسين القاعدة...")
+            logger.info("="*70)
+
+            self.metrics["before"] = self.measure()
+            self.analyze()
+            if self.vacuum:
+                self.vacuum_into()
+            self.metrics["after"] = self.measure()
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ خطأ في التحسين: {e}")
+            return False
+
+        finally:
+            self.close()
+
+    def print_metrics(self, log: logging.Logger = None):
+        """طباعة المقارنة قبل/بعد (في log أو سجل الوحدة)"""
+        log = log or logger
+        before, after = self.metrics["before"], self.metrics["after"]
+
+        def fmt(seconds):
+            return "—" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+        log.info(f"\n{'':<28}{'قبل':>14}{'بعد':>14}")
+        log.info(f"{'file_size':<28}{before['file_size'] / 1024:>11.0f} KB{after['file_size'] / 1024:>11.0f} KB")
+        for key in ("page_size", "page_count", "freelist_count"):
+            log.info(f"{key:<28}{before[key]:>14}{after[key]:>14}")
+        for name in BENCHMARK_QUERIES:
+            log.info(f"{name:<28}{fmt(before['queries'][name]):>14}{fmt(after['queries'][name]):>14}")
+
+    def close(self):
+        """إغلاق الاتصال"""
+        try:
+            if self.conn:
+                self.conn.close()
+        except Exception as e:
+            logger.error(f"❌ خطأ في الإغلاق: {e}")
+
+
+# ============================================================
+# دالة عامة للتحسين
+# ============================================================
+
+def optimize_database(db_path: str, vacuum: bool = True, page_size: int = None) -> bool:
+    """
+    دالة سريعة لتحسين القاعدة
+
+    Args:
+        db_path: مسار قاعدة البيانات
+        vacuum: إعادة بناء الملف عبر VACUUM INTO
+        page_size: حجم الصفحة الجديد (None = بدون تغيير، يتطلب vacuum)
+
+    Returns:
+        bool: True إذا نجح، False إذا فشل
+    """
+    optimizer = DatabaseOptimizer(db_path, vacuum=vacuum, page_size=page_size)
+    success = optimizer.optimize()
+    if success:
+        optimizer.print_metrics()
+    return success
@@ -0,0 +1,269 @@
+# database/parallel_import.py - جدولة الإدراج المتوازي
+# المهمة الوحيدة: قراءة الجداول وتحويلها بالتوازي مع كاتب واحد يلتزم بترتيب التبعيات
+#
+# القراءة والتحويل في خيوط أو عمليات عمل (اتصال مستقل للقراءة فقط لكل مهمة)،
+# والكتابة في الخيط الحالي فقط (SQLite يسمح بكاتب واحد) بترتيب يحترم المفاتيح الخارجية.
+# عدد المهام المرسلة قبل الكاتب محدود (workers * READ_AHEAD) حتى لا تتراكم الجداول في الذاكرة.
+# وضع التدفق (stream): العامل يمرر الجدول دفعة دفعة عبر طابور محدود (STREAM_QUEUE_SIZE)
+# فالذاكرة محدودة بالدفعات لا بحجم الجدول.
+
+import time
+import multiprocessing
+from queue import Queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Set
+
+from config.settings import IMPORT_WORKERS, IMPORT_EXECUTOR
+from database.schema import parse_foreign_keys
+
+
+# ============================================================
+# الإعدادات
+# ============================================================
+# thread: خيوط (بدون نسخ الصفوف بين العمليات - التحويل في Python محكوم بالـ GIL)
+# process: عمليات (تحويل متوازٍ فعلاً - الصفوف تُنقل للكاتب عبر pickle)
+
+EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+# عدد الجداول المقروءة مسبقاً لكل عامل قبل أن يصل إليها الكاتب
+READ_AHEAD = 2
+
+# عدد الدفعات المنتظرة في طابور كل جدول (وضع التدفق) قبل أن يتوقف عامله
+STREAM_QUEUE_SIZE = 2
+
+# جدول واحد: read(*args) تعمل في العامل وتعيد ما يُمرر إلى الكاتب
+# (read = None: لا قراءة - الكاتب يتولى الجدول بنفسه، مثل INSERT ... SELECT)
+ImportTask = namedtuple("ImportTask", ["name", "read", "args"])
+
+
+# ============================================================
+# ترتيب التبعيات
+# ============================================================
+
+def get_import_parents(tables: List[str], foreign_keys: list = None) -> Dict[str, Set[str]]:
+    """
+    الجداول الأب لكل جدول (حسب مفاتيح ALTER_TABLES_SQL، ضمن tables فقط)
+
+    Args:
+        tables: أسماء الجداول
+        foreign_keys: مخرجات parse_foreign_keys (الافتراضي: مفاتيح المخطط)
+
+    Returns:
+        {الجدول: {الجداول التي يجب كتابتها قبله}}
+    """
+    if foreign_keys is None:
+        foreign_keys = parse_foreign_keys()
+
+    names = set(tables)
+    parents = {table: set() for table in tables}
+    for fk in foreign_keys:
+        if fk["table"] in names and fk["ref_table"] in names and fk["table"] != fk["ref_table"]:
+            parents[fk["table"]].add(fk["ref_table"])
+    return parents
+
+
+def get_import_order(tables: List[str], foreign_keys: list = None) -> List[str]:
+    """
+    ترتيب الجداول بحيث يُكتب الجدول الأب قبل الابن
+
+    الترتيب الأصلي محفوظ قدر الإمكان؛ الجداول في حلقة تبعيات تُكتب بترتيبها الأصلي.
+
+    Args:
+        tables: أسماء الجداول بالترتيب الأصلي
+        foreign_keys: مخرجات parse_foreign_keys (الافتراضي: مفاتيح المخطط)
+
+    Returns:
+        الجداول مرتبة
+    """
+    parents = get_import_parents(tables, foreign_keys)
+
+    ordered = []
+    pending = list(tables)
+    while pending:
+        done = set(ordered)
+        table = next((t for t in pending if parents[t] <= done), pending[0])
+        ordered.append(table)
+        pending.remove(table)
+    return ordered
+
+
+# ============================================================
+# الجدولة
+# ============================================================
+
+def _timed_read(read: Callable, args: tuple):
+    """تنفيذ دالة القراءة في العامل مع قياس زمنها"""
+    start = time.perf_counter()
+    result = read(*args)
+    return result, time.perf_counter() - start
+
+
+class ReadFailed(Exception):
+    """فشل القراءة في العامل أثناء التدفق (يصل إلى الكاتب عبر الطابور)"""
+
+
+def _stream_read(read: Callable, args: tuple, chunks) -> float:
+    """
+    تنفيذ دالة قراءة تعيد دفعات في العامل ووضعها في الطابور (None = النهاية)
+
+    Returns:
+        زمن القراءة في العامل (يشمل انتظار الطابور الممتلئ)
+    """
+    start = time.perf_counter()
+    try:
+        for chunk in read(*args):
+            chunks.put(chunk)
+        chunks.put(None)
+    except Exception as e:
+        chunks.put(ReadFailed(str(e)))
+    return time.perf_counter() - start
+
+
+class _ChunkStream:
+    """دفعات جدول من طابور العامل (فشل القراءة يُرفع ReadFailed ويُحفظ في error)"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.error = None
+        self.finished = False
+
+    def __iter__(self):
+        while not self.finished:
+            chunk = self.chunks.get()
+            if chunk is None or isinstance(chunk, ReadFailed):
+                self.finished = True
+                if chunk is not None:
+                    self.error = str(chunk)
+                    raise chunk
+                return
+            yield chunk
+
+    def drain(self):
+        """استهلاك ما تبقى (الكاتب توقف مبكراً) حتى لا يبقى العامل معلقاً على طابور ممتلئ"""
+        try:
+            for _ in self:
+                pass
+        except ReadFailed:
+            pass
+
+
+def run_parallel_import(tasks: List[ImportTask], write: Callable,
+                        workers: int = IMPORT_WORKERS,
+                        executor: str = IMPORT_EXECUTOR,
+                        foreign_keys: list = None,
+                        stream: bool = False) -> Dict[str, dict]:
+    """
+    قراءة المهام بالتوازي وكتابتها في الخيط الحالي
+
+    يكتب الكاتب أول جدول جاهز (انتهت قراءته وكُتبت جداوله الأب) حسب ترتيب المهام،
+    فلا ينتظر جدولاً كبيراً إذا كان ما بعده جاهزاً ولا يعتمد عليه.
+    التبعية على جدول يأتي لاحقاً في tasks (حلقة) تُهمل - ترتيب المهام هو المرجع.
+    فشل قراءة جدول لا يوقف الباقي: يُسجل في التوقيت (error) ولا تُستدعى write له.
+
+    في وضع التدفق تعيد read دفعات (مولد) وتتلقى write مكرراً عليها يُستهلك أثناء القراءة؛
+    الكاتب يكتب الجداول بترتيب المهام، وفشل القراءة يُرفع ReadFailed أثناء الاستهلاك
+    (ويُسجل في التوقيت أيضاً). الذاكرة: workers * (STREAM_QUEUE_SIZE + 1) دفعة على الأكثر.
+
+    Args:
+        tasks: المهام مرتبة (انظر get_import_order)
+        write: دالة (الاسم، نتيجة read أو None) تُستدعى مرة لكل جدول
+        workers: عدد العمال
+        executor: "thread" أو "process" (في process يجب أن تكون read دالة على مستوى الوحدة)
+        foreign_keys: مخرجات parse_foreign_keys (الافتراضي: مفاتيح المخطط)
+        stream: read تعيد دفعات تُمرر إلى write عبر طابور محدود
+
+    Returns:
+        {الاسم: {"read": ث في العامل، "wait": ث انتظار الكاتب، "write": ث، "error": نص أو None}}
+        بترتيب الكتابة الفعلي
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"نوع عمال غير معروف: {executor} (المتاح: {', '.join(EXECUTORS)})")
+
+    names = [task.name for task in tasks]
+    parents = get_import_parents(names, foreign_keys)
+    for index, name in enumerate(names):
+        parents[name] &= set(names[:index])
+
+    workers = max(workers, 1)
+    window = workers * READ_AHEAD
+    timings = {}
+    futures = {}
+    streams = {}
+    pending = list(range(len(tasks)))
+    submitted = 0
+    written = set()
+
+    # طوابير العمليات تمر عبر Manager (طابور الخيوط لا ينتقل بين العمليات)
+    manager = multiprocessing.Manager() if stream and executor == "process" else None
+
+    def is_ready(index):
+        task = tasks[index]
+        if index >= submitted or not parents[task.name] <= written:
+            return False
+        # التدفق: الكتابة تبدأ مع أول دفعة (أول مهمة معلقة جاهزة دائماً - آباؤها قبلها)
+        return task.read is None or stream or futures[index].done()
+
+    pool = EXECUTORS[executor](max_workers=workers)
+    wait_start = time.perf_counter()
+    try:
+        while pending:
+            # إرسال المهام التالية حتى حد القراءة المسبقة
+            while submitted < len(tasks) and len(futures) < window:
+                task = tasks[submitted]
+                if task.read is not None and stream:
+                    chunks = manager.Queue(STREAM_QUEUE_SIZE) if manager else Queue(STREAM_QUEUE_SIZE)
+                    streams[submitted] = _ChunkStream(chunks)
+                    futures[submitted] = pool.submit(_stream_read, task.read, task.args, chunks)
+                elif task.read is not None:
+                    futures[submitted] = pool.submit(_timed_read, task.read, task.args)
+                submitted += 1
+
+            index = next((i for i in pending if is_ready(i)), None)
+            if index is None:
+                wait([futures[i] for i in pending if i in futures], return_when=FIRST_COMPLETED)
+                continue
+
+            task = tasks[index]
+            pending.remove(index)
+            written.add(task.name)
+            timing = {"read": 0.0, "wait": time.perf_counter() - wait_start, "write": 0.0, "error": None}
+            timings[task.name] = timing
+
+            result = None
+            if task.read is not None and stream:
+                result = streams[index]
+            elif task.read is not None:
+                try:
+                    result, timing["read"] = futures.pop(index).result()
+                except Exception as e:
+                    timing["error"] = str(e)
+                    wait_start = time.perf_counter()
+                    continue
+
+            start = time.perf_counter()
+            try:
+                write(task.name, result)
+            finally:
+                if task.read is not None and stream:
+                    stream_result = streams.pop(index)
+                    stream_result.drain()
+                    timing["read"] = futures.pop(index).result()
+                    timing["error"] = stream_result.error
+            timing["write"] = time.perf_counter() - start
+            wait_start = time.perf_counter()
+    except BaseException:
+        # الكاتب فشل: إلغاء ما لم يبدأ وتفريغ طوابير العمال الجارية حتى يُغلق المنفذ
+        for index, future in futures.items():
+            if not future.cancel() and index in streams:
+                streams[index].drain()
+        raise
+    finally:
+        pool.shutdown()
+        if manager:
+            manager.shutdown()
+
+    return timings
@@ -8,21 +8,52 @@ import sqlite3
 from typing import Optional, List, Dict, Any
 import logging
 
+from config.connection_settings import apply_connection_profile
+from services.connection_service import ConnectionPool, pooled
+from utils.query_stats import QueryStats
+
 logger = logging.getLogger(__name__)
 
 class QueryService:
     """خدمات الاستعلام عن البيانات من القاعدة الجديدة"""
     
-    def __init__(self, db_connection: sqlite3.Connection):
+    def __init__(self, db_connection: sqlite3.Connection = None, profile: str = None,
+                 pool: ConnectionPool = None, query_stats: QueryStats = None):
         """
         تهيئة خدمة الاستعلام
         
         المعاملات:
             db_connection: الاتصال بقاعدة البيانات
+            profile: ملف الاتصال (مثل "read_heavy") - None بدون تعديل
+            pool: مجمّع اتصالات بدلاً من db_connection (للاستخدام من عدة خيوط)
+            query_stats: QueryStats لقياس زمن الاستعلامات (مع pool يُستخدم query_stats المجمّع)
         """
+        if (db_connection is None) == (pool is None):
+            raise ValueError("يجب تمرير db_connection أو pool (أحدهما فقط)")
+        
+        self.pool = pool
         self.db = db_connection
-        self.cursor = db_connection.cursor()
+        self.query_stats = query_stats if pool is None else pool.query_stats
+        self._cursor = None
+        if db_connection is not None:
+            apply_connection_profile(db_connection, profile)
+            self._cursor = self._new_cursor(db_connection)
+    
+    @property
+    def cursor(self) -> Optional[sqlite3.Cursor]:
+        """مؤشر الاتصال المباشر، أو مؤشر اتصال الخيط الحالي من المجمّع"""
+        if self.pool is None:
+            return self._cursor
+        return self.pool.current_cursor()
+    
+    def _new_cursor(self, connection: sqlite3.Connection = None):
+        """مؤشر مستقل (مُقاس إذا وُجد query_stats)"""
+        cursor = (connection or self.cursor.connection).cursor()
+        if self.query_stats is not None:
+            cursor = self.query_stats.wrap_cursor(cursor)
+        return cursor
     
+    @pooled
     def get_story_by_name(self, story_name: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على بيانات الطابق من Story_Definitions
@@ -54,6 +85,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على بيانات الطابق: {e}")
             return None
     
+    @pooled
     def get_all_stories(self) -> List[Dict[str, Any]]:
         """
         الحصول على جميع الطوابق
@@ -82,6 +114,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على قائمة الطوابق: {e}")
             return []
     
+    @pooled
     def get_column_by_name(self, column_name: str, story_name: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على بيانات العمود من Frame_Assignments_Section_Properties
@@ -121,6 +154,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على بيانات العمود: {e}")
             return None
     
+    @pooled
     def get_column_connectivity(self, column_unique_name: int) -> Optional[Dict[str, Any]]:
         """
         الحصول على بيانات اتصال العمود من Column_Object_Connectivity
@@ -159,6 +193,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على اتصال العمود: {e}")
             return None
     
+    @pooled
     def get_section_property(self, section_name: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على بيانات المقطع من Frame_Section_Property_Definitions_Concrete_Rectangular
@@ -198,6 +233,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على بيانات المقطع: {e}")
             return None
     
+    @pooled
     def get_load_combination(self, load_name: str) -> Optional[Dict[str, Any]]:
         """
         الحصول على بيانات تركيبة الأحمال من Load_Combination_Definitions
@@ -235,6 +271,7 @@ class QueryService:
             logger.error(f"خطأ في الحصول على تركيبة الأحمال: {e}")
             return None
     
+    @pooled
     def search_columns(self, story_name: str, search_term: str = None) -> List[Dict[str, Any]]:
         """
         البحث عن الأعمدة في طابق معين
@@ -290,7 +327,7 @@ class QueryService:
             return []
     
     def close(self):
-        """إغلاق الاتصال بالقاعدة"""
-        if self.cursor:
-            self.cursor.close()
+        """إغلاق الاتصال بالقاعدة (المجمّع يُغلق من مالكه)"""
+        if self._cursor:
+            self._cursor.close()
         logger.debug("تم إغلاق اتصال QueryService")
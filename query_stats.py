@@ -0,0 +1,333 @@
+# utils/query_stats.py - قياس زمن الاستعلامات وسجل الاستعلامات البطيئة
+# المهمة الوحيدة: تجميع إحصائيات كل استعلام (حسب صيغته الموحدة) بدون تغيير نتائجه
+
+import re
+import json
+import time
+import atexit
+import logging
+import threading
+import weakref
+from collections import deque
+from pathlib import Path
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# الثوابت
+# ============================================================
+
+# عدد الأزمنة المحفوظة لكل استعلام لحساب p95
+LATENCY_SAMPLES = 1000
+
+# الحد الأقصى لسجلات الاستعلامات البطيئة المحفوظة
+MAX_SLOW_QUERIES = 200
+
+DEFAULT_DUMP_PATH = Path("logs") / "query_stats.json"
+
+
+# ============================================================
+# توحيد نص الاستعلام
+# ============================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    توحيد نص الاستعلام ليصبح مفتاحاً ثابتاً
+
+    - دمج المسافات والأسطر
+    - استبدال النصوص والأرقام الثابتة بـ ?
+    - دمج قوائم IN (?, ?, ...) بأي طول إلى (?...)
+
+    Args:
+        sql: نص الاستعلام
+
+    Returns:
+        النص الموحد
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+# ============================================================
+# فئة الإحصائيات
+# ============================================================
+
+class QueryStats:
+    """
+    إحصائيات الاستعلامات داخل العملية
+
+    لكل استعلام موحد: عدد الاستدعاءات، الزمن الكلي، p95، أقصى زمن،
+    وعدد الصفوف المعادة. الاستعلامات التي تتجاوز slow_threshold_ms
+    تُسجَّل مع خطة التنفيذ (EXPLAIN QUERY PLAN).
+    """
+
+    def __init__(self, slow_threshold_ms: float = None, dump_path: str = None):
+        """
+        Args:
+            slow_threshold_ms: حد الاستعلام البطيء بالميلي ثانية (None = بدون سجل)
+            dump_path: مسار ملف JSON يُكتب عند إنهاء البرنامج (None = بدون كتابة)
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.dump_path = dump_path
+        self.statements: Dict[str, Dict[str, Any]] = {}
+        self.slow_queries = deque(maxlen=MAX_SLOW_QUERIES)
+        self._lock = threading.Lock()
+        self._cursors = weakref.WeakSet()
+
+        if dump_path:
+            atexit.register(self.dump_json, dump_path)
+
+    def wrap_cursor(self, cursor):
+        """تغليف مؤشر SQLite لقياس استعلاماته"""
+        if isinstance(cursor, InstrumentedCursor):
+            return cursor
+        wrapped = InstrumentedCursor(cursor, self)
+        with self._lock:
+            self._cursors.add(wrapped)
+        return wrapped
+
+    def flush(self):
+        """تسجيل الاستعلامات المعلقة (مثل fetchone لصف واحد) في المؤشرات المفتوحة"""
+        with self._lock:
+            cursors = list(self._cursors)
+        for cursor in cursors:
+            cursor._finish()
+
+    def record(self, sql: str, elapsed: float, rows: int,
+               connection=None, params=None):
+        """
+        تسجيل تنفيذ استعلام واحد
+
+        Args:
+            sql: نص الاستعلام الأصلي
+            elapsed: الزمن الكلي (execute + fetch) بالثواني
+            rows: عدد الصفوف المعادة
+            connection: الاتصال (لجلب خطة التنفيذ للاستعلام البطيء)
+            params: معاملات الاستعلام
+        """
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = {
+                    'count': 0,
+                    'total_time': 0.0,
+                    'max_time': 0.0,
+                    'rows': 0,
+                    'samples': deque(maxlen=LATENCY_SAMPLES),
+                    'plan': None,
+                }
+                self.statements[key] = entry
+            entry['count'] += 1
+            entry['total_time'] += elapsed
+            entry['max_time'] = max(entry['max_time'], elapsed)
+            entry['rows'] += rows
+            entry['samples'].append(elapsed)
+
+        elapsed_ms = elapsed * 1000
+        if self.slow_threshold_ms is None or elapsed_ms < self.slow_threshold_ms:
+            return
+
+        plan = self._explain(connection, sql, params)
+        with self._lock:
+            entry['plan'] = plan
+            self.slow_queries.append({
+                'sql': key,
+                'time_ms': round(elapsed_ms, 3),
+                'rows': rows,
+                'plan': plan,
+                'at': datetime.now().isoformat(timespec='seconds'),
+            })
+        logger.warning(f"🐢 استعلام بطيء ({elapsed_ms:.1f} ms): {key[:120]}")
+
+    @staticmethod
+    def _explain(connection, sql: str, params) -> Optional[List[str]]:
+        """جلب خطة التنفيذ (EXPLAIN QUERY PLAN) لاستعلام قراءة"""
+        if connection is None or not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        try:
+            rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+            return [row[3] for row in rows]
+        except Exception as e:
+            logger.debug(f"تعذر جلب خطة التنفيذ: {e}")
+            return None
+
+    # ════════════════════════════════════════════════════════════════
+    # التقارير
+    # ════════════════════════════════════════════════════════════════
+
+    def snapshot(self, top: int = None) -> List[Dict[str, Any]]:
+        """
+        ملخص الإحصائيات مرتباً حسب الزمن الكلي (الأعلى أولاً)
+
+        Args:
+            top: عدد الاستعلامات المعادة (None = الكل)
+
+        Returns:
+            قائمة قواميس {sql, count, total_ms, avg_ms, p95_ms, max_ms, rows, plan}
+        """
+        self.flush()
+        with self._lock:
+            items = [(key, dict(entry, samples=list(entry['samples'])))
+                     for key, entry in self.statements.items()]
+
+        report = []
+        for key, entry in items:
+            samples = sorted(entry['samples'])
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+            report.append({
+                'sql': key,
+                'count': entry['count'],
+                'total_ms': round(entry['total_time'] * 1000, 3),
+                'avg_ms': round(entry['total_time'] * 1000 / entry['count'], 3),
+                'p95_ms': round(p95 * 1000, 3),
+                'max_ms': round(entry['max_time'] * 1000, 3),
+                'rows': entry['rows'],
+                'plan': entry['plan'],
+            })
+
+        report.sort(key=lambda item: item['total_ms'], reverse=True)
+        return report[:top] if top else report
+
+    def to_dict(self) -> Dict[str, Any]:
+        """تحويل إلى قاموس"""
+        statements = self.snapshot()
+        with self._lock:
+            slow = list(self.slow_queries)
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'slow_threshold_ms': self.slow_threshold_ms,
+            'statements': statements,
+            'slow_queries': slow,
+        }
+
+    def dump_json(self, path: str = None) -> Optional[Path]:
+        """
+        كتابة الإحصائيات في ملف JSON
+
+        Args:
+            path: مسار الملف (الافتراضي logs/query_stats.json)
+
+        Returns:
+            مسار الملف أو None عند الفشل
+        """
+        path = Path(path or self.dump_path or DEFAULT_DUMP_PATH)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            return path
+        except Exception as e:
+            logger.error(f"❌ فشل حفظ إحصائيات الاستعلامات: {e}")
+            return None
+
+    def reset(self):
+        """مسح جميع الإحصائيات"""
+        self.flush()
+        with self._lock:
+            self.statements.clear()
+            self.slow_queries.clear()
+
+
+# ============================================================
+# المؤشر المُقاس
+# ============================================================
+
+class InstrumentedCursor:
+    """
+    غلاف لمؤشر SQLite يقيس زمن كل استعلام وعدد صفوفه
+
+    الزمن يشمل execute وجميع عمليات fetch التالية (SQLite ينفذ الاستعلام
+    تدريجياً أثناء القراءة)، ويُسجَّل عند انتهاء القراءة أو تنفيذ استعلام
+    جديد أو إغلاق المؤشر.
+    """
+
+    def __init__(self, cursor, stats: QueryStats):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_pending', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # مثل row_factory
+        setattr(self._cursor, name, value)
+
+    def _start(self, sql: str, params, elapsed: float):
+        self._finish()
+        object.__setattr__(self, '_pending', [sql, params, elapsed, 0])
+
+    def _add(self, elapsed: float, rows: int, done: bool):
+        pending = self._pending
+        if pending is None:
+            return
+        pending[2] += elapsed
+        pending[3] += rows
+        if done:
+            self._finish()
+
+    def _finish(self):
+        pending = self._pending
+        if pending is None:
+            return
+        object.__setattr__(self, '_pending', None)
+        sql, params, elapsed, rows = pending
+        self._stats.record(sql, elapsed, rows, self._cursor.connection, params)
+
+    def execute(self, sql: str, params=()):
+        start = time.perf_counter()
+        self._cursor.execute(sql, params)
+        self._start(sql, params, time.perf_counter() - start)
+        if self._cursor.description is None:
+            # INSERT/UPDATE/DELETE: لا توجد صفوف للقراءة
+            self._add(0.0, 0, done=True)
+        return self
+
+    def executemany(self, sql: str, seq_of_params):
+        start = time.perf_counter()
+        self._cursor.executemany(sql, seq_of_params)
+        self._start(sql, None, time.perf_counter() - start)
+        self._add(0.0, 0, done=True)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._add(time.perf_counter() - start, 0 if row is None else 1, done=row is None)
+        return row
+
+    def fetchmany(self, size: int = None):
+        start = time.perf_counter()
+        size = self._cursor.arraysize if size is None else size
+        rows = self._cursor.fetchmany(size)
+        self._add(time.perf_counter() - start, len(rows), done=len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._add(time.perf_counter() - start, len(rows), done=True)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
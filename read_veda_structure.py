@@ -9,6 +9,7 @@ python read_veda_structure.py
 
 import sqlite3
 from pathlib import Path
+from database.schema_catalog import get_schema_catalog
 
 # المسار المباشر
 VEDA_PATH = r"C:\Users\Huthefh\Desktop\Check\data\project.veda"
@@ -53,9 +54,9 @@ def scan_all_tables(db_path: str):
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        # الحصول على قائمة الجداول
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        # الحصول على قائمة الجداول (من الذاكرة المؤقتة إن لم يتغير الملف)
+        catalog = get_schema_catalog(db_path, conn)
+        tables = catalog.table_names()
         
         print(f"\n{'='*100}")
         print(f"جميع جداول VEDA ({len(tables)} جدول)")
@@ -63,10 +64,9 @@ def scan_all_tables(db_path: str):
         
         for table in sorted(tables):
             try:
-                cursor.execute(f"SELECT * FROM [{table}]")
-                rows = cursor.fetchall()
-                col_count = len(cursor.description)
-                row_count = len(rows)
+                cursor.execute(f"SELECT COUNT(*) FROM [{table}]")
+                row_count = cursor.fetchone()[0]
+                col_count = len(catalog.columns(table))
                 print(f"✓ {table:60s} | صفوف: {row_count:10d} | أعمدة: {col_count}")
             except Exception as e:
                 print(f"✗ {table:60s} | خطأ: {e}")
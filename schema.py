@@ -2,6 +2,11 @@
 # هذا الملف يحتوي على CREATE TABLE و ALTER TABLE فقط
 # بدون أي معلومات من VEDA
 
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
 # قائمة جميع جداول الهيكل الجديد
 NEW_TABLES = [
     "Story_Definitions",
@@ -14,6 +19,8 @@ NEW_TABLES = [
     "Frame_Assignments_Section_Properties",
     "Load_Combination_Definitions",
     "Element_Forces_Columns",
+    "Element_Forces_Beams",
+    "Pier_Forces",
     "Genralinput"
 ]
 
@@ -184,6 +191,42 @@ CREATE TABLE IF NOT EXISTS `Element_Forces_Columns` (
 	PRIMARY KEY(`ID`)
 );
 
+CREATE TABLE IF NOT EXISTS `Element_Forces_Beams` (
+	`ID` INT NOT NULL AUTO_INCREMENT,
+	`Story` VARCHAR(255),
+	`Beam` VARCHAR(255),
+	`Unique_Name` INT,
+	`Output_Case` VARCHAR(255),
+	`Case_Type` VARCHAR(255),
+	`Station` FLOAT,
+	`P` FLOAT,
+	`V2` FLOAT,
+	`V3` FLOAT,
+	`T` FLOAT,
+	`M2` FLOAT,
+	`M3` FLOAT,
+	`Element` VARCHAR(255),
+	`Elem_Station` FLOAT,
+	`Location` VARCHAR(255),
+	PRIMARY KEY(`ID`)
+);
+
+CREATE TABLE IF NOT EXISTS `Pier_Forces` (
+	`ID` INT NOT NULL AUTO_INCREMENT,
+	`Story` VARCHAR(255),
+	`Pier` VARCHAR(255),
+	`Output_Case` VARCHAR(255),
+	`Case_Type` VARCHAR(255),
+	`Location` VARCHAR(255),
+	`P` FLOAT,
+	`V2` FLOAT,
+	`V3` FLOAT,
+	`T` FLOAT,
+	`M2` FLOAT,
+	`M3` FLOAT,
+	PRIMARY KEY(`ID`)
+);
+
 CREATE TABLE IF NOT EXISTS `Genralinput` (
 	`id` INT NOT NULL AUTO_INCREMENT UNIQUE,
 	`Knowledge_Factor` INT,
@@ -287,16 +330,514 @@ ON UPDATE NO ACTION ON DELETE NO ACTION;
 """
 
 
+# ============================================================
+# خطة الفهارس (تُنشأ بعد الإدراج - انظر DatabaseInitializer.create_indexes)
+# ============================================================
+# columns: أعمدة الفهرس بالترتيب (الأعمدة الإضافية في نهاية الفهرس تجعله "مغطياً")
+# الفهرس يُتخطى إذا كان في الجدول فهرس آخر يبدأ بنفس الأعمدة (مثل UNIQUE)
+
+INDEX_PLAN = [
+    # Element_Forces_Columns - الجدول الأكبر
+    {
+        "name": "idx_efc_story_column_station",
+        "table": "Element_Forces_Columns",
+        "columns": ["Story", "Column", "Station"],
+        "purpose": "AnalysisService: WHERE Column = ? AND Story = ? ORDER BY Station",
+    },
+    {
+        "name": "idx_efc_unique_case",
+        "table": "Element_Forces_Columns",
+        "columns": ["Unique_Name", "Output_Case"],
+        "purpose": "DatabaseConnection: WHERE Unique_Name = ? ORDER BY Output_Case",
+    },
+
+    # Element_Forces_Beams / Pier_Forces
+    {
+        "name": "idx_efb_story_beam_station",
+        "table": "Element_Forces_Beams",
+        "columns": ["Story", "Beam", "Station"],
+        "purpose": "قوى كمرة في طابق: WHERE Story = ? AND Beam = ? ORDER BY Station",
+    },
+    {
+        "name": "idx_pier_story_pier",
+        "table": "Pier_Forces",
+        "columns": ["Story", "Pier"],
+        "purpose": "قوى حائط (Pier) في طابق: WHERE Story = ? AND Pier = ?",
+    },
+
+    # Frame_Assignments_Section_Properties
+    {
+        "name": "idx_fasp_story_unique",
+        "table": "Frame_Assignments_Section_Properties",
+        "columns": ["Story", "UniqueName"],
+        "purpose": "get_story_columns / search_columns: WHERE Story = ? ORDER BY UniqueName",
+    },
+    {
+        "name": "idx_fasp_story_label",
+        "table": "Frame_Assignments_Section_Properties",
+        "columns": ["Story", "Label"],
+        "purpose": "get_column_by_name / get_frame_assignments_by_story",
+    },
+
+    # Column_Object_Connectivity
+    {
+        "name": "idx_coc_unique",
+        "table": "Column_Object_Connectivity",
+        "columns": ["Unique_Name"],
+        "purpose": "get_column / get_column_connectivity: WHERE Unique_Name = ?",
+    },
+    {
+        "name": "idx_coc_story_unique",
+        "table": "Column_Object_Connectivity",
+        "columns": ["Story", "Unique_Name"],
+        "purpose": "get_columns_bulk(story=...): WHERE Story = ? ORDER BY Unique_Name",
+    },
+
+    # Objects_and_Elements_Joints
+    {
+        "name": "idx_joints_element_name",
+        "table": "Objects_and_Elements_Joints",
+        "columns": ["Element_Name"],
+        "purpose": "ربط UniquePtI / UniquePtJ بالنقاط",
+    },
+
+    # جداول البحث بالاسم
+    {
+        "name": "idx_fspd_rect_name",
+        "table": "Frame_Section_Property_Definitions_Concrete_Rectangular",
+        "columns": ["Name"],
+        "purpose": "get_section_property: WHERE Name = ?",
+    },
+    {
+        "name": "idx_fspd_reinf_name",
+        "table": "Frame_Section_Property_Definitions_Concrete_Column_Reinforcing",
+        "columns": ["Name"],
+        "purpose": "get_column_reinforcement: WHERE Name = ?",
+    },
+    {
+        "name": "idx_story_name",
+        "table": "Story_Definitions",
+        "columns": ["Name"],
+        "purpose": "get_story_by_name: WHERE Name = ?",
+    },
+    {
+        "name": "idx_lcd_name",
+        "table": "Load_Combination_Definitions",
+        "columns": ["Name"],
+        "purpose": "get_load_combination: WHERE Name = ?",
+    },
+    {
+        "name": "idx_concrete_material",
+        "table": "Material_Properties_Concrete_Data",
+        "columns": ["Material"],
+        "purpose": "get_material_properties('concrete', ...)",
+    },
+    {
+        "name": "idx_rebar_material",
+        "table": "Material_Properties_Rebar_Data",
+        "columns": ["Material"],
+        "purpose": "get_material_properties('rebar', ...)",
+    },
+]
+
+# استعلامات الخدمات التي يجب أن تستخدم فهرساً (للتحقق عبر EXPLAIN QUERY PLAN)
+INDEX_VERIFICATION_QUERIES = [
+    ("get_max_forces_for_column",
+     "SELECT * FROM Element_Forces_Columns WHERE Column = ? AND Story = ? ORDER BY ABS(P) DESC LIMIT 1",
+     ("C1", "Story1")),
+    ("get_all_forces_for_column",
+     "SELECT * FROM Element_Forces_Columns WHERE Column = ? AND Story = ? ORDER BY Station",
+     ("C1", "Story1")),
+    ("_load_column_forces",
+     "SELECT * FROM Element_Forces_Columns WHERE Unique_Name = ? ORDER BY Output_Case",
+     (1,)),
+    ("get_story_columns",
+     "SELECT * FROM Frame_Assignments_Section_Properties WHERE Story = ? ORDER BY UniqueName",
+     ("Story1",)),
+    ("search_columns",
+     "SELECT * FROM Frame_Assignments_Section_Properties WHERE Story = ? AND Label LIKE ? ORDER BY UniqueName",
+     ("Story1", "%C%")),
+    ("get_column_by_name",
+     "SELECT * FROM Frame_Assignments_Section_Properties WHERE Label = ? AND Story = ?",
+     ("C1", "Story1")),
+    ("get_column_connectivity",
+     "SELECT * FROM Column_Object_Connectivity WHERE Unique_Name = ?",
+     (1,)),
+    ("get_columns_bulk",
+     "SELECT * FROM Column_Object_Connectivity WHERE Story = ? ORDER BY Unique_Name",
+     ("Story1",)),
+    ("get_section_property",
+     "SELECT * FROM Frame_Section_Property_Definitions_Concrete_Rectangular WHERE Name = ?",
+     ("C1",)),
+    ("get_column_reinforcement",
+     "SELECT * FROM Frame_Section_Property_Definitions_Concrete_Column_Reinforcing WHERE Name = ?",
+     ("C1",)),
+    ("get_story_by_name",
+     "SELECT * FROM Story_Definitions WHERE Name = ?",
+     ("Story1",)),
+    ("get_load_combination",
+     "SELECT * FROM Load_Combination_Definitions WHERE Name = ?",
+     ("DL",)),
+    ("get_material_properties",
+     "SELECT * FROM Material_Properties_Concrete_Data WHERE Material = ?",
+     ("C30",)),
+]
+
+
+# ============================================================
+# تحويل التعريفات إلى صيغة SQLite الأصلية
+# ============================================================
+# CREATE_TABLES_SQL و ALTER_TABLES_SQL مكتوبة بصيغة MySQL (AUTO_INCREMENT،
+# علامات `، ALTER TABLE ... ADD FOREIGN KEY) ولا تُنفذ في SQLite.
+# compile_sqlite_ddl يحولها إلى:
+#   - INTEGER PRIMARY KEY (اسم بديل لـ rowid: البحث بالمعرف = بحث مباشر في B-tree)
+#   - مفاتيح خارجية داخل تعريف العمود (REFERENCES)
+#   - WITHOUT ROWID للجداول المفهرسة بمفتاح طبيعي (WITHOUT_ROWID_TABLES)
+
+# جداول بدون rowid: {الجدول: عمود المفتاح الطبيعي}
+# فقط للجداول التي لا تحتوي معرفاً تلقائياً؛ الجداول المفهرسة بـ Name
+# تُقرأ أيضاً بالمعرف (ID) الذي يولده SQLite عند الإدراج فتبقى rowid.
+# المفتاح الطبيعي يصبح NOT NULL PRIMARY KEY فيرفض الصفوف بقيمة NULL التي يقبلها
+# التعريف الأصلي - لذلك Column_Object_Connectivity يبقى rowid (Unique_Name UNIQUE فقط)
+WITHOUT_ROWID_TABLES = {}
+
+# أنواع MySQL → أنواع SQLite
+SQLITE_TYPES = {
+    "INT": "INTEGER",
+    "FLOAT": "REAL",
+    "VARCHAR": "TEXT",
+    "TEXT": "TEXT",
+}
+
+_CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE IF NOT EXISTS `(\w+)` \((.*?)\n\);", re.S)
+_COLUMN_PATTERN = re.compile(r"`(\w+)` (\w+)(?:\(\d+\))?(.*)")
+_PRIMARY_KEY_PATTERN = re.compile(r"PRIMARY KEY\(`(\w+)`\)")
+_DEFAULT_PATTERN = re.compile(r"DEFAULT (\S+)")
+_FOREIGN_KEY_PATTERN = re.compile(
+    r"ALTER TABLE `(\w+)`\s+ADD FOREIGN KEY\(`(\w+)`\) REFERENCES `(\w+)`\(`(\w+)`\)"
+    r"\s+ON UPDATE (.+?) ON DELETE (.+?);"
+)
+
+
+def parse_table_definitions(create_sql: str = CREATE_TABLES_SQL) -> dict:
+    """
+    قراءة تعريفات الجداول من CREATE_TABLES_SQL
+    
+    Returns:
+        {الجدول: {"columns": [{name, type, not_null, unique, default}], "primary_key": اسم أو None}}
+    """
+    tables = {}
+    for table_name, body in _CREATE_TABLE_PATTERN.findall(create_sql):
+        columns = []
+        primary_key = None
+        for line in body.split("\n"):
+            line = line.strip().rstrip(",")
+            if not line:
+                continue
+            
+            match = _PRIMARY_KEY_PATTERN.match(line)
+            if match:
+                primary_key = match.group(1)
+                continue
+            
+            match = _COLUMN_PATTERN.match(line)
+            if not match:
+                raise ValueError(f"تعريف عمود غير مفهوم في {table_name}: {line}")
+            name, mysql_type, options = match.groups()
+            default = _DEFAULT_PATTERN.search(options)
+            columns.append({
+                "name": name,
+                "type": SQLITE_TYPES[mysql_type.upper()],
+                "not_null": "NOT NULL" in options,
+                "unique": "UNIQUE" in options,
+                "default": default.group(1) if default else None,
+            })
+        
+        tables[table_name] = {"columns": columns, "primary_key": primary_key}
+    return tables
+
+
+def parse_foreign_keys(alter_sql: str = ALTER_TABLES_SQL) -> list:
+    """
+    قراءة المفاتيح الخارجية من ALTER_TABLES_SQL
+    
+    Returns:
+        قائمة {table, column, ref_table, ref_column, on_update, on_delete}
+    """
+    keys = ("table", "column", "ref_table", "ref_column", "on_update", "on_delete")
+    return [dict(zip(keys, match)) for match in _FOREIGN_KEY_PATTERN.findall(alter_sql)]
+
+
+def _unique_columns(table_name: str, definition: dict) -> set:
+    """الأعمدة التي يمكن أن يشير إليها مفتاح خارجي (PRIMARY KEY أو UNIQUE)"""
+    columns = {col["name"] for col in definition["columns"] if col["unique"]}
+    if definition["primary_key"]:
+        columns.add(definition["primary_key"])
+    if table_name in WITHOUT_ROWID_TABLES:
+        columns.add(WITHOUT_ROWID_TABLES[table_name])
+    return columns
+
+
+# ============================================================
+# ترميز جداول القوى (رموز القاموس) والصيغة STRICT
+# ============================================================
+# النصوص المتكررة في صفوف القوى (الطابق، التركيبة، نوع الحالة) تُخزن كرموز
+# صحيحة في جداول قاموس صغيرة مشتركة بين جداول القوى (نفس الرمز لنفس الطابق
+# في الأعمدة والكمرات والحوائط). الجدول المرمز يُخزن في "storage" ويحل محله
+# VIEW بنفس الاسم والأعمدة مع INSTEAD OF triggers، فالقراءة والإدراج
+# والتحديث لا تتغير (DatabaseConnection و AnalysisService يقرآن الـ VIEW).
+#
+# في الصيغة STRICT (اختيارية) يرفض SQLite أي قيمة لا تطابق نوع العمود.
+
+# أقل إصدار SQLite يدعم STRICT
+STRICT_MIN_SQLITE_VERSION = (3, 37, 0)
+
+# {الجدول: {storage: جدول التخزين, codes: {العمود: جدول القاموس}}}
+ENCODED_TABLES = {
+    "Element_Forces_Columns": {
+        "storage": "Element_Forces_Columns_Data",
+        "codes": {
+            "Story": "Story_Codes",
+            "Column": "Column_Label_Codes",
+            "Output_Case": "Output_Case_Codes",
+            "Case_Type": "Case_Type_Codes",
+        },
+    },
+    "Element_Forces_Beams": {
+        "storage": "Element_Forces_Beams_Data",
+        "codes": {
+            "Story": "Story_Codes",
+            "Output_Case": "Output_Case_Codes",
+            "Case_Type": "Case_Type_Codes",
+        },
+    },
+    "Pier_Forces": {
+        "storage": "Pier_Forces_Data",
+        "codes": {
+            "Story": "Story_Codes",
+            "Output_Case": "Output_Case_Codes",
+            "Case_Type": "Case_Type_Codes",
+        },
+    },
+}
+
+
+def get_storage_columns(table_name: str, columns: list) -> tuple:
+    """
+    تحويل أعمدة جدول مرمز إلى أعمدة جدول التخزين (مثل Story → Story_Code)
+    
+    Returns:
+        (اسم جدول التخزين, الأعمدة) أو المدخلات نفسها إذا لم يكن الجدول مرمزاً
+    """
+    encoded = ENCODED_TABLES.get(table_name)
+    if encoded is None:
+        return table_name, list(columns)
+    codes = encoded["codes"]
+    return encoded["storage"], [f"{col}_Code" if col in codes else col for col in columns]
+
+
+def _code_aliases(codes: dict) -> dict:
+    """الاسم المستعار لجدول القاموس لكل عمود مرمز داخل VIEW فك الترميز"""
+    return {col: f"c{i}" for i, col in enumerate(codes, 1)}
+
+
+def get_code_plan_names() -> set:
+    """
+    أسماء جداول القاموس كما تظهر في EXPLAIN QUERY PLAN (الاسم والاسم المستعار داخل VIEW)
+    
+    (البحث في القاموس صغير ولا يدل على فهرسة جدول التخزين نفسه)
+    """
+    names = set()
+    for encoded in ENCODED_TABLES.values():
+        names.update(encoded["codes"].values())
+        names.update(_code_aliases(encoded["codes"]).values())
+    return names
+
+
+def _encoded_table_ddl(table_name: str, definition: dict, encoded: dict) -> list:
+    """VIEW فك الترميز و INSTEAD OF triggers لجدول مرمز"""
+    storage = encoded["storage"]
+    codes = encoded["codes"]
+    names = [col["name"] for col in definition["columns"]]
+    # التحديث والحذف عبر VIEW يحددان الصف بالمفتاح الأساسي المعلن
+    key = definition["primary_key"]
+    if key is None or key in codes:
+        raise ValueError(f"{table_name}: الجدول المرمز يحتاج PRIMARY KEY غير مرمز")
+    storage_names = get_storage_columns(table_name, names)[1]
+    aliases = _code_aliases(codes)
+    
+    select_sql = ",\n\t".join(
+        f'{aliases[col]}."Value" AS "{col}"' if col in codes else f'd."{col}" AS "{col}"'
+        for col in names
+    )
+    joins_sql = "\n".join(
+        f'LEFT JOIN "{codes[col]}" AS {aliases[col]} ON {aliases[col]}."Code" = d."{col}_Code"'
+        for col in codes
+    )
+    statements = [
+        f'CREATE VIEW IF NOT EXISTS "{table_name}" AS\nSELECT\n\t{select_sql}\n'
+        f'FROM "{storage}" AS d\n{joins_sql};'
+    ]
+    
+    # القيم الجديدة تُضاف للقاموس قبل الإدراج/التحديث
+    register_sql = "\n".join(
+        f'INSERT OR IGNORE INTO "{codes[col]}" ("Value") SELECT NEW."{col}" WHERE NEW."{col}" IS NOT NULL;'
+        for col in codes
+    )
+    values = [
+        f'(SELECT "Code" FROM "{codes[col]}" WHERE "Value" = NEW."{col}")' if col in codes else f'NEW."{col}"'
+        for col in names
+    ]
+    columns_sql = ", ".join(f'"{col}"' for col in storage_names)
+    values_sql = ",\n\t".join(values)
+    assignments_sql = ",\n\t".join(
+        f'"{col}" = {value}' for col, value in zip(storage_names, values)
+    )
+    statements.append(
+        f'CREATE TRIGGER IF NOT EXISTS "{table_name}_insert"\n'
+        f'INSTEAD OF INSERT ON "{table_name}"\nBEGIN\n{register_sql}\n'
+        f'INSERT INTO "{storage}" ({columns_sql})\nVALUES (\n\t{values_sql}\n);\nEND;'
+    )
+    statements.append(
+        f'CREATE TRIGGER IF NOT EXISTS "{table_name}_update"\n'
+        f'INSTEAD OF UPDATE ON "{table_name}"\nBEGIN\n{register_sql}\n'
+        f'UPDATE "{storage}" SET\n\t{assignments_sql}\nWHERE "{key}" = OLD."{key}";\nEND;'
+    )
+    statements.append(
+        f'CREATE TRIGGER IF NOT EXISTS "{table_name}_delete"\n'
+        f'INSTEAD OF DELETE ON "{table_name}"\nBEGIN\n'
+        f'DELETE FROM "{storage}" WHERE "{key}" = OLD."{key}";\nEND;'
+    )
+    return statements
+
+
+def compile_sqlite_ddl(create_sql: str = CREATE_TABLES_SQL,
+                       alter_sql: str = ALTER_TABLES_SQL,
+                       strict: bool = False, encode: bool = False) -> tuple:
+    """
+    تحويل تعريفات MySQL إلى CREATE TABLE بصيغة SQLite
+    
+    المفتاح الخارجي الذي يشير إلى عمود ليس PRIMARY KEY أو UNIQUE يُتخطى
+    (SQLite يرفض أي تعديل على الجدول الابن بخطأ "foreign key mismatch"
+    عند تفعيل المفاتيح الخارجية)، ويُسجل كل مفتاح متخطى كتحذير.
+    
+    Args:
+        strict: جداول STRICT (يرفض SQLite القيم التي لا تطابق نوع العمود)
+        encode: ترميز النصوص المتكررة في ENCODED_TABLES (اختياري: الملف أصغر لكن
+            القراءة الكاملة أبطأ بسبب VIEW فك الترميز)
+    
+    Returns:
+        (نص SQL للإنشاء, قائمة المفاتيح المتخطاة مع السبب في "reason")
+    """
+    tables = parse_table_definitions(create_sql)
+    unique_columns = {name: _unique_columns(name, definition) for name, definition in tables.items()}
+    
+    references = {}
+    skipped = []
+    for fk in parse_foreign_keys(alter_sql):
+        if fk["ref_table"] not in tables:
+            skipped.append(dict(fk, reason="الجدول الأب غير معرف"))
+        elif fk["ref_column"] not in unique_columns[fk["ref_table"]]:
+            skipped.append(dict(fk, reason="العمود الأب ليس PRIMARY KEY أو UNIQUE"))
+        elif encode and fk["column"] in ENCODED_TABLES.get(fk["table"], {}).get("codes", {}):
+            skipped.append(dict(fk, reason="العمود مرمز (رمز قاموس بدل النص)"))
+        else:
+            references.setdefault((fk["table"], fk["column"]), []).append(fk)
+    
+    for fk in skipped:
+        logger.warning(
+            f"مفتاح خارجي متخطى: {fk['table']}.{fk['column']} → "
+            f"{fk['ref_table']}.{fk['ref_column']} ({fk['reason']})"
+        )
+    
+    statements = []
+    if encode:
+        code_tables = sorted({code_table for encoded in ENCODED_TABLES.values()
+                              for code_table in encoded["codes"].values()})
+        for code_table in code_tables:
+            statements.append(
+                f'CREATE TABLE IF NOT EXISTS "{code_table}" (\n'
+                f'\t"Code" INTEGER PRIMARY KEY,\n\t"Value" TEXT NOT NULL UNIQUE\n){" STRICT" if strict else ""};'
+            )
+    
+    for table_name, definition in tables.items():
+        natural_key = WITHOUT_ROWID_TABLES.get(table_name)
+        if natural_key and definition["primary_key"]:
+            raise ValueError(f"{table_name}: WITHOUT ROWID لا يولد المعرف {definition['primary_key']} تلقائياً")
+        
+        encoded = ENCODED_TABLES.get(table_name) if encode else None
+        codes = encoded["codes"] if encoded else {}
+        
+        lines = []
+        for col in definition["columns"]:
+            name = col["name"]
+            if name == definition["primary_key"] and col["type"] == "INTEGER":
+                lines.append(f'"{name}" INTEGER PRIMARY KEY')
+                continue
+            
+            if name in codes:
+                lines.append(f'"{name}_Code" INTEGER REFERENCES "{codes[name]}"("Code")')
+                continue
+            
+            parts = [f'"{name}"', col["type"]]
+            if name == natural_key:
+                parts.append("NOT NULL PRIMARY KEY")
+            else:
+                if col["not_null"]:
+                    parts.append("NOT NULL")
+                if col["unique"]:
+                    parts.append("UNIQUE")
+            if col["default"] is not None:
+                parts.append(f"DEFAULT {col['default']}")
+            for fk in references.get((table_name, name), []):
+                parts.append(
+                    f'REFERENCES "{fk["ref_table"]}"("{fk["ref_column"]}") '
+                    f'ON UPDATE {fk["on_update"]} ON DELETE {fk["on_delete"]}'
+                )
+            lines.append(" ".join(parts))
+        
+        options = (["WITHOUT ROWID"] if natural_key else []) + (["STRICT"] if strict else [])
+        suffix = " " + ", ".join(options) if options else ""
+        columns_sql = ",\n\t".join(lines)
+        storage_name = encoded["storage"] if encoded else table_name
+        statements.append(f'CREATE TABLE IF NOT EXISTS "{storage_name}" (\n\t{columns_sql}\n){suffix};')
+        
+        if encoded:
+            statements.extend(_encoded_table_ddl(table_name, definition, encoded))
+    
+    return "\n\n".join(statements) + "\n", skipped
+
+
 def get_create_tables_sql():
     """الحصول على SQL لإنشاء جميع الجداول"""
     return CREATE_TABLES_SQL
 
 
+def get_sqlite_create_tables_sql(strict: bool = False, encode: bool = False):
+    """الحصول على SQL لإنشاء جميع الجداول بصيغة SQLite"""
+    return compile_sqlite_ddl(strict=strict, encode=encode)[0]
+
+
+def get_skipped_foreign_keys(encode: bool = False):
+    """الحصول على المفاتيح الخارجية التي لا يمكن تطبيقها في SQLite"""
+    return compile_sqlite_ddl(encode=encode)[1]
+
+
 def get_alter_tables_sql():
     """الحصول على SQL لإضافة Foreign Keys"""
     return ALTER_TABLES_SQL
 
 
+def get_index_plan():
+    """الحصول على خطة الفهارس"""
+    return INDEX_PLAN
+
+
+def get_index_verification_queries():
+    """الحصول على استعلامات التحقق من استخدام الفهارس"""
+    return INDEX_VERIFICATION_QUERIES
+
+
 def get_all_new_tables():
     """الحصول على قائمة جميع جداول الهيكل الجديد"""
     return NEW_TABLES
@@ -314,6 +855,11 @@ def split_sql_statements(sql_string):
         
         current_statement += " " + line
         
+        # جسم TRIGGER يحتوي جملاً منتهية بـ ; حتى END;
+        if (current_statement.lstrip().upper().startswith("CREATE TRIGGER")
+                and not line.upper().endswith("END;")):
+            continue
+        
         if line.endswith(';'):
             statements.append(current_statement.strip())
             current_statement = ""
@@ -0,0 +1,222 @@
+# database/schema_catalog.py - فهرس هيكل قواعد البيانات (مع ذاكرة مؤقتة)
+# المهمة الوحيدة: قراءة الجداول وأعمدتها مرة واحدة ومشاركتها بين جميع المستوردين
+#
+# مفتاح الذاكرة المؤقتة: المسار + (mtime, الحجم) للملف وملف WAL + البصمة.
+# البصمة = SHA-256 لنصوص CREATE في sqlite_master (الجداول والـ VIEWs وأنواع الأعمدة).
+# إذا تغير الملف دون تغير البصمة (بيانات فقط) يُعاد استخدام الأعمدة بدون PRAGMA.
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict
+
+from config.settings import SCHEMA_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_CATALOGS = {}
+_LOCK = threading.Lock()
+_disk_cache = None
+
+
+# ============================================================
+# البصمة وحالة الملف
+# ============================================================
+
+def get_file_state(db_path: str) -> list:
+    """(mtime_ns, الحجم) للملف وملف WAL إن وجد"""
+    state = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            stat = os.stat(path)
+            state += [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            state += [None, None]
+    return state
+
+
+def compute_fingerprint(conn: sqlite3.Connection) -> str:
+    """
+    بصمة هيكل القاعدة (جداول + VIEWs مع تعريف الأعمدة)
+
+    Args:
+        conn: اتصال مفتوح
+
+    Returns:
+        SHA-256 (hex)
+    """
+    digest = hashlib.sha256()
+    for kind, name, sql in conn.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        "WHERE type IN ('table', 'view') ORDER BY name"
+    ):
+        digest.update(f"{kind}\0{name}\0{sql}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ============================================================
+# الفهرس
+# ============================================================
+
+class SchemaCatalog:
+    """
+    هيكل قاعدة بيانات: الجداول والـ VIEWs وأعمدتها
+
+    tables: {الاسم: {"type": "table" / "view", "columns": [[name, type, notnull, default, pk], ...]}}
+    أسماء الجداول غير حساسة لحالة الأحرف (مثل SQLite).
+    """
+
+    def __init__(self, path: str, fingerprint: str, tables: Dict[str, dict]):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.tables = tables
+        self._names = {name.lower(): name for name in tables}
+
+    @classmethod
+    def introspect(cls, conn: sqlite3.Connection, path: str, fingerprint: str = None) -> "SchemaCatalog":
+        """قراءة الهيكل كاملاً من القاعدة (PRAGMA table_info لكل جدول)"""
+        fingerprint = fingerprint or compute_fingerprint(conn)
+        tables = {}
+        for kind, name in conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'view') ORDER BY name"
+        ).fetchall():
+            escaped = name.replace('"', '""')
+            columns = conn.execute(f'PRAGMA table_info("{escaped}")').fetchall()
+            tables[name] = {
+                "type": kind,
+                "columns": [[col[1], col[2], col[3], col[4], col[5]] for col in columns],
+            }
+        return cls(path, fingerprint, tables)
+
+    def resolve(self, table_name: str) -> Optional[str]:
+        """الاسم الفعلي للجدول (None إذا لم يوجد)"""
+        return self._names.get(table_name.strip('[]"').lower())
+
+    def has_table(self, table_name: str) -> bool:
+        """التحقق من وجود جدول أو VIEW"""
+        return self.resolve(table_name) is not None
+
+    def is_view(self, table_name: str) -> bool:
+        """التحقق من أن الاسم VIEW"""
+        name = self.resolve(table_name)
+        return name is not None and self.tables[name]["type"] == "view"
+
+    def table_names(self, include_views: bool = False) -> List[str]:
+        """أسماء الجداول"""
+        return [name for name, table in self.tables.items()
+                if include_views or table["type"] == "table"]
+
+    def table_info(self, table_name: str) -> List[tuple]:
+        """مثل PRAGMA table_info: [(cid, name, type, notnull, default, pk), ...]"""
+        name = self.resolve(table_name)
+        if name is None:
+            return []
+        return [(cid, *col) for cid, col in enumerate(self.tables[name]["columns"])]
+
+    def columns(self, table_name: str) -> List[str]:
+        """أسماء أعمدة جدول ([] إذا لم يوجد)"""
+        return [col[1] for col in self.table_info(table_name)]
+
+    def column_types(self, table_name: str) -> Dict[str, str]:
+        """{العمود: النوع المعلن}"""
+        return {col[1]: col[2] for col in self.table_info(table_name)}
+
+
+# ============================================================
+# الذاكرة المؤقتة (العملية + ملف JSON)
+# ============================================================
+
+def _load_disk_cache(cache_path: Path) -> dict:
+    global _disk_cache
+    if _disk_cache is None:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                _disk_cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _disk_cache = {}
+    return _disk_cache
+
+
+def _save_disk_cache(cache_path: Path, cache: dict):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"⚠️ تعذر حفظ ذاكرة الهيكل المؤقتة: {e}")
+
+
+def get_schema_catalog(db_path: str, conn: sqlite3.Connection = None,
+                       cache_path: str = None) -> SchemaCatalog:
+    """
+    فهرس هيكل القاعدة (من الذاكرة المؤقتة إن أمكن)
+
+    Args:
+        db_path: مسار قاعدة البيانات
+        conn: اتصال مفتوح بنفس القاعدة (اختياري - يُفتح اتصال مؤقت عند الحاجة)
+        cache_path: ملف الذاكرة المؤقتة (الافتراضي SCHEMA_CACHE_PATH)
+
+    Returns:
+        SchemaCatalog
+    """
+    if str(db_path) == ":memory:":
+        return SchemaCatalog.introspect(conn, ":memory:")
+
+    path = str(Path(db_path).resolve())
+    cache_path = Path(cache_path or SCHEMA_CACHE_PATH)
+    state = get_file_state(path)
+
+    with _LOCK:
+        catalog, cached_state = _CATALOGS.get(path, (None, None))
+        if catalog is not None and cached_state == state:
+            return catalog
+
+        disk_cache = _load_disk_cache(cache_path)
+        entry = disk_cache.get(path)
+        if entry and entry["state"] == state:
+            catalog = SchemaCatalog(path, entry["fingerprint"], entry["tables"])
+            _CATALOGS[path] = (catalog, state)
+            return catalog
+
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            fingerprint = compute_fingerprint(conn)
+            if entry and entry["fingerprint"] == fingerprint:
+                catalog = SchemaCatalog(path, fingerprint, entry["tables"])
+            else:
+                catalog = SchemaCatalog.introspect(conn, path, fingerprint)
+                logger.debug(f"📋 قراءة هيكل {path}: {len(catalog.tables)} جدول")
+        finally:
+            if own_conn:
+                conn.close()
+
+        _CATALOGS[path] = (catalog, state)
+        disk_cache[path] = {"state": state, "fingerprint": fingerprint, "tables": catalog.tables}
+        _save_disk_cache(cache_path, disk_cache)
+        return catalog
+
+
+def invalidate_schema_catalog(db_path: str = None):
+    """
+    حذف فهرس قاعدة من الذاكرة المؤقتة (أو الكل)
+
+    يُستدعى بعد تعديل الهيكل عبر اتصال لم يغير الملف بعد (مثل WAL قبل checkpoint).
+    """
+    global _disk_cache
+    with _LOCK:
+        if db_path is None:
+            _CATALOGS.clear()
+            _disk_cache = None
+            return
+        path = str(Path(db_path).resolve())
+        _CATALOGS.pop(path, None)
+        if _disk_cache is not None:
+            _disk_cache.pop(path, None)
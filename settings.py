@@ -2,6 +2,7 @@
 # المهمة الوحيدة: المسارات والإعدادات الأساسية للإنشاء
 # لا تتدخل في الإدخال أو الربط
 
+import os
 from pathlib import Path
 from datetime import datetime
 
@@ -20,6 +21,12 @@ NEW_DATABASE_PATH = str(DB_DIR / "structural_database.db")
 # قاعدة VEDA القديمة (مصدر البيانات - للقراءة فقط في المهام الأخرى)
 VEDA_DATABASE_PATH = str(DB_DIR / "project.veda")
 
+# مجلد المخزن العمودي لجداول القوى (ملفات .npy - main_export.py)
+FORCE_STORE_DIR = str(DB_DIR / "force_store")
+
+# ذاكرة هيكل القواعد المؤقتة (database/schema_catalog.py)
+SCHEMA_CACHE_PATH = str(DB_DIR / "schema_cache.json")
+
 LOG_DIR = PROJECT_ROOT / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -29,7 +36,7 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 # ============================================================
 
 # عدد الجداول المراد إنشاؤها
-TOTAL_NEW_TABLES = 11
+TOTAL_NEW_TABLES = 13
 
 # اسم قاعدة البيانات الجديدة
 NEW_DATABASE_NAME = "structural_database.db"
@@ -38,6 +45,58 @@ NEW_DATABASE_NAME = "structural_database.db"
 # False = الحفاظ على البيانات القديمة إن وجدت
 RECREATE_DATABASE = False
 
+# جداول STRICT: يرفض SQLite أي قيمة لا تطابق نوع العمود (تتطلب SQLite 3.37 أو أحدث)
+STRICT_SCHEMA = False
+
+# ترميز Story و Output_Case و Case_Type في جداول القوى برموز قاموس (انظر ENCODED_TABLES)
+# الملف أصغر (~22%) لكن المسح الكامل أبطأ بسبب VIEW فك الترميز - لذلك اختياري
+ENCODED_SCHEMA = False
+
+
+# ============================================================
+# إعدادات الإدراج (main_import.py)
+# ============================================================
+
+# عدد الصفوف في كل دفعة executemany (الصف الخاطئ يُعزل ويُبلغ عنه دون إلغاء دفعته)
+IMPORT_CHUNK_SIZE = 5000
+
+# وضع الإدراج: "attach" = INSERT ... SELECT داخل SQLite لكل جدول (الأسرع)،
+# "python" = قراءة الصفوف وتحويلها في Python (الجداول التي تحتاج تحويلاً تمر به في الحالتين)،
+# "delta" = تطبيق الفرق عن الإدراج السابق فقط حسب DELTA_KEYS وبصمات الصفوف
+#           (لإعادة الاستيراد بعد تعديل صغير في النموذج - ثم main_link.py لإعادة ملء الروابط المفرغة)
+IMPORT_MODE = "attach"
+
+# عدد عمال القراءة والتحويل المتوازي (1 = جدول بعد جدول)؛ الكتابة دائماً في خيط واحد بترتيب التبعيات
+# (على معالج بنواة واحدة لا فائدة من التوازي - العمال يتنافسون على نفس النواة)
+IMPORT_WORKERS = min(4, os.cpu_count() or 1)
+
+# نوع العمال: "thread" أو "process" (process يوازي التحويل في Python لكن ينقل الصفوف بين العمليات)
+IMPORT_EXECUTOR = "thread"
+
+# قراءة وكتابة كل جدول على دفعات fetchmany بهذا الحجم: الذاكرة محدودة بالدفعة مهما كبر الجدول
+# (نماذج response-history). مع IMPORT_WORKERS > 1 يمرر كل عامل جدوله دفعة دفعة عبر طابور محدود
+# (STREAM_QUEUE_SIZE في parallel_import). None = تحميل الجدول كاملاً في الذاكرة
+IMPORT_FETCH_SIZE = 50000
+
+# ============================================================
+# إعدادات الجداول المشتقة (main_link.py)
+# ============================================================
+
+# تحديث غلاف القوى (Column_Force_Envelopes) تزايدياً عبر trigger عند إدراج قوى جديدة
+# False = إعادة بناء كاملة فقط
+INCREMENTAL_ENVELOPES = False
+
+
+# ============================================================
+# إعدادات التحسين (main_optimize.py)
+# ============================================================
+
+# إعادة بناء الملف عبر VACUUM INTO بعد ANALYZE (إزالة التجزئة والصفحات الفارغة)
+OPTIMIZE_VACUUM = True
+
+# حجم الصفحة عند VACUUM (None = بدون تغيير؛ SQLite الافتراضي 4096)
+OPTIMIZE_PAGE_SIZE = None
+
 
 # ============================================================
 # السجلات (logs)
@@ -0,0 +1,122 @@
+"""
+tests/conftest.py - قواعد SQLite مؤقتة مشتركة بين الاختبارات
+
+الاختبارات تستورد الوحدات بأسماء الحزم (database, services, config, ...)
+وتُشغَّل من جذر المشروع: python -m pytest -q tests
+"""
+
+import sqlite3
+
+import pytest
+
+from config.veda_schema import VEDA_TABLES
+from database.initializer import initialize_database
+
+
+STORIES = ["Story1", "Story2"]
+COMBINATIONS = ["COMB1", "COMB2"]
+STATIONS = [0.0, 1500.0]
+
+
+def force_values(unique_name: int, case_index: int, station_index: int) -> tuple:
+    """قيم P, V2, V3, T, M2, M3 ثابتة لكل صف (يسهل حساب الأقصى في الاختبارات)"""
+    base = unique_name * 100 + case_index * 10 + station_index
+    return (-float(base), 1.0, 2.0, 0.5, float(base) / 10, -float(base) / 5)
+
+
+def build_veda_db(path, columns: int = 3) -> str:
+    """
+    قاعدة VEDA صغيرة: جميع جداول VEDA_TABLES (فارغة) مع طوابق وتوليفات وقوى أعمدة
+
+    Returns:
+        مسار القاعدة
+    """
+    conn = sqlite3.connect(path)
+    for table_name, veda_columns in VEDA_TABLES.items():
+        columns_sql = ", ".join(f'"{column}"' for column in veda_columns)
+        conn.execute(f'CREATE TABLE "{table_name}" ({columns_sql})')
+
+    for index, story in enumerate(STORIES, 1):
+        conn.execute(
+            'INSERT INTO Story_Definitions (Tower, Name, Height, GUID) VALUES (?, ?, ?, ?)',
+            ("T1", story, 3000.0 * index, f"story-{index}")
+        )
+    for index, combination in enumerate(COMBINATIONS, 1):
+        conn.execute(
+            'INSERT INTO Load_Combination_Definitions (Name, Type, "Is Auto", SF, GUID) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (combination, "Linear Add", "No", 1.2, f"combo-{index}")
+        )
+    for unique_name in range(1, columns + 1):
+        story = STORIES[unique_name % len(STORIES)]
+        for case_index, combination in enumerate(COMBINATIONS):
+            for station_index, station in enumerate(STATIONS):
+                conn.execute(
+                    'INSERT INTO Element_Forces_Columns (Story, Column, "Unique Name", "Output Case", '
+                    '"Case Type", Station, P, V2, V3, T, M2, M3, Element, "Elem Station", Location) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (story, f"C{unique_name}", unique_name, combination, "Combination", station,
+                     *force_values(unique_name, case_index, station_index),
+                     unique_name, station, station)
+                )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def build_column_db(path, columns: int = 3) -> str:
+    """
+    قاعدة جديدة (initialize_database) فيها أعمدة وقوى جاهزة للقراءة
+
+    Returns:
+        مسار القاعدة
+    """
+    assert initialize_database(str(path))
+    conn = sqlite3.connect(path)
+    for index, story in enumerate(STORIES, 1):
+        conn.execute("INSERT INTO Story_Definitions (ID, Name, Height) VALUES (?, ?, ?)",
+                     (index, story, 3000.0))
+    for index, combination in enumerate(COMBINATIONS, 1):
+        conn.execute("INSERT INTO Load_Combination_Definitions (ID, Name, Type) VALUES (?, ?, ?)",
+                     (index, combination, "Linear Add"))
+    for unique_name in range(1, columns + 1):
+        story = STORIES[unique_name % len(STORIES)]
+        conn.execute(
+            "INSERT INTO Column_Object_Connectivity VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (unique_name, story, f"C{unique_name}", 1000 + unique_name, 2000 + unique_name,
+             3000, f"column-{unique_name}", unique_name)
+        )
+        for case_index, combination in enumerate(COMBINATIONS):
+            for station_index, station in enumerate(STATIONS):
+                conn.execute(
+                    "INSERT INTO Element_Forces_Columns (Story, Column, Unique_Name, Output_Case, "
+                    "Case_Type, Station, P, V2, V3, T, M2, M3, Element, Elem_Station, Location, "
+                    "ElementID, Load_case_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (story, f"C{unique_name}", unique_name, combination, "Combination", station,
+                     *force_values(unique_name, case_index, station_index),
+                     unique_name, station, station, unique_name, case_index + 1)
+                )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def new_db(tmp_path):
+    """قاعدة جديدة فارغة بالمخطط الكامل"""
+    path = tmp_path / "new.db"
+    assert initialize_database(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def veda_db(tmp_path):
+    """قاعدة VEDA مصدر للإدراج"""
+    return build_veda_db(tmp_path / "veda.db")
+
+
+@pytest.fixture
+def column_db(tmp_path):
+    """قاعدة جديدة بأعمدة وقوى (لـ DatabaseConnection والخدمات)"""
+    return build_column_db(tmp_path / "columns.db")
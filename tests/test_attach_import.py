@@ -0,0 +1,84 @@
+"""
+tests/test_attach_import.py - وضع attach (INSERT ... SELECT) مقابل وضع python
+"""
+
+import sqlite3
+
+import pytest
+
+from database.importer import coerce_value, import_data
+from database.initializer import initialize_database
+
+
+def _dump(path) -> dict:
+    """محتوى كل جدول مع نوع كل قيمة (typeof) لمقارنة الوضعين"""
+    conn = sqlite3.connect(path)
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+    dump = {}
+    for table_name in tables:
+        rows = conn.execute(f'SELECT * FROM "{table_name}" ORDER BY rowid').fetchall()
+        dump[table_name] = [tuple((value, type(value).__name__) for value in row) for row in rows]
+    conn.close()
+    return dump
+
+
+def _import(veda_db, tmp_path, mode: str) -> dict:
+    path = str(tmp_path / f"{mode}.db")
+    assert initialize_database(path)
+    assert import_data(veda_db, path, mode=mode)
+    return _dump(path)
+
+
+def _story_rows(dump) -> list:
+    return [tuple(value for value, _ in row) for row in dump["Story_Definitions"]]
+
+
+def test_attach_matches_python_mode(veda_db, tmp_path):
+    attach = _import(veda_db, tmp_path, "attach")
+
+    assert len(attach["Element_Forces_Columns"]) == 12
+    assert attach == _import(veda_db, tmp_path, "python")
+
+
+def test_values_needing_coercion_go_through_python(veda_db, tmp_path):
+    conn = sqlite3.connect(veda_db)
+    # نص في عمود رقمي، وعدد صحيح وعشري في أعمدة نصية
+    conn.execute("UPDATE Story_Definitions SET Height = ' 4500 ' WHERE Name = 'Story2'")
+    conn.execute("UPDATE Story_Definitions SET GUID = 7 WHERE Name = 'Story1'")
+    conn.execute("UPDATE Load_Combination_Definitions SET Name = 1.5 WHERE GUID = 'combo-2'")
+    conn.execute("UPDATE Load_Combination_Definitions SET GUID = 12 WHERE GUID = 'combo-1'")
+    conn.commit()
+    conn.close()
+
+    attach = _import(veda_db, tmp_path, "attach")
+    assert attach == _import(veda_db, tmp_path, "python")
+
+    heights = {row[0][0]: row for row in attach["Story_Definitions"]}
+    assert (4500.0, "float") in heights[2]
+    assert ("7", "str") in heights[1]
+    combinations = [tuple(value for value, _ in row) for row in attach["Load_Combination_Definitions"]]
+    assert "1.5" in combinations[1]
+    assert "12" in combinations[0]
+
+
+@pytest.mark.parametrize("value, affinity, expected", [
+    ("12.0", "INTEGER", 12),
+    (" 3 ", "REAL", 3.0),
+    ("", "REAL", None),
+    (12, "TEXT", "12"),
+    (1.5, "TEXT", "1.5"),
+    (b"raw", "INTEGER", b"raw"),
+    ("x", None, "x"),
+])
+def test_coerce_value(value, affinity, expected):
+    result = coerce_value(value, affinity)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize("value", ["abc", 1.5, "2.5"])
+def test_coerce_value_rejects_lossy_integer(value):
+    with pytest.raises(ValueError):
+        coerce_value(value, "INTEGER")
@@ -0,0 +1,84 @@
+"""
+tests/test_batch_insert.py - إدراج الدفعات وعزل الصفوف الخاطئة
+"""
+
+import sqlite3
+
+import pytest
+
+from database.batch_insert import fetch_chunks, insert_rows
+
+
+INSERT = "INSERT INTO t (id, name, value) VALUES (?, ?, ?)"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = sqlite3.connect(str(tmp_path / "batch.db"))
+    connection.execute(
+        "CREATE TABLE t (id INTEGER PRIMARY KEY, name TEXT NOT NULL, value REAL CHECK (value >= 0))"
+    )
+    yield connection
+    connection.close()
+
+
+def _ids(conn) -> list:
+    return [row[0] for row in conn.execute("SELECT id FROM t ORDER BY id")]
+
+
+def test_failing_rows_are_isolated(conn):
+    rows = [(1, "a", 1.0), (1, "duplicate", 1.0), (2, None, 1.0), (3, "c", -1.0), (4, "d", 4.0)]
+    reported = []
+
+    inserted, errors = insert_rows(conn, INSERT, rows,
+                                   on_error=lambda index, row, error: reported.append((index, row[0])))
+    conn.commit()
+
+    assert (inserted, errors) == (2, 3)
+    assert reported == [(1, 1), (2, 2), (3, 3)]
+    assert _ids(conn) == [1, 4]
+
+
+def test_error_positions_across_chunks(conn):
+    rows = [(index, "x" if index % 4 else None, 1.0) for index in range(1, 11)]
+    reported = []
+
+    inserted, errors = insert_rows(conn, INSERT, rows, chunk_size=3,
+                                   on_error=lambda index, row, error: reported.append(index))
+    conn.commit()
+
+    # الصفوف 4 و 8 (المواضع 3 و 7) بلا اسم
+    assert reported == [3, 7]
+    assert (inserted, errors) == (8, 2)
+    assert _ids(conn) == [1, 2, 3, 5, 6, 7, 9, 10]
+
+
+def test_first_and_last_rows_fail(conn):
+    conn.execute("INSERT INTO t VALUES (1, 'existing', 0.0)")
+    rows = [(1, "a", 1.0), (2, "b", 2.0), (3, "c", -3.0)]
+
+    assert insert_rows(conn, INSERT, rows) == (1, 2)
+    conn.commit()
+    assert _ids(conn) == [1, 2]
+
+
+def test_rows_stay_in_one_uncommitted_transaction(conn):
+    insert_rows(conn, INSERT, [(1, "a", 1.0), (2, None, 1.0)])
+    assert conn.in_transaction
+
+    conn.rollback()
+    assert _ids(conn) == []
+
+
+def test_statement_error_is_raised(conn):
+    with pytest.raises(sqlite3.OperationalError):
+        insert_rows(conn, "INSERT INTO missing (id) VALUES (?)", [(1,)])
+
+
+def test_fetch_chunks_sizes(conn):
+    conn.executemany(INSERT, [(index, "x", 1.0) for index in range(1, 8)])
+
+    sizes = [len(chunk) for chunk in fetch_chunks(conn.execute("SELECT * FROM t"), 3)]
+    assert sizes == [3, 3, 1]
+    assert [len(chunk) for chunk in fetch_chunks(conn.execute("SELECT * FROM t"), None)] == [7]
+    assert list(fetch_chunks(conn.execute("SELECT * FROM t WHERE id > 100"), 3)) == []
@@ -0,0 +1,68 @@
+"""
+tests/test_bulk_columns.py - get_columns_bulk مقابل get_column (والتحميل المؤجل)
+"""
+
+import pytest
+
+import database.connection as connection_module
+from database.connection import DatabaseConnection
+from models.column import LazyColumn
+
+
+@pytest.fixture
+def db(column_db):
+    connection = DatabaseConnection(column_db)
+    assert connection.connect()
+    yield connection
+    connection.disconnect()
+
+
+def _snapshot(column):
+    return (column.etabs_id, column.story_name, column.unique_name, column.forces)
+
+
+def test_bulk_matches_single_column_loads(db):
+    columns = db.get_columns_bulk()
+
+    assert [column.unique_name for column in columns] == [1, 2, 3]
+    for column in columns:
+        assert _snapshot(column) == _snapshot(db.get_column(column.unique_name))
+        assert len(column.forces) == 4
+
+
+def test_bulk_filters_by_story_and_unique_names(db):
+    assert [column.unique_name for column in db.get_columns_bulk(story="Story2")] == [1, 3]
+    assert [column.unique_name for column in db.get_columns_bulk(unique_names=[3, 1, 3])] == [1, 3]
+    assert db.get_columns_bulk(unique_names=[99]) == []
+
+
+def test_bulk_chunks_in_lists_and_force_reads(db, monkeypatch):
+    expected = [_snapshot(column) for column in db.get_columns_bulk()]
+
+    monkeypatch.setattr(connection_module, "IN_CLAUSE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(connection_module, "FORCE_FETCH_SIZE", 1)
+
+    assert [_snapshot(column) for column in db.get_columns_bulk(unique_names=[1, 2, 3])] == expected
+
+
+def test_get_column_keeps_requested_id(db):
+    assert db.get_column(2).etabs_id == "C2"
+    assert db.get_column(99) is None
+
+
+def test_lazy_columns_load_forces_once_for_the_group(db, monkeypatch):
+    eager = [_snapshot(column) for column in db.get_columns_bulk()]
+    columns = db.get_columns_bulk(lazy=True)
+
+    assert all(isinstance(column, LazyColumn) for column in columns)
+    assert not any(column.is_loaded("forces") for column in columns)
+
+    calls = []
+    load_forces = db._bulk_load_forces
+    monkeypatch.setattr(db, "_bulk_load_forces", lambda group: calls.append(len(group)) or load_forces(group))
+
+    assert len(columns[0].forces) == 4
+    assert all(column.is_loaded("forces") for column in columns)
+    assert [_snapshot(column) for column in columns] == eager
+    assert calls == [3]
+    assert not columns[1].is_loaded("joints")
@@ -0,0 +1,124 @@
+"""
+tests/test_column_facts.py - جدول Column_Facts (صف واحد لكل عمود)
+"""
+
+import sqlite3
+
+import pytest
+
+from database.derived_tables import COLUMN_FACTS_TABLE, DerivedTablesBuilder
+from services.material_service import MaterialStrengthResolver
+from tests.conftest import STORIES
+
+
+# منسوب كل طابق = أعلى Global_Z لنقاطه
+ELEVATIONS = {"Story1": 3000.0, "Story2": 6000.0}
+
+
+@pytest.fixture
+def facts_db(column_db):
+    """column_db مع المقاطع والتسليح والمواد والنقاط"""
+    conn = sqlite3.connect(column_db)
+    conn.execute("INSERT INTO Material_Properties_Concrete_Data (ID, Material, Fc) VALUES (1, 'C30', 30.0)")
+    conn.execute("INSERT INTO Material_Properties_Rebar_Data (ID, Material, Fy) VALUES (1, 'B420', 420.0)")
+    conn.executemany(
+        "INSERT INTO Frame_Section_Property_Definitions_Concrete_Rectangular "
+        "(ID, Name, Material, Depth, Width, MaterialID) VALUES (?, ?, 'C30', ?, ?, 1)",
+        [(1, "C400x600", 600.0, 400.0), (2, "C500x500", 500.0, 500.0)]
+    )
+    conn.executemany(
+        "INSERT INTO Frame_Section_Property_Definitions_Concrete_Column_Reinforcing "
+        "(ID, Name, Number_Bars_3_Dir, Number_Bars_2_Dir, LonZgitudinal_Bar_MaterialID, "
+        "Tie_Bar_MaterialID, NameID) VALUES (?, ?, 4, 3, 1, 1, ?)",
+        [(1, "C400x600", 1), (2, "C500x500", 2)]
+    )
+    # C1 في Story2: أول تخصيص بالمعرف هو المعتمد، وتخصيص Story1 لا يخصه
+    conn.executemany(
+        "INSERT INTO Frame_Assignments_Section_Properties (ID, Story, UniqueName, Section_Property, "
+        "Section_PropertyID) VALUES (?, ?, ?, ?, ?)",
+        [(1, "Story1", 1, "C500x500", 2),
+         (2, "Story2", 1, "C400x600", 1),
+         (3, "Story1", 2, "C500x500", 2),
+         (4, "Story2", 3, "C400x600", 1),
+         (5, "Story2", 1, "C500x500", 2)]
+    )
+    for unique_name in range(1, 4):
+        story = STORIES[unique_name % len(STORIES)]
+        conn.executemany(
+            "INSERT INTO Objects_and_Elements_Joints (Story, Element_Name, Global_X, Global_Y, Global_Z) "
+            "VALUES (?, ?, ?, 0.0, ?)",
+            [(story, 1000 + unique_name, unique_name * 100.0, ELEVATIONS[story] - 3000.0),
+             (story, 2000 + unique_name, unique_name * 100.0, ELEVATIONS[story])]
+        )
+    conn.commit()
+    conn.close()
+    return column_db
+
+
+def _build(path) -> dict:
+    builder = DerivedTablesBuilder(path)
+    assert builder.connect()
+    try:
+        assert builder.build_column_facts() == 3
+        builder.conn.row_factory = sqlite3.Row
+        return {row["Unique_Name"]: dict(row)
+                for row in builder.conn.execute(f'SELECT * FROM "{COLUMN_FACTS_TABLE}"')}
+    finally:
+        builder.close()
+
+
+def test_section_from_first_assignment_of_the_story(facts_db):
+    facts = _build(facts_db)
+
+    assert facts[1]["Story"] == "Story2"
+    assert facts[1]["Section_Property"] == "C400x600"
+    assert (facts[1]["Depth"], facts[1]["Width"], facts[1]["Area"]) == (600.0, 400.0, 240000.0)
+    assert facts[2]["Section_Property"] == "C500x500"
+    assert facts[1]["Number_Bars_3_Dir"] == 4
+    assert facts[1]["Concrete_Material"] == "C30"
+
+
+def test_story_elevation_from_joints(facts_db):
+    facts = _build(facts_db)
+
+    assert facts[1]["Story_Elevation"] == ELEVATIONS["Story2"]
+    assert facts[2]["Story_Elevation"] == ELEVATIONS["Story1"]
+    assert (facts[3]["Joint_I_Z"], facts[3]["Joint_J_Z"]) == (3000.0, 6000.0)
+    assert facts[3]["Joint_I_X"] == 300.0
+
+
+def test_stored_area_is_preferred(facts_db):
+    conn = sqlite3.connect(facts_db)
+    conn.execute('ALTER TABLE Frame_Section_Property_Definitions_Concrete_Rectangular ADD COLUMN "Area" REAL')
+    conn.execute("UPDATE Frame_Section_Property_Definitions_Concrete_Rectangular SET Area = 230000.0 WHERE ID = 1")
+    conn.commit()
+    conn.close()
+
+    assert _build(facts_db)[1]["Area"] == 230000.0
+
+
+def test_strengths_match_material_resolver(facts_db):
+    facts = _build(facts_db)
+
+    conn = sqlite3.connect(facts_db)
+    resolver = MaterialStrengthResolver(conn)
+    factors = resolver.get_factors()
+    conn.close()
+
+    assert facts[1]["Knowledge_Factor"] == factors["knowledge_factor"]
+    assert facts[1]["Fc_Expected"] == pytest.approx(30.0 * factors["lambda_c"])
+    assert facts[1]["Fy_Effective_Lower_Bound"] == pytest.approx(420.0 * factors["knowledge_factor"])
+
+
+def test_missing_source_table_skips_build(column_db):
+    conn = sqlite3.connect(column_db)
+    conn.execute("DROP TABLE Objects_and_Elements_Joints")
+    conn.commit()
+    conn.close()
+
+    builder = DerivedTablesBuilder(column_db)
+    assert builder.connect()
+    try:
+        assert builder.build_column_facts() == 0
+    finally:
+        builder.close()
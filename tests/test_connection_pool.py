@@ -0,0 +1,132 @@
+"""
+tests/test_connection_pool.py - مجمّع الاتصالات ومُزخرف pooled
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from services.connection_service import ConnectionPool
+from services.analysis_service import AnalysisService
+
+
+@pytest.fixture
+def pool(column_db):
+    connection_pool = ConnectionPool(column_db, max_size=2, timeout=1)
+    yield connection_pool
+    connection_pool.close_all()
+
+
+def test_nested_acquire_reuses_thread_connection(pool):
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        assert pool.stats()["in_use"] == 1
+    assert pool.stats() == {"max_size": 2, "open": 1, "idle": 1, "in_use": 0}
+
+
+def test_checkout_times_out_when_exhausted(pool):
+    held = []
+    ready = threading.Event()
+    done = threading.Event()
+
+    def borrow():
+        with pool.connection() as conn:
+            held.append(conn)
+            ready.set()
+            done.wait()
+
+    threads = [threading.Thread(target=borrow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        ready.wait()
+        ready.clear()
+    try:
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+    finally:
+        done.set()
+        for thread in threads:
+            thread.join()
+
+    assert held[0] is not held[1]
+    assert pool.stats()["idle"] == 2
+
+
+def test_release_rolls_back_open_transaction(pool):
+    with pool.connection() as conn:
+        conn.execute("UPDATE Story_Definitions SET Height = 1.0")
+        assert conn.in_transaction
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT MIN(Height) FROM Story_Definitions").fetchone()[0] == 3000.0
+
+
+def test_release_from_other_thread_is_rejected(pool):
+    conn = pool.acquire()
+    errors = []
+
+    def release():
+        try:
+            pool.release(conn)
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=release)
+    thread.start()
+    thread.join()
+
+    assert errors
+    pool.release(conn)
+    assert pool.stats()["in_use"] == 0
+
+
+def test_closed_pool_refuses_checkout(pool):
+    pool.close_all()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pooled_generator_releases_on_early_close(pool):
+    service = AnalysisService(pool=pool)
+    forces = service.iter_forces_for_column("C1", "Story2", chunk_size=1)
+
+    assert next(forces).column == "C1"
+    assert pool.stats()["in_use"] == 1
+
+    forces.close()
+    assert pool.stats()["in_use"] == 0
+
+
+def test_pooled_generator_closed_on_other_thread(pool):
+    service = AnalysisService(pool=pool)
+    forces = service.iter_forces_for_column("C1", "Story2", chunk_size=1)
+    next(forces)
+
+    thread = threading.Thread(target=forces.close)
+    thread.start()
+    thread.join()
+
+    assert pool.stats()["in_use"] == 0
+    assert len(list(service.iter_forces_for_column("C1", "Story2"))) == 4
+
+
+def test_pooled_method_shares_connection_with_nested_generator(column_db):
+    single = ConnectionPool(column_db, max_size=1, timeout=1)
+    try:
+        # calculate_max_moment يمر على iter_forces_for_column باتصاله نفسه
+        assert AnalysisService(pool=single).calculate_max_moment("C1", "Story2") is not None
+        assert single.stats()["in_use"] == 0
+    finally:
+        single.close_all()
+
+
+def test_missing_envelope_table_is_rechecked(column_db):
+    conn = sqlite3.connect(column_db)
+    service = AnalysisService(db_connection=conn)
+    assert not service._has_envelopes()
+
+    conn.execute("CREATE TABLE Column_Force_Envelopes (Unique_Name INTEGER)")
+    assert service._has_envelopes()
+    conn.close()
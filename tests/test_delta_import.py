@@ -0,0 +1,119 @@
+"""
+tests/test_delta_import.py - الإدراج التزايدي (delta) وذرية كل جدول
+"""
+
+import sqlite3
+
+import pytest
+
+from database.delta_import import DELTA_STATE_TABLE, DeltaTable
+from database.importer import DatabaseImporter, import_data
+from database.initializer import initialize_database
+
+
+FORCES_QUERY = "SELECT ID, Story, Column, Unique_Name, Output_Case, Station, P, M2, M3 FROM Element_Forces_Columns ORDER BY ID"
+STORIES_QUERY = "SELECT ID, Name, Height FROM Story_Definitions ORDER BY ID"
+
+
+def _delta(veda_db, new_db) -> DatabaseImporter:
+    importer = DatabaseImporter(veda_db, new_db, mode="delta")
+    assert importer.import_all()
+    return importer
+
+
+def _rows(path, query) -> list:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(query).fetchall()
+
+
+def _update_veda(veda_db, *statements):
+    conn = sqlite3.connect(veda_db)
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def delta_db(veda_db, new_db):
+    """قاعدة أُدرجت مرة بوضع delta"""
+    _delta(veda_db, new_db)
+    return new_db
+
+
+def test_first_delta_matches_full_import(veda_db, delta_db, tmp_path):
+    full = str(tmp_path / "full.db")
+    assert initialize_database(full)
+    assert import_data(veda_db, full)
+
+    assert _rows(delta_db, FORCES_QUERY) == _rows(full, FORCES_QUERY)
+    assert _rows(delta_db, STORIES_QUERY) == _rows(full, STORIES_QUERY)
+
+
+def test_unchanged_source_is_a_no_op(veda_db, delta_db):
+    before = _rows(delta_db, FORCES_QUERY)
+
+    importer = _delta(veda_db, delta_db)
+
+    assert importer.import_stats["Element_Forces_Columns"] == 0
+    assert importer.import_stats["Story_Definitions"] == 0
+    assert _rows(delta_db, FORCES_QUERY) == before
+
+
+def test_changes_are_applied_in_place(veda_db, delta_db):
+    before = {row[0]: row for row in _rows(delta_db, FORCES_QUERY)}
+    _update_veda(
+        veda_db,
+        'UPDATE Element_Forces_Columns SET M2 = 99.0 WHERE "Unique Name" = 1 AND "Output Case" = \'COMB1\' AND Station = 0.0',
+        'DELETE FROM Element_Forces_Columns WHERE "Unique Name" = 3',
+    )
+
+    importer = _delta(veda_db, delta_db)
+    after = {row[0]: row for row in _rows(delta_db, FORCES_QUERY)}
+
+    assert importer.import_stats["Element_Forces_Columns"] == 1
+    assert len(after) == 8
+    changed = [row_id for row_id in after if after[row_id] != before[row_id]]
+    assert len(changed) == 1 and after[changed[0]][7] == 99.0
+    with sqlite3.connect(delta_db) as conn:
+        assert conn.execute(
+            f'SELECT COUNT(*) FROM "{DELTA_STATE_TABLE}" WHERE Table_Name = ?', ("Element_Forces_Columns",)
+        ).fetchone()[0] == 8
+
+
+def test_table_without_key_is_replaced(veda_db, delta_db):
+    _update_veda(veda_db, "UPDATE Story_Definitions SET Height = 3500.0 WHERE Name = 'Story1'")
+
+    importer = _delta(veda_db, delta_db)
+
+    assert importer.import_stats["Story_Definitions"] == 2
+    assert _rows(delta_db, STORIES_QUERY)[0][1:] == ("Story1", 3500.0)
+
+
+def test_failed_state_write_rolls_back_table(veda_db, delta_db, monkeypatch):
+    stories = _rows(delta_db, STORIES_QUERY)
+    forces = _rows(delta_db, FORCES_QUERY)
+    _update_veda(
+        veda_db,
+        "UPDATE Story_Definitions SET Height = 3500.0 WHERE Name = 'Story1'",
+        'UPDATE Element_Forces_Columns SET M2 = 99.0 WHERE "Unique Name" = 1',
+    )
+
+    def fail(self):
+        raise sqlite3.OperationalError("disk full")
+
+    monkeypatch.setattr(DeltaTable, "save_table_state", fail)
+    monkeypatch.setattr(DeltaTable, "finish", fail)
+
+    importer = DatabaseImporter(veda_db, delta_db, mode="delta")
+    assert not importer.import_all()
+    assert {"Story_Definitions", "Element_Forces_Columns"} <= set(importer.failed_tables)
+
+    # لا حذف ولا تعديل جزئي: الجدول وحالته كما كانا
+    assert _rows(delta_db, STORIES_QUERY) == stories
+    assert _rows(delta_db, FORCES_QUERY) == forces
+
+    monkeypatch.undo()
+    _delta(veda_db, delta_db)
+    assert _rows(delta_db, STORIES_QUERY)[0][2] == 3500.0
+    assert {row[7] for row in _rows(delta_db, FORCES_QUERY) if row[3] == 1} == {99.0}
@@ -0,0 +1,108 @@
+"""
+tests/test_encoded_schema.py - جداول القوى المرمزة (encode=True)
+"""
+
+import sqlite3
+
+import pytest
+
+from database.initializer import DatabaseInitializer, build_indexes, initialize_database
+from database.schema import ENCODED_TABLES, _encoded_table_ddl, parse_table_definitions
+
+
+FORCE_COLUMNS = ("Story", "Column", "Unique_Name", "Output_Case", "Case_Type", "Station", "P", "M2", "M3")
+
+
+@pytest.fixture
+def encoded_db(tmp_path):
+    path = str(tmp_path / "encoded.db")
+    assert initialize_database(path, encode=True)
+    return path
+
+
+def _object_type(conn, name: str) -> str:
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def _insert_forces(conn, rows):
+    placeholders = ", ".join("?" for _ in FORCE_COLUMNS)
+    conn.executemany(
+        f'INSERT INTO Element_Forces_Columns ({", ".join(FORCE_COLUMNS)}) VALUES ({placeholders})', rows
+    )
+    conn.commit()
+
+
+def test_plain_layout_is_the_default(new_db):
+    conn = sqlite3.connect(new_db)
+    assert _object_type(conn, "Element_Forces_Columns") == "table"
+    assert _object_type(conn, ENCODED_TABLES["Element_Forces_Columns"]["storage"]) is None
+    conn.close()
+
+
+def test_encoded_view_round_trips_rows(encoded_db):
+    conn = sqlite3.connect(encoded_db)
+    assert _object_type(conn, "Element_Forces_Columns") == "view"
+
+    rows = [
+        ("Story1", "C1", 1, "COMB1", "Combination", 0.0, -10.0, 1.0, 2.0),
+        ("Story1", "C2", 2, "COMB1", "Combination", 0.0, -20.0, 3.0, 4.0),
+        ("Story2", "C1", 3, "COMB2", "Combination", 1500.0, -30.0, 5.0, 6.0),
+    ]
+    _insert_forces(conn, rows)
+
+    stored = conn.execute(
+        f'SELECT {", ".join(FORCE_COLUMNS)} FROM Element_Forces_Columns ORDER BY Unique_Name'
+    ).fetchall()
+    assert stored == rows
+    assert conn.execute("SELECT COUNT(*) FROM Story_Codes").fetchone()[0] == 2
+    storage = ENCODED_TABLES["Element_Forces_Columns"]["storage"]
+    assert conn.execute(f'SELECT COUNT(DISTINCT Story_Code) FROM "{storage}"').fetchone()[0] == 2
+    conn.close()
+
+
+def test_encoded_view_update_and_delete_by_primary_key(encoded_db):
+    conn = sqlite3.connect(encoded_db)
+    _insert_forces(conn, [
+        ("Story1", "C1", 1, "COMB1", "Combination", 0.0, -10.0, 1.0, 2.0),
+        ("Story1", "C1", 1, "COMB1", "Combination", 1500.0, -11.0, 1.0, 2.0),
+    ])
+    first_id, second_id = [row[0] for row in conn.execute("SELECT ID FROM Element_Forces_Columns ORDER BY ID")]
+
+    conn.execute("UPDATE Element_Forces_Columns SET Output_Case = 'COMB9', P = 0.0 WHERE ID = ?", (first_id,))
+    conn.execute("DELETE FROM Element_Forces_Columns WHERE ID = ?", (second_id,))
+    conn.commit()
+
+    assert conn.execute("SELECT ID, Output_Case, P FROM Element_Forces_Columns").fetchall() == [(first_id, "COMB9", 0.0)]
+    conn.close()
+
+
+def test_encoded_indexes_live_on_the_storage_table(encoded_db):
+    assert build_indexes(encoded_db)
+
+    initializer = DatabaseInitializer(encoded_db)
+    assert initializer.connect_database()
+    try:
+        results = initializer.verify_index_usage()
+    finally:
+        initializer.close()
+    assert all(used for used, _ in results.values())
+
+    conn = sqlite3.connect(encoded_db)
+    storage = ENCODED_TABLES["Element_Forces_Columns"]["storage"]
+    assert conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND name = 'idx_efc_unique_case'",
+        (storage,)
+    ).fetchone()
+    conn.close()
+
+
+def test_encoded_table_requires_plain_primary_key():
+    definition = dict(parse_table_definitions()["Element_Forces_Columns"])
+    encoded = ENCODED_TABLES["Element_Forces_Columns"]
+
+    assert _encoded_table_ddl("Element_Forces_Columns", definition, encoded)
+    with pytest.raises(ValueError):
+        _encoded_table_ddl("Element_Forces_Columns", dict(definition, primary_key=None), encoded)
+    with pytest.raises(ValueError):
+        _encoded_table_ddl("Element_Forces_Columns", dict(definition, primary_key="Story"), encoded)
@@ -0,0 +1,178 @@
+"""
+tests/test_envelopes.py - غلاف قوى الأعمدة (Column_Force_Envelopes)
+"""
+
+import sqlite3
+
+import pytest
+
+from database.derived_tables import (
+    DerivedTablesBuilder, ENVELOPE_FORCES, ENVELOPE_TABLE, build_derived_tables,
+)
+from database.initializer import initialize_database
+from services.analysis_service import AnalysisService
+
+
+def _aggregates(conn) -> dict:
+    """القيم القصوى والدنيا مباشرة من Element_Forces_Columns"""
+    selects = ", ".join(f'MAX("{force}"), MIN("{force}")' for force in ENVELOPE_FORCES)
+    rows = conn.execute(
+        f'SELECT Story, Column, COUNT(*), {selects} FROM Element_Forces_Columns GROUP BY Story, Column'
+    ).fetchall()
+    return {(row[0], row[1]): row[2:] for row in rows}
+
+
+def _envelopes(conn) -> dict:
+    extremes = ", ".join(f'"{force}_Max", "{force}_Min"' for force in ENVELOPE_FORCES)
+    rows = conn.execute(f'SELECT Story, Column, Row_Count, {extremes} FROM "{ENVELOPE_TABLE}"').fetchall()
+    return {(row[0], row[1]): row[2:] for row in rows}
+
+
+def test_envelope_matches_direct_aggregate(column_db):
+    assert build_derived_tables(column_db)
+
+    conn = sqlite3.connect(column_db)
+    assert _envelopes(conn) == _aggregates(conn)
+    assert len(_envelopes(conn)) == 3
+    conn.close()
+
+
+def test_envelope_governing_row(column_db):
+    assert build_derived_tables(column_db)
+
+    conn = sqlite3.connect(column_db)
+    row = conn.execute(
+        f'SELECT P_Min, P_Min_Case, P_Min_Station, P_Min_ID FROM "{ENVELOPE_TABLE}" '
+        "WHERE Story = 'Story2' AND Column = 'C1'"
+    ).fetchone()
+    assert row[:3] == (-111.0, "COMB2", 1500.0)
+    assert conn.execute(
+        "SELECT P, Output_Case, Station FROM Element_Forces_Columns WHERE ID = ?", (row[3],)
+    ).fetchone() == (-111.0, "COMB2", 1500.0)
+    conn.close()
+
+
+def test_rebuild_replaces_rows(column_db):
+    builder = DerivedTablesBuilder(column_db)
+    assert builder.connect()
+    try:
+        assert builder.build_column_force_envelopes() == 3
+        builder.conn.execute("DELETE FROM Element_Forces_Columns WHERE Unique_Name = 3")
+        builder.conn.commit()
+        assert builder.build_column_force_envelopes() == 2
+        assert _envelopes(builder.conn) == _aggregates(builder.conn)
+    finally:
+        builder.close()
+
+
+def test_analysis_service_reads_envelope(column_db):
+    conn = sqlite3.connect(column_db)
+    service = AnalysisService(db_connection=conn)
+    before = service.calculate_max_moment("C1", "Story2")
+
+    assert build_derived_tables(column_db)
+    envelope = service.get_column_envelope("C1", "Story2")
+    assert envelope["M2_Max"] == pytest.approx(11.1)
+    assert envelope["Row_Count"] == 4
+
+    after = service.calculate_max_moment("C1", "Story2")
+    assert (after["max_M2"], after["max_M3"]) == pytest.approx((before["max_M2"], before["max_M3"]))
+    assert service.get_max_forces_for_column("C1", "Story2")["P"] == -111.0
+    conn.close()
+
+
+def _insert_combination(conn, combination: str, scale: float):
+    """صفوف تركيبة جديدة لكل عمود (بمقياس يجعل بعضها حاكماً)"""
+    rows = conn.execute(
+        "SELECT Story, Column, Unique_Name, Station, P, V2, V3, T, M2, M3 "
+        "FROM Element_Forces_Columns WHERE Output_Case = 'COMB1'"
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO Element_Forces_Columns (Story, Column, Unique_Name, Output_Case, Case_Type, "
+        "Station, P, V2, V3, T, M2, M3) VALUES (?, ?, ?, ?, 'Combination', ?, ?, ?, ?, ?, ?, ?)",
+        [(*row[:3], combination, row[3], *(value * scale for value in row[4:])) for row in rows]
+    )
+    conn.commit()
+
+
+def _full_rebuild(path) -> dict:
+    builder = DerivedTablesBuilder(path)
+    assert builder.connect()
+    try:
+        builder.remove_envelope_triggers()
+        builder.build_column_force_envelopes()
+        columns = [row[1] for row in builder.conn.execute(f'PRAGMA table_info("{ENVELOPE_TABLE}")')]
+        return {row[:2]: row for row in builder.conn.execute(f'SELECT {", ".join(columns)} FROM "{ENVELOPE_TABLE}"')}
+    finally:
+        builder.close()
+
+
+def _current(path) -> dict:
+    conn = sqlite3.connect(path)
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{ENVELOPE_TABLE}")')]
+    rows = {row[:2]: row for row in conn.execute(f'SELECT {", ".join(columns)} FROM "{ENVELOPE_TABLE}"')}
+    conn.close()
+    return rows
+
+
+def test_trigger_keeps_envelope_equal_to_rebuild(column_db):
+    assert build_derived_tables(column_db, incremental=True)
+
+    conn = sqlite3.connect(column_db)
+    _insert_combination(conn, "COMB3", 3.0)
+    _insert_combination(conn, "COMB4", 0.5)
+    conn.execute(
+        "INSERT INTO Element_Forces_Columns (Story, Column, Unique_Name, Output_Case, Station, P, M2) "
+        "VALUES ('Story1', 'C9', 9, 'COMB3', 0.0, -5.0, 1.0)"
+    )
+    conn.commit()
+    conn.close()
+
+    incremental = _current(column_db)
+    assert incremental[("Story2", "C1")][3] == 8
+    assert ("Story1", "C9") in incremental
+    assert incremental == _full_rebuild(column_db)
+
+
+def test_install_trigger_builds_missing_envelope(column_db):
+    builder = DerivedTablesBuilder(column_db)
+    assert builder.connect()
+    try:
+        builder.install_envelope_triggers()
+        assert builder.conn.execute(f'SELECT COUNT(*) FROM "{ENVELOPE_TABLE}"').fetchone()[0] == 3
+
+        builder.remove_envelope_triggers()
+        _insert_combination(builder.conn, "COMB3", 3.0)
+        row_count = builder.conn.execute(
+            f"SELECT Row_Count FROM \"{ENVELOPE_TABLE}\" WHERE Story = 'Story2' AND Column = 'C1'"
+        ).fetchone()[0]
+        assert row_count == 4
+    finally:
+        builder.close()
+
+
+def test_trigger_on_encoded_forces(tmp_path):
+    path = str(tmp_path / "encoded.db")
+    assert initialize_database(path, encode=True)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO Element_Forces_Columns (Story, Column, Unique_Name, Output_Case, Station, P, M2, M3) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [("Story1", "C1", 1, "COMB1", 0.0, -10.0, 1.0, 2.0),
+         ("Story1", "C2", 2, "COMB1", 0.0, -20.0, 3.0, 4.0)]
+    )
+    conn.commit()
+    assert build_derived_tables(path, incremental=True)
+
+    conn.execute(
+        "INSERT INTO Element_Forces_Columns (Story, Column, Unique_Name, Output_Case, Station, P, M2, M3) "
+        "VALUES ('Story1', 'C1', 1, 'COMB2', 1500.0, -30.0, 0.5, 9.0)"
+    )
+    conn.commit()
+    assert conn.execute(
+        f"SELECT P_Min, P_Min_Case, P_Min_Station, M3_Max FROM \"{ENVELOPE_TABLE}\" "
+        "WHERE Story = 'Story1' AND Column = 'C1'"
+    ).fetchone() == (-30.0, "COMB2", 1500.0, 9.0)
+    conn.close()
+
+    assert _current(path) == _full_rebuild(path)
@@ -0,0 +1,60 @@
+"""
+tests/test_force_streaming.py - قراءة القوى على دفعات (fetchmany)
+"""
+
+import sqlite3
+
+import pytest
+
+from database.connection import DatabaseConnection
+from models.load_and_force import ForceRecord
+from services.analysis_service import AnalysisService
+
+
+@pytest.fixture
+def db(column_db):
+    connection = DatabaseConnection(column_db)
+    assert connection.connect()
+    yield connection
+    connection.disconnect()
+
+
+def test_iter_column_forces_is_independent_of_chunk_size(db):
+    full = list(db.iter_column_forces())
+    assert len(full) == 12
+    assert all(isinstance(force, ForceRecord) for force in full)
+    assert [(f.unique_name, f.output_case) for f in full] == sorted((f.unique_name, f.output_case) for f in full)
+    assert list(db.iter_column_forces(chunk_size=1)) == full
+
+
+def test_iter_column_forces_filters(db):
+    forces = list(db.iter_column_forces(story="Story2", unique_name=3))
+    assert {(force.story, force.unique_name) for force in forces} == {("Story2", 3)}
+    assert len(forces) == 4
+    assert list(db.iter_column_forces(case_type="Modal")) == []
+
+
+def test_connection_stays_usable_while_streaming(db):
+    forces = db.iter_column_forces(chunk_size=2)
+    next(forces)
+    assert db.get_story(1).name == "Story1"
+    assert len(list(forces)) == 11
+
+
+def test_iter_load_combinations_matches_list(db):
+    combinations = db.get_load_combinations_extended()
+    assert [combination["name"] for combination in combinations] == ["COMB1", "COMB2"]
+    assert list(db.iter_load_combinations_extended(chunk_size=1)) == combinations
+
+
+def test_max_moment_from_streamed_forces(column_db):
+    conn = sqlite3.connect(column_db)
+    service = AnalysisService(db_connection=conn)
+
+    assert len(list(service.iter_forces_for_column("C1", "Story2", chunk_size=3))) == 4
+    result = service.calculate_max_moment("C1", "Story2")
+
+    assert result["max_M2"] == pytest.approx(11.1)
+    assert result["max_M3"] == pytest.approx(22.2)
+    assert service.calculate_max_moment("C9", "Story2") is None
+    conn.close()
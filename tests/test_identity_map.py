@@ -0,0 +1,58 @@
+"""
+tests/test_identity_map.py - ذاكرة المواد والمقاطع والطوابق في DatabaseConnection
+"""
+
+import pytest
+
+from database.connection import DatabaseConnection, _IdentityMap, _MISSING
+
+
+@pytest.fixture
+def db(column_db):
+    connection = DatabaseConnection(column_db)
+    assert connection.connect()
+    yield connection
+    connection.disconnect()
+
+
+def test_identity_map_evicts_least_recently_used():
+    cache = _IdentityMap(max_size=2)
+    cache.put("Story_Definitions", 1, "a")
+    cache.put("Story_Definitions", 2, "b")
+    assert cache.get("Story_Definitions", 1) == "a"
+
+    cache.put("Story_Definitions", 3, "c")
+
+    assert cache.get("Story_Definitions", 2) is _MISSING
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_identity_map_disabled_with_zero_size():
+    cache = _IdentityMap(max_size=0)
+    cache.put("Story_Definitions", 1, "a")
+    assert cache.get("Story_Definitions", 1) is _MISSING
+
+
+def test_same_story_object_until_update(db):
+    story = db.get_story(1)
+    assert db.get_story(1) is story
+    assert db.cache_stats()["hits"] == 1
+
+    assert db.execute_update("UPDATE story_definitions SET Height = ? WHERE ID = ?", (4500.0, 1))
+
+    reloaded = db.get_story(1)
+    assert reloaded is not story
+    assert reloaded.height == 4500.0
+
+
+def test_update_of_other_table_keeps_cached_objects(db):
+    story = db.get_story(2)
+    assert db.execute_update("UPDATE Load_Combination_Definitions SET SF = 1.0")
+    assert db.get_story(2) is story
+
+
+def test_disconnect_clears_cache(db):
+    db.get_story(1)
+    db.disconnect()
+    assert db.cache_stats()["size"] == 0
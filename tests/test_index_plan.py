@@ -0,0 +1,58 @@
+"""
+tests/test_index_plan.py - فهارس INDEX_PLAN بعد الإدراج
+"""
+
+import sqlite3
+
+from database.initializer import DatabaseInitializer, build_indexes
+from database.schema import get_index_plan
+
+
+def _index_columns(conn) -> dict:
+    indexes = {}
+    for table_name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+        for index_row in conn.execute(f'PRAGMA index_list("{table_name}")').fetchall():
+            columns = [row[2] for row in sorted(conn.execute(f'PRAGMA index_info("{index_row[1]}")'))]
+            indexes[index_row[1]] = (table_name, columns)
+    return indexes
+
+
+def test_every_planned_index_is_created_or_covered(new_db):
+    assert build_indexes(new_db)
+
+    conn = sqlite3.connect(new_db)
+    indexes = _index_columns(conn)
+    conn.close()
+
+    for index in get_index_plan():
+        covering = [name for name, (table_name, columns) in indexes.items()
+                    if table_name == index["table"] and columns[:len(index["columns"])] == index["columns"]]
+        assert covering, index["name"]
+
+
+def test_build_indexes_is_idempotent(new_db):
+    assert build_indexes(new_db)
+    conn = sqlite3.connect(new_db)
+    first = _index_columns(conn)
+
+    assert build_indexes(new_db)
+    assert _index_columns(conn) == first
+    conn.close()
+
+
+def test_service_queries_use_an_index(new_db):
+    assert build_indexes(new_db)
+
+    initializer = DatabaseInitializer(new_db)
+    assert initializer.connect_database()
+    try:
+        results = initializer.verify_index_usage()
+    finally:
+        initializer.close()
+
+    assert results
+    assert {name: used for name, (used, _) in results.items()} == {name: True for name in results}
+
+
+def test_unused_covering_index_is_not_planned():
+    assert "idx_efc_unique_moments" not in {index["name"] for index in get_index_plan()}
@@ -0,0 +1,254 @@
+"""
+tests/test_parallel_import.py - الإدراج المتوازي وترتيب التبعيات
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from database import importer
+from database.importer import import_data
+from database.initializer import initialize_database
+from database.parallel_import import (
+    STREAM_QUEUE_SIZE, ImportTask, ReadFailed, get_import_order, get_import_parents, run_parallel_import,
+)
+
+
+# child → parent، و other مستقل
+FOREIGN_KEYS = [{"table": "child", "ref_table": "parent"}]
+
+
+def _sleep_and_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def _fail(message):
+    raise RuntimeError(message)
+
+
+def _chunks(count, size, fail_after=None):
+    """دفعات [start, ..] بحجم size (وفشل بعد fail_after دفعة)"""
+    for index in range(count):
+        if index == fail_after:
+            raise RuntimeError("stream broken")
+        yield list(range(index * size, (index + 1) * size))
+
+
+def test_import_order_puts_parents_first():
+    assert get_import_order(["child", "other", "parent"], FOREIGN_KEYS) == ["other", "parent", "child"]
+    assert get_import_parents(["child", "other"], FOREIGN_KEYS) == {"child": set(), "other": set()}
+
+
+def test_cycle_keeps_original_order():
+    cycle = FOREIGN_KEYS + [{"table": "parent", "ref_table": "child"}]
+    assert get_import_order(["child", "parent"], cycle) == ["child", "parent"]
+
+
+def test_schema_order_respects_foreign_keys():
+    tables = importer.TABLES_TO_IMPORT
+    order = get_import_order(tables)
+    parents = get_import_parents(tables)
+
+    assert sorted(order) == sorted(tables)
+    for table_name in order:
+        written_before = set(order[:order.index(table_name)])
+        assert parents[table_name] <= written_before
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_ready_table_is_not_blocked_by_slow_parent(executor):
+    tasks = [
+        ImportTask("parent", _sleep_and_return, (0.5, "parent rows")),
+        ImportTask("child", _sleep_and_return, (0.0, "child rows")),
+        ImportTask("other", _sleep_and_return, (0.0, "other rows")),
+    ]
+    written = []
+
+    timings = run_parallel_import(tasks, lambda name, rows: written.append((name, rows)),
+                                  workers=3, executor=executor, foreign_keys=FOREIGN_KEYS)
+
+    assert written == [("other", "other rows"), ("parent", "parent rows"), ("child", "child rows")]
+    assert list(timings) == ["other", "parent", "child"]
+    assert timings["parent"]["read"] >= 0.5
+
+
+def test_writes_happen_on_the_calling_thread():
+    tasks = [ImportTask(name, _sleep_and_return, (0.0, name)) for name in ("a", "b", "c")]
+    threads = set()
+
+    run_parallel_import(tasks, lambda name, rows: threads.add(threading.get_ident()),
+                        workers=2, executor="thread", foreign_keys=[])
+
+    assert threads == {threading.get_ident()}
+
+
+def test_read_error_is_recorded_and_skipped():
+    tasks = [
+        ImportTask("parent", _fail, ("broken",)),
+        ImportTask("child", _sleep_and_return, (0.0, "child rows")),
+        ImportTask("sql", None, ()),
+    ]
+    written = []
+
+    timings = run_parallel_import(tasks, lambda name, rows: written.append((name, rows)),
+                                  workers=2, executor="thread", foreign_keys=FOREIGN_KEYS)
+
+    assert timings["parent"]["error"] == "broken"
+    assert sorted(written, key=str) == [("child", "child rows"), ("sql", None)]
+
+
+def test_write_error_propagates():
+    tasks = [ImportTask(name, _sleep_and_return, (0.0, name)) for name in ("a", "b", "c", "d")]
+
+    def write(name, rows):
+        if name == "b":
+            raise ValueError(name)
+
+    with pytest.raises(ValueError):
+        run_parallel_import(tasks, write, workers=1, executor="thread", foreign_keys=[])
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        run_parallel_import([], lambda name, rows: None, executor="fiber")
+
+
+@pytest.mark.parametrize("mode", ["python", "attach"])
+def test_parallel_import_matches_sequential(veda_db, tmp_path, mode):
+    sequential = str(tmp_path / "sequential.db")
+    parallel = str(tmp_path / "parallel.db")
+    for path in (sequential, parallel):
+        assert initialize_database(path)
+
+    assert import_data(veda_db, sequential, mode=mode)
+    assert import_data(veda_db, parallel, mode=mode, workers=2)
+
+    query = "SELECT * FROM Element_Forces_Columns ORDER BY ID"
+    with sqlite3.connect(sequential) as first, sqlite3.connect(parallel) as second:
+        assert first.execute(query).fetchall() == second.execute(query).fetchall()
+        assert len(second.execute(query).fetchall()) == 12
+
+
+def test_parallel_read_failure_fails_import(veda_db, new_db, monkeypatch):
+    read_table = importer.read_table
+
+    def failing_read(veda_path, table_name, *args):
+        if table_name == "Element_Forces_Columns":
+            raise sqlite3.OperationalError("disk I/O error")
+        return read_table(veda_path, table_name, *args)
+
+    monkeypatch.setattr(importer, "read_table", failing_read)
+
+    assert not import_data(veda_db, new_db, workers=2)
+    with sqlite3.connect(new_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Element_Forces_Columns").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM Story_Definitions").fetchone()[0] == 2
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_stream_passes_chunks_in_order(executor):
+    tasks = [ImportTask("parent", _chunks, (5, 3)), ImportTask("child", _chunks, (2, 3))]
+    written = {}
+
+    def write(name, chunks):
+        written[name] = [chunk for chunk in chunks]
+
+    timings = run_parallel_import(tasks, write, workers=2, executor=executor,
+                                  foreign_keys=FOREIGN_KEYS, stream=True)
+
+    assert list(timings) == ["parent", "child"]
+    assert written["parent"] == [list(range(i * 3, i * 3 + 3)) for i in range(5)]
+    assert len(written["child"]) == 2
+    assert timings["parent"]["error"] is None
+
+
+def test_stream_is_bounded_by_queue_size():
+    produced = []
+
+    def read():
+        for index in range(20):
+            produced.append(index)
+            yield [index]
+
+    def write(name, chunks):
+        for chunk in chunks:
+            time.sleep(0.01)
+            # العامل لا يسبق الكاتب بأكثر من الطابور ودفعة في يده
+            assert len(produced) - (chunk[0] + 1) <= STREAM_QUEUE_SIZE + 1
+
+    run_parallel_import([ImportTask("t", read, ())], write, workers=1, executor="thread",
+                        foreign_keys=[], stream=True)
+    assert len(produced) == 20
+
+
+def test_stream_read_failure_reaches_writer():
+    tasks = [ImportTask("broken", _chunks, (5, 2, 2)), ImportTask("next", _chunks, (1, 2))]
+    received = []
+
+    def write(name, chunks):
+        try:
+            for chunk in chunks:
+                received.append((name, chunk))
+        except ReadFailed:
+            received.append((name, "failed"))
+
+    timings = run_parallel_import(tasks, write, workers=2, executor="thread", foreign_keys=[], stream=True)
+
+    assert received == [("broken", [0, 1]), ("broken", [2, 3]), ("broken", "failed"), ("next", [0, 1])]
+    assert timings["broken"]["error"] == "stream broken"
+    assert timings["next"]["error"] is None
+
+
+def test_stream_writer_stopping_early_does_not_hang():
+    tasks = [ImportTask(name, _chunks, (50, 1)) for name in ("a", "b", "c")]
+
+    def write(name, chunks):
+        next(iter(chunks))
+
+    timings = run_parallel_import(tasks, write, workers=2, executor="thread", foreign_keys=[], stream=True)
+    assert list(timings) == ["a", "b", "c"]
+
+
+def test_stream_write_error_shuts_down_workers():
+    tasks = [ImportTask(name, _chunks, (50, 1)) for name in ("a", "b", "c")]
+
+    def write(name, chunks):
+        raise ValueError(name)
+
+    with pytest.raises(ValueError):
+        run_parallel_import(tasks, write, workers=2, executor="thread", foreign_keys=[], stream=True)
+
+
+@pytest.mark.parametrize("mode", ["python", "attach"])
+def test_streamed_import_matches_sequential(veda_db, tmp_path, mode):
+    sequential = str(tmp_path / "sequential.db")
+    streamed = str(tmp_path / "streamed.db")
+    for path in (sequential, streamed):
+        assert initialize_database(path)
+
+    assert import_data(veda_db, sequential, mode=mode)
+    assert import_data(veda_db, streamed, mode=mode, workers=2, fetch_size=2)
+
+    query = "SELECT * FROM Element_Forces_Columns ORDER BY ID"
+    with sqlite3.connect(sequential) as first, sqlite3.connect(streamed) as second:
+        assert first.execute(query).fetchall() == second.execute(query).fetchall()
+
+
+def test_streamed_read_failure_rolls_back_table(veda_db, new_db, monkeypatch):
+    stream_table = importer.stream_table
+
+    def failing_stream(veda_path, table_name, *args):
+        for index, chunk in enumerate(stream_table(veda_path, table_name, *args)):
+            if table_name == "Element_Forces_Columns" and index == 2:
+                raise sqlite3.OperationalError("disk I/O error")
+            yield chunk
+
+    monkeypatch.setattr(importer, "stream_table", failing_stream)
+
+    assert not import_data(veda_db, new_db, workers=2, fetch_size=2)
+    with sqlite3.connect(new_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM Element_Forces_Columns").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM Story_Definitions").fetchone()[0] == 2
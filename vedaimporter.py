@@ -14,11 +14,15 @@ database/vedaimporter.py - مستورد VEDA (المرحلة 2️⃣: الإدخ
 - بدون ربط جداول
 """
 
+import time
 import sqlite3
 import logging
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+from database.schema_catalog import get_schema_catalog
+from database.batch_insert import insert_rows, fetch_chunks
+from database.parallel_import import ImportTask, get_import_order, run_parallel_import
 
 # ============================================================
 # إعداد السجلات
@@ -78,6 +82,40 @@ IMPORT_ORDER = [
     ("Element_Forces_Columns", "Element_Forces_Columns"),
 ]
 
+# ============================================================
+# قراءة جدول VEDA
+# ============================================================
+
+def read_veda_table(veda_path: str, veda_table: str) -> Tuple[List[str], List[tuple]]:
+    """
+    قراءة جدول VEDA كاملاً باتصال مستقل للقراءة فقط (لعمال الإدراج المتوازي)
+    
+    Returns:
+        (أسماء الأعمدة, الصفوف)
+    """
+    conn = sqlite3.connect(f"file:{veda_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f"SELECT * FROM [{veda_table}]")
+        return [desc[0] for desc in cursor.description], cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def stream_veda_table(veda_path: str, veda_table: str, fetch_size: int):
+    """
+    مثل read_veda_table على دفعات fetch_size (لعمال الإدراج المتوازي بوضع الدفعات)
+    
+    Yields:
+        أسماء الأعمدة أولاً ثم دفعات الصفوف
+    """
+    conn = sqlite3.connect(f"file:{veda_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(f"SELECT * FROM [{veda_table}]")
+        yield [desc[0] for desc in cursor.description]
+        yield from fetch_chunks(cursor, fetch_size)
+    finally:
+        conn.close()
+
 # ============================================================
 # فئة مستورد VEDA
 # ============================================================
@@ -85,11 +123,17 @@ IMPORT_ORDER = [
 class VedaImporter:
     """استيراج البيانات من VEDA إلى قاعدة البيانات الجديدة"""
     
-    def __init__(self, veda_path: str, db_path: str):
+    def __init__(self, veda_path: str, db_path: str, workers: int = 1, executor: str = "thread",
+                 fetch_size: int = None):
         self.veda_path = veda_path
         self.db_path = db_path
+        self.workers = workers      # أكثر من 1: قراءة الجداول بالتوازي (run_parallel)
+        self.executor = executor
+        self.fetch_size = fetch_size  # قراءة الجداول على دفعات fetchmany (None = الجدول كاملاً)
         self.veda_conn = None
         self.db_conn = None
+        self.veda_catalog = None
+        self.db_catalog = None
         self.stats = {
             'tables_processed': 0,
             'total_inserted': 0,
@@ -120,6 +164,10 @@ class VedaImporter:
             self.db_conn.execute("PRAGMA foreign_keys = OFF")  # تعطيل FK مؤقتاً
             logger.info(f"✅ تم الاتصال بقاعدة البيانات: {self.db_path}")
             
+            # هيكل القاعدتين (مرة واحدة - من الذاكرة المؤقتة إن أمكن)
+            self.veda_catalog = get_schema_catalog(self.veda_path, self.veda_conn)
+            self.db_catalog = get_schema_catalog(self.db_path, self.db_conn)
+            
             return True
         
         except Exception as e:
@@ -129,10 +177,7 @@ class VedaImporter:
     def get_veda_columns(self, table_name: str) -> List[str]:
         """الحصول على أسماء أعمدة جدول VEDA"""
         try:
-            cursor = self.veda_conn.cursor()
-            cursor.execute(f"PRAGMA table_info([{table_name}])")
-            columns = [row[1] for row in cursor.fetchall()]
-            return columns
+            return self.veda_catalog.columns(table_name)
         except Exception as e:
             logger.warning(f"⚠️ خطأ في قراءة أعمدة {table_name}: {e}")
             return []
@@ -140,10 +185,7 @@ class VedaImporter:
     def get_db_columns(self, table_name: str) -> List[str]:
         """الحصول على أسماء أعمدة جدول DB"""
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [row[1] for row in cursor.fetchall()]
-            return columns
+            return self.db_catalog.columns(table_name)
         except Exception as e:
             logger.warning(f"⚠️ خطأ في قراءة أعمدة {table_name}: {e}")
             return []
@@ -171,25 +213,37 @@ class VedaImporter:
     
     def import_single_table(self, veda_table: str, db_table: str) -> Tuple[int, int]:
         """استيراج جدول واحد"""
-        
-        inserted = 0
-        errors = 0
-        
         try:
             logger.info(f"\n📥 استيراج {veda_table} → {db_table}")
             
-            # قراءة من VEDA
+            # قراءة من VEDA (على دفعات إذا حُدد fetch_size)
             veda_cursor = self.veda_conn.cursor()
             veda_cursor.execute(f"SELECT * FROM [{veda_table}]")
-            veda_rows = veda_cursor.fetchall()
             veda_columns = [desc[0] for desc in veda_cursor.description]
             
-            if not veda_rows:
-                logger.info(f"   ⓘ لا توجد بيانات في VEDA")
-                return 0, 0
-            
-            logger.info(f"   📖 عدد الصفوف: {len(veda_rows)}")
-            
+            return self.write_table(db_table, veda_columns, fetch_chunks(veda_cursor, self.fetch_size))
+        
+        except Exception as e:
+            logger.error(f"   ❌ خطأ في الاستيراج: {e}")
+            self.db_conn.rollback()
+            return 0, 1
+    
+    def write_table(self, db_table: str, veda_columns: List[str], chunks) -> Tuple[int, int]:
+        """
+        إدراج صفوف VEDA المقروءة في جدول DB داخل معاملة واحدة
+        
+        Args:
+            veda_columns: أعمدة VEDA بترتيب الصفوف
+            chunks: دفعات صفوف (tuples أو sqlite3.Row) - تُكتب كل دفعة قبل قراءة التالية
+        
+        Returns:
+            (عدد المُدرج، عدد الأخطاء)
+        """
+        inserted = 0
+        errors = 0
+        total_rows = 0
+        
+        try:
             # الحصول على أعمدة DB
             db_columns = self.get_db_columns(db_table)
             
@@ -197,49 +251,45 @@ class VedaImporter:
             column_mapping = self.map_columns(veda_columns, db_columns)
             
             if not column_mapping:
+                total_rows = sum(len(rows) for rows in chunks)
+                if not total_rows:
+                    logger.info(f"   ⓘ لا توجد بيانات في VEDA")
+                    return 0, 0
                 logger.warning(f"   ⚠️ لم يتم العثور على أعمدة متطابقة")
-                return 0, len(veda_rows)
+                return 0, total_rows
             
             logger.debug(f"   🔗 أعمدة مربوطة: {len(column_mapping)}")
             
-            # معالجة كل صف
-            db_cursor = self.db_conn.cursor()
+            # بناء الصفوف بترتيب أعمدة ثابت
+            columns_str = ", ".join(f'"{col}"' for col in column_mapping)
+            placeholders = ", ".join(["?"] * len(column_mapping))
+            insert_query = f"INSERT INTO {db_table} ({columns_str}) VALUES ({placeholders})"
+            veda_keys = [veda_columns.index(col) for col in column_mapping.values()]
             
-            for row_idx, veda_row in enumerate(veda_rows, 1):
-                try:
-                    # تحويل الصف إلى قاموس
-                    row_dict = dict(veda_row)
-                    
-                    # إنشاء قاموس الإدراج
-                    insert_dict = {}
-                    
-                    for db_col, veda_col in column_mapping.items():
-                        value = row_dict.get(veda_col)
-                        insert_dict[db_col] = value
-                    
-                    if not insert_dict:
-                        errors += 1
-                        logger.debug(f"   صف {row_idx}: لا توجد بيانات")
-                        continue
-                    
-                    # بناء جملة INSERT
-                    columns_str = ", ".join(f'"{col}"' for col in insert_dict.keys())
-                    placeholders = ", ".join(["?"] * len(insert_dict))
-                    values = tuple(insert_dict.values())
-                    
-                    insert_query = f"INSERT INTO {db_table} ({columns_str}) VALUES ({placeholders})"
-                    
-                    # إدراج الصف
-                    db_cursor.execute(insert_query, values)
-                    inserted += 1
-                    
-                except Exception as e:
-                    errors += 1
-                    logger.debug(f"   صف {row_idx}: {str(e)[:60]}")
+            def report_error(index, row, error):
+                logger.debug(f"   صف {total_rows + index + 1}: {str(error)[:60]}")
+            
+            # إدراج على دفعات (الصف الخاطئ يُعزل دون إلغاء دفعته)
+            elapsed = 0.0
+            for veda_rows in chunks:
+                start = time.perf_counter()
+                rows = [tuple(veda_row[key] for key in veda_keys) for veda_row in veda_rows]
+                chunk_inserted, chunk_errors = insert_rows(self.db_conn, insert_query, rows, on_error=report_error)
+                elapsed += time.perf_counter() - start
+                inserted += chunk_inserted
+                errors += chunk_errors
+                total_rows += len(rows)
+            
+            if not total_rows:
+                logger.info(f"   ⓘ لا توجد بيانات في VEDA")
+                return 0, 0
             
             # التأكيد
+            start = time.perf_counter()
             self.db_conn.commit()
-            logger.info(f"   ✅ تم إدراج: {inserted} صف | ❌ أخطاء: {errors}")
+            rate = inserted / max(elapsed + time.perf_counter() - start, 1e-9)
+            logger.info(f"   📖 عدد الصفوف: {total_rows}")
+            logger.info(f"   ✅ تم إدراج: {inserted} صف ({rate:,.0f} صف/ث) | ❌ أخطاء: {errors}")
             
             return inserted, errors
         
@@ -248,6 +298,62 @@ class VedaImporter:
             self.db_conn.rollback()
             return 0, 1
     
+    def record_table(self, db_table: str, inserted: int, errors: int):
+        """تسجيل نتيجة جدول في الإحصائيات"""
+        self.stats['tables_processed'] += 1
+        self.stats['total_inserted'] += inserted
+        self.stats['total_errors'] += errors
+        self.stats['table_details'][db_table] = {
+            'inserted': inserted,
+            'errors': errors
+        }
+    
+    def run_parallel(self):
+        """
+        قراءة جداول VEDA بالتوازي والكتابة في هذا الخيط بترتيب التبعيات
+        
+        مع fetch_size يمرر العامل الجدول دفعة دفعة (stream) بدل تحميله كاملاً.
+        """
+        stream = bool(self.fetch_size)
+        veda_tables = {db_table: veda_table for veda_table, db_table in IMPORT_ORDER}
+        tasks = []
+        for db_table in get_import_order(list(veda_tables)):
+            if stream:
+                tasks.append(ImportTask(db_table, stream_veda_table,
+                                        (self.veda_path, veda_tables[db_table], self.fetch_size)))
+            else:
+                tasks.append(ImportTask(db_table, read_veda_table, (self.veda_path, veda_tables[db_table])))
+        
+        def write(db_table, result):
+            logger.info(f"\n📥 استيراج {veda_tables[db_table]} → {db_table}")
+            if not stream:
+                veda_columns, veda_rows = result
+                self.record_table(db_table, *self.write_table(db_table, veda_columns, [veda_rows]))
+                return
+            chunks = iter(result)
+            try:
+                veda_columns = next(chunks)
+            except Exception as e:
+                logger.error(f"   ❌ خطأ في الاستيراج: {e}")
+                self.record_table(db_table, 0, 1)
+                return
+            self.record_table(db_table, *self.write_table(db_table, veda_columns, chunks))
+        
+        logger.info(f"⚡ استيراج متوازٍ: {self.workers} عامل ({self.executor})"
+                    + (f"، دفعات {self.fetch_size} صف" if stream else ""))
+        timings = run_parallel_import(tasks, write, workers=self.workers, executor=self.executor,
+                                      stream=stream)
+        
+        logger.info("\n⏱️ التوقيت لكل جدول (قراءة في العامل | انتظار الكاتب | كتابة):")
+        for db_table, timing in timings.items():
+            if timing["error"]:
+                logger.error(f"   ❌ {db_table}: فشلت القراءة ({timing['error'][:80]})")
+                # في وضع الدفعات يصل الخطأ إلى write ويُحسب هناك
+                if db_table not in self.stats['table_details']:
+                    self.stats['total_errors'] += 1
+                continue
+            logger.info(f"   {db_table:<50} {timing['read']:>7.2f}s {timing['wait']:>7.2f}s {timing['write']:>7.2f}s")
+    
     def print_summary(self):
         """طباعة ملخص الاستيراج"""
         logger.info("\n" + "="*70)
@@ -278,19 +384,19 @@ class VedaImporter:
                 return False
             
             # استيراج الجداول بالترتيب
-            for veda_table, db_table in IMPORT_ORDER:
-                try:
-                    inserted, errors = self.import_single_table(veda_table, db_table)
-                    self.stats['tables_processed'] += 1
-                    self.stats['total_inserted'] += inserted
-                    self.stats['total_errors'] += errors
-                    self.stats['table_details'][db_table] = {
-                        'inserted': inserted,
-                        'errors': errors
-                    }
-                except Exception as e:
-                    logger.error(f"❌ خطأ في {db_table}: {e}")
-                    self.stats['total_errors'] += 1
+            if self.workers > 1:
+                self.run_parallel()
+            else:
+                # نفس ترتيب التبعيات في الوضع المتوازي
+                veda_tables = {db_table: veda_table for veda_table, db_table in IMPORT_ORDER}
+                for db_table in get_import_order(list(veda_tables)):
+                    veda_table = veda_tables[db_table]
+                    try:
+                        inserted, errors = self.import_single_table(veda_table, db_table)
+                        self.record_table(db_table, inserted, errors)
+                    except Exception as e:
+                        logger.error(f"❌ خطأ في {db_table}: {e}")
+                        self.stats['total_errors'] += 1
             
             # ملخص النتائج
             self.print_summary()